@@ -0,0 +1,341 @@
+/**
+ * Benchmark and fairness suite for randomizer.js (Node, no browser needed)
+ *
+ *   npm run bench                 full run: 1k / 100k / 10M candidates, ~1M-draw fairness checks
+ *   npm run bench -- --quick      smaller sizes and sample counts, for a fast pre-event check
+ *   npm run bench -- --out f.json write results somewhere other than bench_output.txt
+ *
+ * Throughput cases report draws per second, and memory as the heap cost of
+ * the candidate array plus the heap growth while sampling. Fairness cases run
+ * chi-square tests on how often each candidate wins (frequency, k much smaller
+ * than n, with the finite-population correction for sampling without
+ * replacement) and on who lands in each winner slot (position). Full shuffles,
+ * where every candidate always wins, are tested on slot positions and on the
+ * ordered pair in the first two slots instead. A case fails when its p-value
+ * drops below ALPHA, Bonferroni-corrected for the number of slots tested.
+ *
+ * A deliberately biased shuffle runs as a control: the suite only passes if
+ * it is flagged, so a test that cannot fail is caught.
+ *
+ * Results are written as JSON. The process exits with status 1 when any
+ * fairness check fails or the control is not flagged.
+ */
+
+import { writeFileSync } from 'node:fs';
+import {
+  drawWinners,
+  fisherYatesShuffle,
+  sampleWeighted,
+} from '../src/utils/randomizer.js';
+import { createWeightIndex } from '../src/utils/weightIndex.js';
+
+const ALPHA = 1e-4;
+
+const args = process.argv.slice(2);
+const quick = args.includes('--quick');
+const outIndex = args.indexOf('--out');
+const outPath = outIndex !== -1 ? args[outIndex + 1] : 'bench_output.txt';
+
+const SIZES = quick ? [1_000, 100_000] : [1_000, 100_000, 10_000_000];
+const CASE_TIME_MS = quick ? 200 : 1000;
+const FAIRNESS_DRAWS = quick ? 100_000 : 1_000_000;
+
+const MB = 1024 * 1024;
+
+const collectGarbage = () => {
+  if (typeof globalThis.gc === 'function') globalThis.gc();
+};
+
+const heapUsed = () => {
+  collectGarbage();
+  return process.memoryUsage().heapUsed;
+};
+
+// ---------------------------------------------------------------------------
+// Statistics
+// ---------------------------------------------------------------------------
+
+/**
+ * Standard normal upper tail, P(Z > z) (Abramowitz & Stegun 7.1.26)
+ */
+const normalUpperTail = (z) => {
+  const t = 1 / (1 + 0.3275911 * Math.abs(z) / Math.SQRT2);
+  const poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741
+    + t * (-1.453152027 + t * 1.061405429))));
+  const erfc = poly * Math.exp(-(z * z) / 2);
+  return z >= 0 ? erfc / 2 : 1 - erfc / 2;
+};
+
+/**
+ * Chi-square upper tail via the Wilson-Hilferty cube-root approximation
+ */
+const chiSquarePValue = (chi2, df) => {
+  const ratio = Math.cbrt(chi2 / df);
+  const mean = 1 - 2 / (9 * df);
+  const sd = Math.sqrt(2 / (9 * df));
+  return normalUpperTail((ratio - mean) / sd);
+};
+
+/**
+ * Chi-square statistic of observed counts against expected counts
+ * @param {number} variance - Cell variance relative to a multinomial (the
+ *   statistic is divided by it; see checkSampler)
+ */
+const chiSquare = (observed, expected, variance = 1) => {
+  let chi2 = 0;
+  for (let i = 0; i < observed.length; i++) {
+    const diff = observed[i] - expected[i];
+    chi2 += (diff * diff) / expected[i];
+  }
+  chi2 /= variance;
+  return { chi2, df: observed.length - 1, p: chiSquarePValue(chi2, observed.length - 1) };
+};
+
+const uniform = (length, total) => new Float64Array(length).fill(total / length);
+
+// ---------------------------------------------------------------------------
+// Throughput
+// ---------------------------------------------------------------------------
+
+/**
+ * Run fn until the time budget is spent (at least once)
+ */
+const measure = (fn) => {
+  const before = heapUsed();
+  let iterations = 0;
+  let peak = 0;
+  const start = performance.now();
+  let elapsed = 0;
+
+  do {
+    fn();
+    iterations++;
+    elapsed = performance.now() - start;
+    if ((iterations & 63) === 1) {
+      peak = Math.max(peak, process.memoryUsage().heapUsed - before);
+    }
+  } while (elapsed < CASE_TIME_MS);
+
+  return {
+    iterations,
+    opsPerSec: Math.round((iterations / elapsed) * 1000),
+    msPerOp: Number((elapsed / iterations).toFixed(4)),
+    heapGrowthMB: Number((Math.max(peak, 0) / MB).toFixed(1)),
+  };
+};
+
+const throughputCases = (candidates) => {
+  const n = candidates.length;
+  const cases = [
+    { name: 'drawWinners', k: 1, run: () => drawWinners(candidates, 1) },
+    { name: 'drawWinners', k: 10, run: () => drawWinners(candidates, 10) },
+    { name: 'drawWinners', k: 100, run: () => drawWinners(candidates, 100) },
+    { name: 'drawWinners:floyd', k: 10, run: () => drawWinners(candidates, 10, { strategy: 'floyd' }) },
+    { name: 'drawWinners:partial', k: 10, run: () => drawWinners(candidates, 10, { strategy: 'partial' }) },
+    { name: 'drawWinners:reservoir', k: 10, run: () => drawWinners(candidates, 10, { strategy: 'reservoir' }) },
+    { name: 'fisherYatesShuffle', k: n, run: () => fisherYatesShuffle(candidates) },
+  ];
+  return cases.filter(c => c.k <= n);
+};
+
+const runThroughput = () => {
+  const results = [];
+
+  SIZES.forEach(n => {
+    const before = heapUsed();
+    const candidates = Array.from({ length: n }, (_, i) => i);
+    const poolMB = Number(((heapUsed() - before) / MB).toFixed(1));
+
+    throughputCases(candidates).forEach(({ name, k, run }) => {
+      const result = { name, n, k, poolMB, ...measure(run) };
+      results.push(result);
+      console.log(
+        `${name.padEnd(24)} n=${String(n).padEnd(9)} k=${String(k).padEnd(9)}`
+        + `${String(result.opsPerSec).padStart(10)} ops/s  ${String(result.msPerOp).padStart(10)} ms/op`
+        + `  +${result.heapGrowthMB} MB`
+      );
+    });
+  });
+
+  return results;
+};
+
+// ---------------------------------------------------------------------------
+// Fairness
+// ---------------------------------------------------------------------------
+
+/**
+ * Frequency and per-slot chi-square for a k-of-n sampler returning indices
+ * Each draw picks k distinct candidates, so win counts are not independent
+ * multinomial cells: their variance is (1 - k/n) * n/(n - 1) times the
+ * multinomial one, and the statistic is scaled by that. Meaningful only for
+ * k much smaller than n (at k = n every count is exactly `draws`)
+ */
+const checkSampler = (name, n, k, draws, sample) => {
+  if (k * 4 > n) {
+    throw new Error(`${name}: frequency test needs k much smaller than n (k=${k}, n=${n})`);
+  }
+  const frequency = new Float64Array(n);
+  const slots = Array.from({ length: k }, () => new Float64Array(n));
+
+  for (let d = 0; d < draws; d++) {
+    const picked = sample();
+    for (let slot = 0; slot < k; slot++) {
+      frequency[picked[slot]]++;
+      slots[slot][picked[slot]]++;
+    }
+  }
+
+  const freq = chiSquare(frequency, uniform(n, draws * k), ((n - k) / n) * (n / (n - 1)));
+  const positions = slots.map(counts => chiSquare(counts, uniform(n, draws)));
+  const worstPosition = positions.reduce((worst, test) => (test.p < worst.p ? test : worst));
+
+  return {
+    name,
+    n,
+    k,
+    draws,
+    frequency: freq,
+    position: { ...worstPosition, slots: k },
+    pass: freq.p >= ALPHA && worstPosition.p >= ALPHA / k,
+  };
+};
+
+/**
+ * Full permutation (k = n): per-slot chi-square plus the ordered pair in the
+ * first two slots (n * (n - 1) cells), which catches biases that keep every
+ * slot's marginal close to uniform
+ */
+const checkShuffle = (name, n, draws, shuffle) => {
+  const slots = Array.from({ length: n }, () => new Float64Array(n));
+  const pairs = new Float64Array(n * n);
+
+  for (let d = 0; d < draws; d++) {
+    const order = shuffle();
+    for (let slot = 0; slot < n; slot++) slots[slot][order[slot]]++;
+    pairs[order[0] * n + order[1]]++;
+  }
+
+  const positions = slots.map(counts => chiSquare(counts, uniform(n, draws)));
+  const worstPosition = positions.reduce((worst, test) => (test.p < worst.p ? test : worst));
+  // Drop the diagonal: the first two slots never hold the same candidate
+  const pairCounts = pairs.filter((_, cell) => Math.floor(cell / n) !== cell % n);
+  const pair = chiSquare(pairCounts, uniform(pairCounts.length, draws));
+
+  return {
+    name,
+    n,
+    k: n,
+    draws,
+    position: { ...worstPosition, slots: n },
+    pair,
+    pass: worstPosition.p >= ALPHA / (n + 1) && pair.p >= ALPHA / (n + 1),
+  };
+};
+
+/**
+ * Known-biased control: swaps every slot with one picked from the whole
+ * array, which makes n^n equally likely paths over n! permutations
+ */
+const naiveShuffle = (array) => {
+  const result = array.slice();
+  for (let i = 0; i < result.length; i++) {
+    const j = Math.floor(Math.random() * result.length);
+    [result[i], result[j]] = [result[j], result[i]];
+  }
+  return result;
+};
+
+/**
+ * First-pick frequency of a weighted draw against the ticket shares
+ */
+const checkWeighted = (weights, draws) => {
+  const index = createWeightIndex(weights);
+  const total = weights.reduce((sum, w) => sum + w, 0);
+  const observed = new Float64Array(weights.length);
+
+  for (let d = 0; d < draws; d++) {
+    const [picked] = sampleWeighted(index, 1);
+    index.set(picked, weights[picked]);
+    observed[picked]++;
+  }
+
+  const expected = Float64Array.from(weights, w => (draws * w) / total);
+  const frequency = chiSquare(observed, expected);
+  return {
+    name: 'sampleWeighted',
+    n: weights.length,
+    k: 1,
+    draws,
+    frequency,
+    pass: frequency.p >= ALPHA,
+  };
+};
+
+function* stream(n) {
+  for (let i = 0; i < n; i++) yield i;
+}
+
+const runFairness = () => {
+  const small = Array.from({ length: 1000 }, (_, i) => i);
+  const hundred = Array.from({ length: 100 }, (_, i) => i);
+  const ten = Array.from({ length: 10 }, (_, i) => i);
+
+  const results = [
+    checkSampler('drawWinners:floyd', 1000, 10, FAIRNESS_DRAWS,
+      () => drawWinners(small, 10, { strategy: 'floyd' })),
+    checkSampler('drawWinners:partial', 100, 10, FAIRNESS_DRAWS,
+      () => drawWinners(hundred, 10, { strategy: 'partial' })),
+    checkSampler('drawWinners:reservoir', 200, 5, FAIRNESS_DRAWS / 5,
+      () => drawWinners(stream(200), 5)),
+    checkShuffle('fisherYatesShuffle', 10, FAIRNESS_DRAWS,
+      () => fisherYatesShuffle(ten)),
+    checkWeighted(Array.from({ length: 50 }, (_, i) => 1 + (i % 5)), FAIRNESS_DRAWS),
+    { ...checkShuffle('control:naiveShuffle', 10, FAIRNESS_DRAWS, () => naiveShuffle(ten)), control: true },
+  ];
+
+  results.forEach(result => {
+    const p = (test) => test.p.toExponential(2);
+    const tests = [
+      result.frequency && `frequency p=${p(result.frequency)}`,
+      result.position && `worst slot p=${p(result.position)}`,
+      result.pair && `first pair p=${p(result.pair)}`,
+    ].filter(Boolean).join('  ');
+    const verdict = result.control
+      ? (result.pass ? 'MISS' : 'CAUGHT')
+      : (result.pass ? 'PASS' : 'FAIL');
+    console.log(
+      `${verdict.padEnd(6)}  ${result.name.padEnd(24)} n=${result.n} k=${result.k}`
+      + ` draws=${result.draws}  ${tests}`
+    );
+  });
+
+  return results;
+};
+
+// ---------------------------------------------------------------------------
+
+console.log(`Throughput (${CASE_TIME_MS} ms per case)`);
+const throughput = runThroughput();
+
+console.log(`\nFairness (alpha=${ALPHA})`);
+const fairness = runFairness();
+
+// Real samplers must pass and the biased control must be flagged
+const pass = fairness.every(result => (result.control ? !result.pass : result.pass));
+const report = {
+  meta: {
+    node: process.version,
+    platform: `${process.platform}-${process.arch}`,
+    date: new Date().toISOString(),
+    quick,
+    gcExposed: typeof globalThis.gc === 'function',
+  },
+  throughput,
+  fairness,
+  pass,
+};
+
+writeFileSync(outPath, `${JSON.stringify(report, null, 2)}\n`);
+console.log(`\n${pass ? 'All fairness checks passed, control caught' : 'Fairness check FAILED'} -> ${outPath}`);
+process.exit(pass ? 0 : 1);
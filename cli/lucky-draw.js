@@ -0,0 +1,299 @@
+#!/usr/bin/env node
+/**
+ * Lucky Draw CLI: run a draw plan over a candidate file without a browser
+ *
+ *   npm run draw -- --candidates people.csv --prize "Grand Prize:1" --prize "Gift Card:100"
+ *   npm run draw -- --candidates people.csv --plan plan.json --seed random --out results.csv
+ *
+ * Options
+ *   --candidates <file>  One candidate per line; an optional second CSV column is a ticket count
+ *   --header             Skip the first line of the candidate file
+ *   --prize <name:count> Draw a prize (repeatable, drawn in order)
+ *   --plan <file>        JSON draw plan (see below); --prize steps run first
+ *   --seed <hex|random>  Seeded draws, replayable with --verify
+ *   --out <file>         Write results (.json, or .csv with one row per winner)
+ *   --verify             Replay every seeded draw from the candidate list afterwards
+ *
+ * Plan: { "seed": "...", "steps": [ ... ] } where each step is one of
+ *   { "draw": "Grand Prize", "count": 1, "quota": "KR>=2, TW<=1" }
+ *   { "forfeit": "Grand Prize", "names": ["Jane Doe"], "reason": "no-show" }
+ *   { "redraw": "Grand Prize", "reason": "no-show" }
+ *   { "undo": true }
+ *
+ * The candidate file is streamed line by line, so 10M-row lists only hold
+ * the names themselves in memory. Draws run through the same core as the web
+ * app (src/utils/drawCore.js). The process exits with status 1 on an invalid
+ * plan, a broken pool invariant or a failed replay.
+ */
+
+import { createReadStream, createWriteStream, readFileSync } from 'node:fs';
+import { once } from 'node:events';
+import { createInterface } from 'node:readline';
+import { createDrawSession } from '../src/utils/drawCore.js';
+import { parseQuota } from '../src/utils/stratified.js';
+
+const PROGRESS_EVERY = 1_000_000;
+
+const fail = (message) => {
+  console.error(`lucky-draw: ${message}`);
+  process.exit(1);
+};
+
+const parseArgs = (argv) => {
+  const options = { prizes: [], header: false, verify: false };
+  for (let i = 0; i < argv.length; i++) {
+    const arg = argv[i];
+    const value = () => {
+      if (i + 1 >= argv.length) fail(`${arg} needs a value`);
+      return argv[++i];
+    };
+    switch (arg) {
+      case '--candidates': options.candidates = value(); break;
+      case '--plan': options.plan = value(); break;
+      case '--seed': options.seed = value(); break;
+      case '--out': options.out = value(); break;
+      case '--prize': options.prizes.push(value()); break;
+      case '--header': options.header = true; break;
+      case '--verify': options.verify = true; break;
+      default: fail(`unknown option ${arg}`);
+    }
+  }
+  if (!options.candidates) fail('--candidates is required');
+  return options;
+};
+
+// ---------------------------------------------------------------------------
+// Candidates
+// ---------------------------------------------------------------------------
+
+/**
+ * First two CSV fields of a line (quoted fields may contain commas)
+ */
+const splitLine = (line) => {
+  if (line[0] !== '"') {
+    const comma = line.indexOf(',');
+    if (comma === -1) return [line];
+    const next = line.indexOf(',', comma + 1);
+    return [line.slice(0, comma), line.slice(comma + 1, next === -1 ? undefined : next)];
+  }
+
+  let field = '';
+  let i = 1;
+  for (; i < line.length; i++) {
+    if (line[i] === '"') {
+      if (line[i + 1] === '"') {
+        field += '"';
+        i++;
+      } else {
+        break;
+      }
+    } else {
+      field += line[i];
+    }
+  }
+  const rest = line.slice(i + 2);
+  return rest.length > 0 ? [field, splitLine(rest)[0]] : [field];
+};
+
+/**
+ * Ticket cell: null when empty (one ticket), the count for a whole number
+ * >= 0, NaN otherwise (same rules as fileParser.js)
+ */
+const readTickets = (cell) => {
+  if (cell === undefined || cell.trim() === '') return null;
+  const tickets = Number(cell);
+  return Number.isInteger(tickets) && tickets >= 0 ? tickets : NaN;
+};
+
+/**
+ * Stream a candidate file into names plus optional weights
+ * Same rules as the web upload: trimmed, empty lines skipped, duplicates
+ * merged (their tickets add up), 0 tickets leaves a line out, other
+ * non-whole counts fail, a text ticket cell on the first line is a header,
+ * weights only when a ticket column exists
+ */
+const readCandidates = async (path, skipHeader) => {
+  const positions = new Map();
+  const names = [];
+  const weights = [];
+  let hasWeights = false;
+  let lines = 0;
+  let first = true;
+
+  const input = createInterface({ input: createReadStream(path), crlfDelay: Infinity });
+  for await (const line of input) {
+    lines++;
+    if (lines === 1 && skipHeader) continue;
+    if (lines % PROGRESS_EVERY === 0) console.error(`  read ${lines.toLocaleString()} lines`);
+
+    const cells = splitLine(line);
+    const name = cells[0].trim();
+    if (name.length === 0) continue;
+
+    const isFirst = first;
+    first = false;
+
+    const tickets = readTickets(cells[1]);
+    if (Number.isNaN(tickets)) {
+      if (isFirst && Number.isNaN(Number(cells[1]))) continue;
+      throw new Error(`Invalid ticket count "${cells[1]}" for "${name}" on line ${lines}: use a whole number (0 to exclude)`);
+    }
+    if (tickets !== null) hasWeights = true;
+    if (tickets === 0) continue;
+    const weight = tickets === null ? 1 : tickets;
+
+    const position = positions.get(name);
+    if (position !== undefined) {
+      weights[position] += weight;
+    } else {
+      positions.set(name, names.length);
+      names.push(name);
+      weights.push(weight);
+    }
+  }
+
+  return { names, weights: hasWeights ? weights : null };
+};
+
+// ---------------------------------------------------------------------------
+// Plan
+// ---------------------------------------------------------------------------
+
+const prizeStep = (text) => {
+  const colon = text.lastIndexOf(':');
+  const count = Number(text.slice(colon + 1));
+  if (colon <= 0 || !Number.isInteger(count) || count < 1) {
+    fail(`invalid --prize "${text}" (use "Name:count")`);
+  }
+  return { draw: text.slice(0, colon), count };
+};
+
+const latestDraw = (session, prizeName) => {
+  const records = session.getState().history.toArray();
+  for (let i = records.length - 1; i >= 0; i--) {
+    if (records[i].prizeName === prizeName) return records[i];
+  }
+  throw new Error(`No draw for prize "${prizeName}"`);
+};
+
+const runStep = async (session, step) => {
+  if (step.draw !== undefined) {
+    const quota = typeof step.quota === 'string' ? parseQuota(step.quota) : step.quota || null;
+    const record = await session.performDraw(step.count, step.draw, null, quota);
+    return `draw #${record.drawNumber} ${step.draw}: ${record.winners.length} winner(s)`;
+  }
+  if (step.forfeit !== undefined) {
+    session.markWinnersAsForfeited(latestDraw(session, step.forfeit).id, step.names || [], step.reason || '');
+    return `forfeit ${step.forfeit}: ${(step.names || []).length} winner(s)`;
+  }
+  if (step.redraw !== undefined) {
+    await session.redrawForfeitedSlots(latestDraw(session, step.redraw).id, step.reason || '');
+    return `redraw ${step.redraw}`;
+  }
+  if (step.undo) {
+    await session.undo();
+    return 'undo';
+  }
+  throw new Error(`Unknown plan step: ${JSON.stringify(step)}`);
+};
+
+// ---------------------------------------------------------------------------
+// Output
+// ---------------------------------------------------------------------------
+
+const csvCell = (value) => `"${String(value ?? '').replace(/"/g, '""')}"`;
+
+const writeResults = async (path, records, meta) => {
+  const out = createWriteStream(path);
+  const write = async (chunk) => {
+    if (!out.write(chunk)) await once(out, 'drain');
+  };
+
+  if (path.endsWith('.csv')) {
+    await write('Draw #,Prize,Winner,Status,Replacement,Replaces\n');
+    for (const record of records) {
+      for (const w of record.winners) {
+        await write(`${[
+          record.drawNumber,
+          record.prizeName,
+          w.name,
+          w.status,
+          w.isReplacement ? 'yes' : '',
+          w.originalWinner || '',
+        ].map(csvCell).join(',')}\n`);
+      }
+    }
+  } else {
+    await write(`{"meta":${JSON.stringify(meta)},"draws":[`);
+    for (let i = 0; i < records.length; i++) {
+      await write(`${i > 0 ? ',' : ''}\n${JSON.stringify(records[i])}`);
+    }
+    await write('\n]}\n');
+  }
+
+  out.end();
+  await once(out, 'finish');
+};
+
+// ---------------------------------------------------------------------------
+
+const main = async () => {
+  const options = parseArgs(process.argv.slice(2));
+  const plan = options.plan ? JSON.parse(readFileSync(options.plan, 'utf8')) : {};
+  const steps = [...options.prizes.map(prizeStep), ...(plan.steps || [])];
+  if (steps.length === 0) fail('nothing to draw (use --prize or --plan)');
+
+  const started = performance.now();
+  const { names, weights } = await readCandidates(options.candidates, options.header);
+  console.error(`Loaded ${names.length.toLocaleString()} candidates${weights ? ' (weighted)' : ''}`
+    + ` in ${((performance.now() - started) / 1000).toFixed(1)} s`);
+
+  const session = createDrawSession({ checkInvariants: options.verify });
+  await session.setCandidates(names, weights);
+
+  const seed = options.seed || plan.seed;
+  if (seed) await session.enableSeededDraws(seed === 'random' ? true : seed);
+
+  for (const step of steps) {
+    try {
+      console.error(`  ${await runStep(session, step)}`);
+    } catch (error) {
+      fail(error.message);
+    }
+  }
+
+  const state = session.getState();
+  const records = state.history.toArray();
+  const invariant = await session.checkPoolInvariant();
+  const meta = {
+    candidates: names.length,
+    available: state.availableCount,
+    seed: state.drawSeed,
+    date: new Date().toISOString(),
+    poolInvariant: invariant.ok,
+  };
+
+  if (options.out) {
+    await writeResults(options.out, records, meta);
+    console.error(`Wrote ${records.length} draw(s) to ${options.out}`);
+  } else {
+    records.forEach(record => {
+      const winners = record.winners.filter(w => w.status === 'won').map(w => w.name);
+      console.log(`#${record.drawNumber} ${record.prizeName}: ${winners.join(', ')}`);
+    });
+  }
+
+  if (!invariant.ok) {
+    fail(`pool invariant broken (${invariant.leaked.length} drawn but available, `
+      + `${invariant.missing.length} undrawn but unavailable)`);
+  }
+
+  if (options.verify) {
+    const result = session.verifyHistory();
+    if (result.mismatches.length > 0) fail(`replay mismatch in ${result.mismatches.length} draw(s)`);
+    console.error(`Replay verified ${result.verified} seeded draw(s)`);
+  }
+};
+
+// Async failures (unreadable input, unwritable --out, bad plan JSON) exit cleanly too
+main().catch(error => fail(error.message));
@@ -1,4 +1,4 @@
-import { useState } from 'react';
+import { useState, useEffect } from 'react';
 import { useLuckyDraw } from './hooks/useLuckyDraw';
 import CandidateInputMode from './components/CandidateInput/CandidateInputMode';
 import CandidateList from './components/CandidateInput/CandidateList';
@@ -8,16 +8,22 @@ import DrawButton from './components/DrawConfig/DrawButton';
 import WinnerDisplay from './components/Results/WinnerDisplay';
 import ResultActions from './components/Results/ResultActions';
 import DrawHistory from './components/History/DrawHistory';
+import WinnerLookup from './components/History/WinnerLookup';
+import UndoRedoBar from './components/History/UndoRedoBar';
 import ForfeitManager from './components/Results/ForfeitManager';
 import RedrawHistory from './components/Results/RedrawHistory';
 import AnimationSettings from './components/DrawConfig/AnimationSettings';
 import AnimationControlBar from './components/Results/AnimationControlBar';
+import AuditSettings from './components/DrawConfig/AuditSettings';
+import { parseQuota } from './utils/stratified';
+import { scheduleIdle } from './utils/idle';
 
 export default function App() {
   const luckyDraw = useLuckyDraw();
 
   const [prizeLabel, setPrizeLabel] = useState('');
   const [winnerCount, setWinnerCount] = useState(1);
+  const [quotaText, setQuotaText] = useState('');
   const [selectedPrizeId, setSelectedPrizeId] = useState(null);
   const [drawError, setDrawError] = useState('');
   const [isDrawing, setIsDrawing] = useState(false);
@@ -26,9 +32,30 @@ export default function App() {
   const [animationEnabled, setAnimationEnabled] = useState(false);
   const [animationSpeed, setAnimationSpeed] = useState(2000);
 
-  const handleCandidatesLoaded = (candidates) => {
-    luckyDraw.setCandidates(candidates);
-    setDrawError('');
+  // Precompute the next draw while idle, so the click only commits it.
+  // Any pool or RNG change (draw, undo, forfeit redraw, reset, seeding on or
+  // off, another window) discards it in the engine and re-runs this effect
+  const { prepareDraw, availableCount, historyCount, drawSeed } = luckyDraw;
+  useEffect(() => {
+    if (availableCount === 0 || winnerCount > availableCount) return undefined;
+    let quota;
+    try {
+      quota = parseQuota(quotaText);
+    } catch {
+      return undefined;
+    }
+    return scheduleIdle(() => {
+      prepareDraw(winnerCount, quota).catch(() => {});
+    });
+  }, [prepareDraw, availableCount, historyCount, winnerCount, quotaText, drawSeed]);
+
+  const handleCandidatesLoaded = async (candidates, weights = null) => {
+    try {
+      await luckyDraw.setCandidates(candidates, weights);
+      setDrawError('');
+    } catch (err) {
+      setDrawError(err.message);
+    }
   };
 
   const handlePrizeSelect = (prizeId, prizeName = '', count = 1) => {
@@ -46,13 +73,27 @@ export default function App() {
   const handleDraw = async () => {
     try {
       setDrawError('');
+      const quota = parseQuota(quotaText);
       setIsDrawing(true);
       setShowCurrentDraw(true);
 
-      // Simulate brief animation delay
-      await new Promise(resolve => setTimeout(resolve, 300));
+      // Commits the idle-time precomputed draw when count and quota match
+      await luckyDraw.performDraw(winnerCount, prizeLabel, selectedPrizeId, quota);
+    } catch (err) {
+      setDrawError(err.message);
+    } finally {
+      setIsDrawing(false);
+    }
+  };
 
-      luckyDraw.performDraw(winnerCount, prizeLabel, selectedPrizeId);
+  const handleRunEvent = async () => {
+    try {
+      setDrawError('');
+      const quota = parseQuota(quotaText);
+      setIsDrawing(true);
+      setShowCurrentDraw(true);
+      await luckyDraw.performEventDraw(quota);
+      setSelectedPrizeId(null);
     } catch (err) {
       setDrawError(err.message);
     } finally {
@@ -60,36 +101,63 @@ export default function App() {
     }
   };
 
-  const handleUndoLastDraw = () => {
+  const handleUndoLastDraw = async () => {
+    try {
+      await luckyDraw.undoLastDraw();
+      setDrawError('');
+    } catch (err) {
+      setDrawError(err.message);
+    }
+  };
+
+  const handleUndo = async () => {
+    try {
+      await luckyDraw.undo();
+      setDrawError('');
+    } catch (err) {
+      setDrawError(err.message);
+    }
+  };
+
+  const handleRedo = async () => {
+    try {
+      await luckyDraw.redo();
+      setDrawError('');
+    } catch (err) {
+      setDrawError(err.message);
+    }
+  };
+
+  const handleMarkForfeited = (drawId, winnerNames, reason) => {
     try {
-      luckyDraw.undoLastDraw();
+      luckyDraw.markWinnersAsForfeited(drawId, winnerNames, reason);
       setDrawError('');
     } catch (err) {
       setDrawError(err.message);
     }
   };
 
-  const handleMarkForfeited = (drawId, winnerName, reason) => {
+  const handleRedraw = async (drawId, reason) => {
     try {
-      luckyDraw.markWinnerAsForfeited(drawId, winnerName, reason);
+      await luckyDraw.redrawForfeitedSlots(drawId, reason);
       setDrawError('');
     } catch (err) {
       setDrawError(err.message);
     }
   };
 
-  const handleRedraw = (drawId, reason) => {
+  const handleUndoLastForfeit = async (drawId) => {
     try {
-      luckyDraw.redrawForfeitedSlots(drawId, reason);
+      await luckyDraw.undoLastForfeit(drawId);
       setDrawError('');
     } catch (err) {
       setDrawError(err.message);
     }
   };
 
-  const handleUndoLastForfeit = (drawId) => {
+  const handleVoidDraw = async (drawId, reason) => {
     try {
-      luckyDraw.undoLastForfeit(drawId);
+      await luckyDraw.voidDraw(drawId, reason);
       setDrawError('');
     } catch (err) {
       setDrawError(err.message);
@@ -114,8 +182,7 @@ export default function App() {
           <div className="lg:col-span-1 lg:order-1 order-2 space-y-6">
             <CandidateInputMode onCandidatesLoaded={handleCandidatesLoaded} />
             <CandidateList
-              totalCandidates={luckyDraw.candidateCount}
-              availableCandidates={luckyDraw.availableCount}
+              stats={luckyDraw.poolStats}
               onReset={luckyDraw.resetPool}
               onClear={luckyDraw.clearAll}
             />
@@ -124,12 +191,14 @@ export default function App() {
               onAddPrize={luckyDraw.addPrize}
               onUpdatePrize={luckyDraw.updatePrize}
               onDeletePrize={luckyDraw.deletePrize}
+              onRunEvent={handleRunEvent}
+              isRunning={isDrawing}
             />
           </div>
 
           {/* Center Column: Results & History ⭐ */}
           <div className="lg:col-span-2 lg:order-2 order-1 space-y-6">
-            {luckyDraw.currentDraw && showCurrentDraw && (
+            {luckyDraw.currentDraw && !luckyDraw.currentDraw.voided && showCurrentDraw && (
               <>
                 <WinnerDisplay
                   winners={luckyDraw.currentDraw.winners}
@@ -162,11 +231,25 @@ export default function App() {
               onRedraw={handleRedraw}
             />
 
+            <UndoRedoBar
+              undoSteps={luckyDraw.undoSteps}
+              redoSteps={luckyDraw.redoSteps}
+              evictedSteps={luckyDraw.evictedSteps}
+              onUndo={handleUndo}
+              onRedo={handleRedo}
+            />
+
             <DrawHistory
               history={luckyDraw.history}
               onClearHistory={luckyDraw.clearHistory}
               onUndoLastDraw={handleUndoLastDraw}
+              onVoidDraw={handleVoidDraw}
+              pendingRecords={luckyDraw.pendingRecords}
             />
+
+            {luckyDraw.historyCount > 0 && (
+              <WinnerLookup onLookup={luckyDraw.lookupCandidate} />
+            )}
           </div>
 
           {/* Right Column: Draw Controls */}
@@ -180,6 +263,8 @@ export default function App() {
               prizes={luckyDraw.prizes}
               selectedPrizeId={selectedPrizeId}
               onPrizeSelect={handlePrizeSelect}
+              quotaText={quotaText}
+              onQuotaTextChange={setQuotaText}
             />
             <DrawButton
               isEnabled={luckyDraw.candidateCount > 0}
@@ -193,6 +278,12 @@ export default function App() {
               onToggle={setAnimationEnabled}
               onSpeedChange={setAnimationSpeed}
             />
+            <AuditSettings
+              seed={luckyDraw.drawSeed}
+              onEnable={() => luckyDraw.enableSeededDraws()}
+              onDisable={luckyDraw.disableSeededDraws}
+              onVerify={luckyDraw.verifyHistory}
+            />
           </div>
         </div>
 
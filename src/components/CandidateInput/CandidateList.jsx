@@ -1,11 +1,18 @@
 import { RotateCcw, Trash2 } from 'lucide-react';
 
 export default function CandidateList({
-  totalCandidates,
-  availableCandidates,
+  stats,
   onReset,
   onClear,
 }) {
+  const {
+    total: totalCandidates,
+    available: availableCandidates,
+    drawn: usedCount,
+    usagePercent,
+    forfeited,
+  } = stats;
+
   if (totalCandidates === 0) {
     return (
       <div className="card p-8 text-center">
@@ -16,9 +23,6 @@ export default function CandidateList({
     );
   }
 
-  const usedCount = totalCandidates - availableCandidates;
-  const usagePercent = Math.round((usedCount / totalCandidates) * 100);
-
   return (
     <div className="card p-6 space-y-4">
       <h3 className="text-2xl font-bold text-violet-400">Candidate Pool</h3>
@@ -44,7 +48,10 @@ export default function CandidateList({
       <div className="space-y-2">
         <div className="flex justify-between text-sm">
           <span>Pool Usage</span>
-          <span>{usagePercent}%</span>
+          <span>
+            {usagePercent}%
+            {forfeited > 0 && ` • ${forfeited} forfeited`}
+          </span>
         </div>
         <div className="w-full bg-gray-700 rounded-full h-3 overflow-hidden">
           <div
@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { parseFile } from '../../utils/fileParser';
+import { parseFileWithWeights } from '../../utils/fileParser';
 import { Upload } from 'lucide-react';
 
 export default function FileUpload({ onCandidatesLoaded }) {
@@ -14,14 +14,15 @@ export default function FileUpload({ onCandidatesLoaded }) {
       setError('');
       setLoading(true);
 
-      const candidates = await parseFile(file);
+      // Optional second column holds ticket counts for weighted draws
+      const { names, weights } = await parseFileWithWeights(file);
 
-      if (candidates.length === 0) {
+      if (names.length === 0) {
         setError('No valid candidates found in the file.');
         return;
       }
 
-      onCandidatesLoaded(candidates);
+      onCandidatesLoaded(names, weights);
     } catch (err) {
       setError(err.message);
     } finally {
@@ -85,6 +86,9 @@ export default function FileUpload({ onCandidatesLoaded }) {
         <p className="text-xs text-gray-500 mt-3">
           Supported: .csv, .xlsx, .xls
         </p>
+        <p className="text-xs text-gray-500">
+          Optional 2nd column: ticket count for weighted draws
+        </p>
       </label>
 
       {error && (
@@ -0,0 +1,87 @@
+import { useState } from 'react';
+import { ShieldCheck } from 'lucide-react';
+
+/**
+ * Audit Settings Component
+ *
+ * Toggles seeded (reproducible) draws and replays history against the
+ * stored seeds so auditors can confirm every result
+ */
+export default function AuditSettings({
+  seed = null,
+  onEnable = () => {},
+  onDisable = () => {},
+  onVerify = () => null,
+}) {
+  const [result, setResult] = useState(null);
+
+  const handleToggle = (checked) => {
+    if (checked) {
+      onEnable();
+    } else {
+      onDisable();
+    }
+  };
+
+  const handleVerify = () => {
+    setResult(onVerify());
+  };
+
+  return (
+    <div className="card p-6 space-y-4">
+      <div className="flex items-center gap-3 mb-4">
+        <ShieldCheck className="w-5 h-5 text-cyan-400" />
+        <h3 className="text-lg font-bold text-white">Audit</h3>
+      </div>
+
+      {/* Seeded Draws Toggle */}
+      <label className="flex items-center gap-3 cursor-pointer group">
+        <input
+          type="checkbox"
+          checked={seed !== null}
+          onChange={(e) => handleToggle(e.target.checked)}
+          className="w-5 h-5 accent-emerald-500 cursor-pointer"
+        />
+        <span className="text-gray-300 group-hover:text-gray-100 transition-colors">
+          Reproducible (Seeded) Draws
+        </span>
+      </label>
+
+      {seed && (
+        <div className="text-xs text-gray-400 bg-gray-800 p-2 rounded border border-gray-700 break-all">
+          <p>Seed: <span className="font-mono text-cyan-400">{seed}</span></p>
+        </div>
+      )}
+
+      <button
+        onClick={handleVerify}
+        className="btn-secondary w-full flex items-center justify-center gap-2"
+        title="Replay seeded draws from the candidate list and compare with history"
+      >
+        <ShieldCheck className="w-5 h-5" />
+        Verify History
+      </button>
+
+      {/* Verification Result */}
+      {result && (
+        <div
+          className={`text-xs p-2 rounded border ${
+            result.mismatches.length === 0
+              ? 'bg-emerald-900/30 border-emerald-700 text-emerald-300'
+              : 'bg-red-900/30 border-red-700 text-red-300'
+          }`}
+        >
+          <p>
+            {result.verified} verified • {result.skipped} unseeded • {result.mismatches.length} mismatch
+            {result.mismatches.length !== 1 ? 'es' : ''}
+          </p>
+          {result.mismatches.map((m, i) => (
+            <p key={i}>
+              Draw #{m.drawNumber} ({m.type}) does not match its seed
+            </p>
+          ))}
+        </div>
+      )}
+    </div>
+  );
+}
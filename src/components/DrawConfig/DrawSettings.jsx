@@ -9,6 +9,8 @@ export default function DrawSettings({
   prizes = [],
   selectedPrizeId = null,
   onPrizeSelect,
+  quotaText = '',
+  onQuotaTextChange,
 }) {
   const [mode, setMode] = useState(selectedPrizeId ? 'predefined' : 'custom');
   const maxWinners = Math.min(availableCount, 50);
@@ -161,6 +163,25 @@ export default function DrawSettings({
           </div>
         </>
       )}
+
+      {/* Group Quotas */}
+      {onQuotaTextChange && (
+        <div className="space-y-3">
+          <label className="block">
+            <p className="text-sm font-semibold mb-2">Group Quotas (optional)</p>
+            <input
+              type="text"
+              value={quotaText}
+              onChange={(e) => onQuotaTextChange(e.target.value)}
+              placeholder="e.g., KR>=2, TW<=1, SG=1"
+              className="w-full bg-gray-700 border border-gray-600 rounded-lg px-4 py-3 text-gray-100 placeholder-gray-500 focus:outline-none focus:border-cyan-500 focus:ring-2 focus:ring-cyan-500/50"
+            />
+          </label>
+          <p className="text-xs text-gray-400">
+            Groups are name prefixes (KR-MinJoon → KR). Redraws keep the same limits.
+          </p>
+        </div>
+      )}
     </div>
   );
 }
@@ -1,5 +1,5 @@
 import { useState } from 'react';
-import { Plus } from 'lucide-react';
+import { Plus, PlayCircle } from 'lucide-react';
 import PrizeCard from './PrizeCard';
 
 export default function PrizeSetup({
@@ -8,6 +8,8 @@ export default function PrizeSetup({
   onAddPrize,
   onUpdatePrize,
   onDeletePrize,
+  onRunEvent,
+  isRunning = false,
 }) {
   const [formName, setFormName] = useState('');
   const [formCount, setFormCount] = useState(1);
@@ -124,6 +126,18 @@ export default function PrizeSetup({
         </div>
       )}
 
+      {/* Run Whole Event */}
+      {onRunEvent && activePrizes.length > 1 && (
+        <button
+          onClick={onRunEvent}
+          disabled={isRunning}
+          className="w-full flex items-center justify-center gap-2 bg-cyan-600 hover:bg-cyan-700 disabled:opacity-50 disabled:cursor-not-allowed text-white py-2 rounded font-semibold transition-colors"
+        >
+          <PlayCircle className="w-5 h-5" />
+          {isRunning ? 'Drawing...' : `Run Whole Event (${activePrizes.length} prizes)`}
+        </button>
+      )}
+
       {/* Drawn Prizes */}
       {drawnPrizes.length > 0 && (
         <div className="space-y-3">
@@ -1,12 +1,21 @@
-import { Clock, Download, Trash2, RotateCcw } from 'lucide-react';
+import { useState } from 'react';
+import { Clock, Download, Trash2, RotateCcw, Ban } from 'lucide-react';
 import { downloadHistoryCSV } from '../../utils/exporter';
+import { selectRecord, selectHistoryStats } from '../../utils/selectors';
+
+// Newest draws rendered at once; older ones are read from the store on demand
+const HISTORY_WINDOW = 100;
 
 export default function DrawHistory({
   history,
   onClearHistory,
   onUndoLastDraw,
+  onVoidDraw = () => {},
+  pendingRecords = 0,
 }) {
-  if (history.length === 0) {
+  const [shown, setShown] = useState(HISTORY_WINDOW);
+
+  if (history.size === 0) {
     return (
       <div className="card p-8 text-center">
         <Clock className="w-12 h-12 mx-auto text-gray-500 mb-3" />
@@ -18,114 +27,159 @@ export default function DrawHistory({
   }
 
   const handleExportHistory = () => {
-    downloadHistoryCSV(history);
+    downloadHistoryCSV(history.toArray());
   };
 
+  const handleVoidDraw = (draw, number) => {
+    const reason = window.prompt(`Void draw #${number}? Its winners return to the pool. Reason (optional):`, '');
+    if (reason !== null) {
+      onVoidDraw(draw.id, reason.trim());
+    }
+  };
+
+  const stats = selectHistoryStats(history);
+  const start = Math.max(0, history.size - shown);
+
   return (
     <div className="card p-6 space-y-4">
       <div className="flex justify-between items-center">
         <h3 className="text-2xl font-bold text-pink-400">Draw History</h3>
-        <div className="text-lg font-bold text-gray-300">
-          {history.length} draw{history.length !== 1 ? 's' : ''}
+        <div className="text-right">
+          <p className="text-lg font-bold text-gray-300">
+            {history.size} draw{history.size !== 1 ? 's' : ''}
+          </p>
+          <p className="text-xs text-gray-400">
+            {stats.finalWinners} winner{stats.finalWinners !== 1 ? 's' : ''}
+            {stats.forfeited > 0 && ` • ${stats.forfeited} forfeited`}
+          </p>
+          {pendingRecords > 0 && (
+            <p className="text-xs text-gray-500">
+              Loading {pendingRecords} older draw{pendingRecords !== 1 ? 's' : ''}…
+            </p>
+          )}
         </div>
       </div>
 
       <div className="space-y-2 max-h-96 overflow-y-auto">
-        {history.map((draw, index) => (
-          <div
-            key={index}
-            className="bg-gray-700/50 border border-gray-600 rounded-lg p-4 space-y-2"
+        {start > 0 && (
+          <button
+            onClick={() => setShown(count => count + HISTORY_WINDOW)}
+            className="w-full text-sm text-gray-400 hover:text-gray-200 py-1"
           >
-            <div className="flex justify-between items-start">
-              <div>
-                <p className="font-semibold text-lg">Draw #{history.length - index}</p>
-                <p className="text-sm text-gray-400">
-                  {new Date(draw.timestamp).toLocaleTimeString()}
-                </p>
+            Show {Math.min(start, HISTORY_WINDOW)} older draw{Math.min(start, HISTORY_WINDOW) !== 1 ? 's' : ''}
+          </button>
+        )}
+        {history.slice(start).map((draw, offset) => {
+          const index = start + offset;
+          // Cached per record version: unchanged records skip the status split
+          const { finalWinners, forfeited: forfeitedWinners } = selectRecord(draw);
+
+          return (
+            <div
+              key={index}
+              className={`bg-gray-700/50 border border-gray-600 rounded-lg p-4 space-y-2 ${
+                draw.voided ? 'opacity-60' : ''
+              }`}
+            >
+              <div className="flex justify-between items-start">
+                <div>
+                  <p className="font-semibold text-lg">Draw #{history.size - index}</p>
+                  <p className="text-sm text-gray-400">
+                    {new Date(draw.timestamp).toLocaleTimeString()}
+                  </p>
+                </div>
+                <div className="flex items-center gap-2">
+                  {draw.voided ? (
+                    <span className="bg-red-500/20 text-red-300 px-3 py-1 rounded-full text-sm font-semibold">
+                      VOIDED
+                    </span>
+                  ) : (
+                    <>
+                      <span className="bg-gray-600 px-3 py-1 rounded-full text-sm font-semibold">
+                        {draw.winners.length} winner{draw.winners.length !== 1 ? 's' : ''}
+                      </span>
+                      <button
+                        onClick={() => handleVoidDraw(draw, history.size - index)}
+                        className="text-gray-400 hover:text-red-400 p-1"
+                        title="Void this draw and return its winners to the pool"
+                      >
+                        <Ban className="w-4 h-4" />
+                      </button>
+                    </>
+                  )}
+                </div>
               </div>
-              <span className="bg-gray-600 px-3 py-1 rounded-full text-sm font-semibold">
-                {draw.winners.length} winner{draw.winners.length !== 1 ? 's' : ''}
-              </span>
-            </div>
 
-            <p className="text-gray-300">
-              <span className="font-semibold">Prize:</span> {draw.prizeName || draw.prizeLabel || 'N/A'}
-            </p>
+              {draw.voided && (
+                <p className="text-xs text-red-300">
+                  Voided {new Date(draw.voided.timestamp).toLocaleTimeString()}
+                  {draw.voided.reason && ` (${draw.voided.reason})`}
+                  : {draw.winners.map(w => w.name).join(', ')}
+                </p>
+              )}
+
+              <p className="text-gray-300">
+                <span className="font-semibold">Prize:</span> {draw.prizeName || draw.prizeLabel || 'N/A'}
+              </p>
+
+              <div className="text-sm space-y-2">
+                {/* Final Valid Winners */}
+                <div>
+                  <p className="font-semibold text-emerald-400 mb-1">
+                    Final Winners ({finalWinners.length}):
+                  </p>
+                  <div className="flex flex-wrap gap-2">
+                    {finalWinners.map((winner, i) => (
+                      <span
+                        key={i}
+                        className="bg-emerald-500/20 text-emerald-300 px-2 py-1 rounded text-xs"
+                      >
+                        {winner.name}
+                      </span>
+                    ))}
+                  </div>
+                </div>
 
-            <div className="text-sm space-y-2">
-              {/* Get final valid winners only (status === 'won') */}
-              {(() => {
-                const finalWinners = draw.winners.filter(
-                  w => (typeof w === 'string') || (w.status === 'won')
-                );
-                const replacementWinners = draw.winners.filter(
-                  w => typeof w !== 'string' && w.isReplacement
-                );
-                const forfeitedWinners = draw.winners.filter(
-                  w => typeof w !== 'string' && w.status === 'forfeited'
-                );
-
-                return (
-                  <>
-                    {/* Final Valid Winners */}
-                    <div>
-                      <p className="font-semibold text-emerald-400 mb-1">
-                        Final Winners ({finalWinners.length}):
-                      </p>
-                      <div className="flex flex-wrap gap-2">
-                        {finalWinners.map((winner, i) => (
-                          <span
-                            key={i}
-                            className="bg-emerald-500/20 text-emerald-300 px-2 py-1 rounded text-xs"
-                          >
-                            {typeof winner === 'string' ? winner : winner.name}
+                {/* Forfeit → Replacement Mapping */}
+                {draw.redrawHistory && draw.redrawHistory.length > 0 && (
+                  <div className="border-t border-gray-600 pt-2 mt-2">
+                    <p className="font-semibold text-yellow-400 mb-1">
+                      Forfeit Mapping ({draw.redrawHistory.length}):
+                    </p>
+                    <div className="space-y-1">
+                      {draw.redrawHistory.map((entry, i) => (
+                        <div
+                          key={i}
+                          className="bg-gray-700/50 rounded px-2 py-1 text-xs text-gray-300 flex items-center gap-2"
+                        >
+                          <span className="text-red-400 line-through">
+                            {entry.forfeitedWinner}
                           </span>
-                        ))}
-                      </div>
+                          <span className="text-gray-500">→</span>
+                          <span className="text-blue-400">
+                            {entry.replacementWinner}
+                          </span>
+                          {entry.reason && (
+                            <span className="text-gray-500 italic ml-auto">
+                              ({entry.reason})
+                            </span>
+                          )}
+                        </div>
+                      ))}
                     </div>
+                  </div>
+                )}
 
-                    {/* Forfeit → Replacement Mapping */}
-                    {draw.redrawHistory && draw.redrawHistory.length > 0 && (
-                      <div className="border-t border-gray-600 pt-2 mt-2">
-                        <p className="font-semibold text-yellow-400 mb-1">
-                          Forfeit Mapping ({draw.redrawHistory.length}):
-                        </p>
-                        <div className="space-y-1">
-                          {draw.redrawHistory.map((entry, i) => (
-                            <div
-                              key={i}
-                              className="bg-gray-700/50 rounded px-2 py-1 text-xs text-gray-300 flex items-center gap-2"
-                            >
-                              <span className="text-red-400 line-through">
-                                {entry.forfeitedWinner}
-                              </span>
-                              <span className="text-gray-500">→</span>
-                              <span className="text-blue-400">
-                                {entry.replacementWinner}
-                              </span>
-                              {entry.reason && (
-                                <span className="text-gray-500 italic ml-auto">
-                                  ({entry.reason})
-                                </span>
-                              )}
-                            </div>
-                          ))}
-                        </div>
-                      </div>
-                    )}
-
-                    {/* Forfeited Winners Indicator */}
-                    {forfeitedWinners.length > 0 && (
-                      <div className="text-gray-500 text-xs italic">
-                        Note: {forfeitedWinners.length} winner{forfeitedWinners.length !== 1 ? 's' : ''} forfeited (replaced above)
-                      </div>
-                    )}
-                  </>
-                );
-              })()}
+                {/* Forfeited Winners Indicator */}
+                {forfeitedWinners.length > 0 && (
+                  <div className="text-gray-500 text-xs italic">
+                    Note: {forfeitedWinners.length} winner{forfeitedWinners.length !== 1 ? 's' : ''} forfeited (replaced above)
+                  </div>
+                )}
+              </div>
             </div>
-          </div>
-        ))}
+          );
+        })}
       </div>
 
       <div className="flex gap-2 pt-4 border-t border-gray-700">
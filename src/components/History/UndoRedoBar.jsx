@@ -0,0 +1,67 @@
+import { useEffect } from 'react';
+import { Undo2, Redo2 } from 'lucide-react';
+
+/**
+ * Undo / Redo Bar Component
+ *
+ * Steps back and forward through every logged action (draws, forfeits,
+ * redraws, prize edits). Ctrl+Z / Ctrl+Shift+Z (Cmd on macOS) work outside
+ * text fields
+ */
+export default function UndoRedoBar({
+  undoSteps = 0,
+  redoSteps = 0,
+  evictedSteps = 0,
+  onUndo = () => {},
+  onRedo = () => {},
+}) {
+  useEffect(() => {
+    const handleKeyDown = (e) => {
+      if (!(e.ctrlKey || e.metaKey) || e.key.toLowerCase() !== 'z') return;
+      const tag = e.target.tagName;
+      if (tag === 'INPUT' || tag === 'TEXTAREA' || e.target.isContentEditable) return;
+
+      e.preventDefault();
+      if (e.shiftKey) {
+        if (redoSteps > 0) onRedo();
+      } else if (undoSteps > 0) {
+        onUndo();
+      }
+    };
+
+    window.addEventListener('keydown', handleKeyDown);
+    return () => window.removeEventListener('keydown', handleKeyDown);
+  }, [undoSteps, redoSteps, onUndo, onRedo]);
+
+  if (undoSteps === 0 && redoSteps === 0) return null;
+
+  return (
+    <div className="card p-4 flex items-center justify-between gap-3">
+      <div className="flex gap-2">
+        <button
+          onClick={onUndo}
+          disabled={undoSteps === 0}
+          className="btn-secondary flex items-center gap-2 text-sm disabled:opacity-50"
+          title="Undo (Ctrl+Z)"
+        >
+          <Undo2 className="w-4 h-4" />
+          Undo ({undoSteps})
+        </button>
+        <button
+          onClick={onRedo}
+          disabled={redoSteps === 0}
+          className="btn-secondary flex items-center gap-2 text-sm disabled:opacity-50"
+          title="Redo (Ctrl+Shift+Z)"
+        >
+          <Redo2 className="w-4 h-4" />
+          Redo ({redoSteps})
+        </button>
+      </div>
+      {evictedSteps > 0 && (
+        <p className="text-xs text-gray-500">
+          {evictedSteps} oldest step{evictedSteps === 1 ? '' : 's'} dropped to save memory
+        </p>
+      )}
+    </div>
+  );
+}
@@ -0,0 +1,62 @@
+import { useState } from 'react';
+import { Search } from 'lucide-react';
+
+/**
+ * Winner Lookup Component
+ *
+ * Check-in desk query: has this person already won anything? Answers come
+ * from the name index over history, so no records are scanned
+ */
+export default function WinnerLookup({ onLookup = () => null }) {
+  const [name, setName] = useState('');
+  const [result, setResult] = useState(null);
+
+  const handleLookup = (e) => {
+    e.preventDefault();
+    const trimmed = name.trim();
+    setResult(trimmed ? onLookup(trimmed) : null);
+  };
+
+  return (
+    <div className="card p-6 space-y-4">
+      <div className="flex items-center gap-3">
+        <Search className="w-5 h-5 text-cyan-400" />
+        <h3 className="text-lg font-bold text-white">Winner Lookup</h3>
+      </div>
+
+      <form onSubmit={handleLookup} className="flex gap-2">
+        <input
+          type="text"
+          value={name}
+          onChange={(e) => setName(e.target.value)}
+          placeholder="Exact candidate name"
+          className="flex-1 bg-gray-700 border border-gray-600 rounded px-3 py-2 text-gray-100 placeholder-gray-500 focus:border-cyan-500 focus:ring-1 focus:ring-cyan-500 outline-none"
+        />
+        <button type="submit" className="btn-secondary px-4">
+          Check
+        </button>
+      </form>
+
+      {result && (
+        <div
+          className={`text-sm p-3 rounded border ${
+            result.hasWon
+              ? 'bg-emerald-900/30 border-emerald-700 text-emerald-300'
+              : 'bg-gray-800 border-gray-700 text-gray-300'
+          }`}
+        >
+          <p className="font-semibold">
+            {result.hasWon ? `${result.name} has won` : `${result.name} has not won anything`}
+          </p>
+          {result.appearances.map((a) => (
+            <p key={a.drawId} className="text-xs mt-1">
+              Draw #{a.drawNumber}
+              {a.prizeName && ` • ${a.prizeName}`} • {a.status}
+              {a.isReplacement && ' (replacement)'}
+            </p>
+          ))}
+        </div>
+      )}
+    </div>
+  );
+}
@@ -1,5 +1,6 @@
 import { X, AlertCircle } from 'lucide-react';
 import { useState } from 'react';
+import { selectRecord } from '../../utils/selectors';
 
 export default function ForfeitManager({
   isOpen,
@@ -15,13 +16,8 @@ export default function ForfeitManager({
 
   if (!isOpen || !draw) return null;
 
-  // Get active winners (not forfeited, not replacements)
-  const activeWinners = draw.winners.filter(
-    w => w.status === 'won' && !w.isReplacement
-  );
-
-  // Get forfeited winners
-  const forfeitedWinners = draw.winners.filter(w => w.status === 'forfeited');
+  // Active winners (not forfeited, not replacements) and forfeited winners
+  const { activeOriginals: activeWinners, forfeited: forfeitedWinners } = selectRecord(draw);
 
   const handleToggleForfeit = (winnerName) => {
     const newSelected = new Set(selectedForfeits);
@@ -41,9 +37,7 @@ export default function ForfeitManager({
     }
 
     try {
-      selectedForfeits.forEach(winnerName => {
-        onMarkForfeited(draw.id, winnerName, reason);
-      });
+      onMarkForfeited(draw.id, [...selectedForfeits], reason);
       setSelectedForfeits(new Set());
       setReason('');
       setError('');
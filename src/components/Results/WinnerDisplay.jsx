@@ -1,7 +1,7 @@
-import { useMemo } from 'react';
 import { Trophy, Edit2, Pause, Play } from 'lucide-react';
 import { useSequentialReveal } from '../../hooks/useSequentialReveal';
 import AnimationControlBar from './AnimationControlBar';
+import { selectWinners } from '../../utils/selectors';
 
 export default function WinnerDisplay({
   winners,
@@ -16,26 +16,11 @@ export default function WinnerDisplay({
     return null;
   }
 
-  // Handle both old (string[]) and new (WinnerObject[]) formats
-  const normalizedWinners = useMemo(
-    () => winners.map(w =>
-      typeof w === 'string' ? { name: w, status: 'won' } : w
-    ),
-    [winners]
-  );
-
   // Display all winners with status 'won' (both original and replacement)
   // Exclude only forfeited winners from display
-  const displayWinners = useMemo(
-    () => normalizedWinners.filter(w => w.status === 'won'),
-    [normalizedWinners]
-  );
-
-  // Detect if any winners are replacements (skip animation for redraw)
-  const hasReplacements = useMemo(
-    () => normalizedWinners.some(w => w.isReplacement),
-    [normalizedWinners]
-  );
+  // Replacements skip the reveal animation (redraw)
+  // Both come from the shared selector cache, keyed by the winners array
+  const { finalWinners: displayWinners, hasReplacements } = selectWinners(winners);
 
   // Use sequential reveal hook
   const {
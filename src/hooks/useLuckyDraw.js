@@ -1,429 +1,343 @@
-import { useState, useCallback, useEffect } from 'react';
-import { drawWinners } from '../utils/randomizer';
-import { loadPrizes, savePrizes, loadHistory, saveHistory, loadCandidates, saveCandidates } from '../utils/storage';
+import { useReducer, useCallback, useEffect, useMemo, useRef } from 'react';
+import { createDrawEngineClient } from '../utils/drawEngineClient';
+import { ActionTypes, drawReducer, initialDrawState, estimateBytes } from '../utils/drawState';
+import { createDrawCore, applyRemoteEffects } from '../utils/drawCore';
+import { createSyncChannel } from '../utils/sync';
+import { selectPoolStats } from '../utils/selectors';
+import { createWriteQueue } from '../utils/writeQueue';
+import { storeEntry } from '../utils/journal';
+import { createHistoryStore } from '../utils/historyStore';
+import { scheduleIdle } from '../utils/idle';
+import {
+  claimWriter,
+  loadPrizes,
+  savePrizes,
+  openHistory,
+  saveHistory,
+  loadCandidates,
+  saveCandidates,
+  loadCandidateWeights,
+  saveCandidateWeights,
+} from '../utils/idbStorage';
+
+// Records shown before the rest of history is paged in
+const FIRST_HISTORY_PAGE = 50;
 
 export const useLuckyDraw = () => {
-  const [candidatePool, setCandidatePool] = useState([]);
-  const [availableCandidates, setAvailableCandidates] = useState([]);
-  const [currentDraw, setCurrentDraw] = useState(null);
-  const [history, setHistory] = useState([]);
-  const [prizes, setPrizes] = useState([]);
-  const [nextDrawNumber, setNextDrawNumber] = useState(1);
-
-  // Load prizes from localStorage on mount
-  useEffect(() => {
-    const savedPrizes = loadPrizes();
-    if (savedPrizes && savedPrizes.length > 0) {
-      setPrizes(savedPrizes);
-    }
-  }, []);
+  const [state, dispatch] = useReducer(drawReducer, initialDrawState);
+  const {
+    candidates: candidatePool,
+    weights: candidateWeights,
+    availableCount,
+    currentDrawId,
+    history: historyStore,
+    prizes,
+    nextDrawNumber,
+    drawSeed,
+    pendingRecords,
+    source,
+  } = state;
 
-  // Load history from localStorage on mount
+  // Latest committed state, so actions read it without being recreated
+  const stateRef = useRef(state);
   useEffect(() => {
-    const savedHistory = loadHistory();
-    if (savedHistory && savedHistory.length > 0) {
-      setHistory(savedHistory);
-      // Calculate next draw number from history
-      const maxDrawNumber = Math.max(
-        0,
-        ...savedHistory.map(record => record.drawNumber || 0)
-      );
-      setNextDrawNumber(maxDrawNumber + 1);
-    }
-  }, []);
+    stateRef.current = state;
+  }, [state]);
 
-  // Save prizes to localStorage whenever they change
-  useEffect(() => {
-    saveHistory(history);
-  }, [history]);
+  // Draw engine (worker): owns the id pool, weights, exclusions and seeded RNG
+  const engineRef = useRef(null);
 
-  // Save prizes to localStorage whenever they change
   useEffect(() => {
-    savePrizes(prizes);
-  }, [prizes]);
-
-  // Set candidates from input (manual or file)
-  const setCandidates = useCallback((candidates) => {
-    setCandidatePool(candidates);
-    setAvailableCandidates(candidates);
-    setCurrentDraw(null);
+    const engine = createDrawEngineClient();
+    engineRef.current = engine;
+    return () => engine.terminate();
   }, []);
 
-  // Perform a draw
-  const performDraw = useCallback((count, prizeLabel = '', prizeId = null) => {
-    if (availableCandidates.length === 0) {
-      throw new Error('No available candidates to draw from');
-    }
-
-    if (count > availableCandidates.length) {
-      throw new Error(
-        `Cannot draw ${count} winners from ${availableCandidates.length} available candidates`
-      );
-    }
+  // Cross-window sync: local actions go out as patches (see sync.js), and
+  // patches from other windows are replayed through the engine and reducer
+  const syncRef = useRef(null);
+  const publishQueueRef = useRef(Promise.resolve());
+
+  // Dispatch a local action and broadcast it, in commit order, with the
+  // seeded stream position so other engines continue where this one is
+  const commit = useCallback((action) => {
+    dispatch(action);
+    const sync = syncRef.current;
+    if (!sync) return;
+    publishQueueRef.current = publishQueueRef.current
+      .then(() => engineRef.current.stream())
+      .then(stream => sync.publish(action, stream))
+      .catch(error => console.error('Sync publish failed:', error));
+  }, []);
 
-    // Draw winners
-    const winners = drawWinners(availableCandidates, count);
-
-    // Create draw record
-    const drawRecord = {
-      id: crypto.randomUUID(),
-      prizeId: prizeId || null,
-      prizeName: prizeLabel,
-      expectedCount: count,
-      winners: winners.map(name => ({
-        name,
-        status: 'won',
-        forfeitedAt: null,
-        replacedBy: null,
-        isReplacement: false,
-        originalWinner: null,
-      })),
-      timestamp: Date.now(),
-      drawNumber: nextDrawNumber,
-      redrawHistory: [],
+  useEffect(() => {
+    // Remote actions advance stateRef eagerly, so the next queued patch
+    // (e.g. a second undo) already sees this one
+    const applyRemote = (action) => {
+      stateRef.current = drawReducer(stateRef.current, action);
+      dispatch(action);
     };
 
-    // Update state
-    setCurrentDraw(drawRecord);
-
-    // Remove winners from available pool
-    const newAvailable = availableCandidates.filter(c => !winners.includes(c));
-    setAvailableCandidates(newAvailable);
-
-    // Add to history
-    setHistory([...history, drawRecord]);
-
-    // Increment draw number for next draw
-    setNextDrawNumber(nextDrawNumber + 1);
-
-    // Mark prize as drawn if prizeId provided
-    if (prizeId) {
-      setPrizes(prevPrizes =>
-        prevPrizes.map(p =>
-          p.id === prizeId ? { ...p, status: 'drawn' } : p
-        )
-      );
-    }
-
-    return drawRecord;
-  }, [availableCandidates, history, nextDrawNumber]);
-
-  // Reset prize statuses from 'drawn' back to 'active'
-  const resetPrizes = useCallback(() => {
-    setPrizes(prevPrizes =>
-      prevPrizes.map(p => ({ ...p, status: 'active' }))
-    );
-  }, []);
-
-  // Reset available pool (but keep history)
-  const resetPool = useCallback(() => {
-    setAvailableCandidates(candidatePool);
-    setCurrentDraw(null);
-    resetPrizes();  // Also reset prize statuses
-  }, [candidatePool, resetPrizes]);
-
-  // Clear everything
-  const clearAll = useCallback(() => {
-    setCandidatePool([]);
-    setAvailableCandidates([]);
-    setCurrentDraw(null);
-    setHistory([]);
-    resetPrizes();  // Also reset prize statuses
-  }, [resetPrizes]);
-
-  // Clear history only
-  const clearHistory = useCallback(() => {
-    setHistory([]);
+    const sync = createSyncChannel({
+      onPatch: async (action, { stream }) => {
+        const engine = engineRef.current;
+        await applyRemoteEffects(engine, stateRef.current, action);
+        if (stream) await engine.setSeed(stream.seed, stream.position);
+        applyRemote(action);
+      },
+
+      getSnapshot: async () => {
+        const engine = engineRef.current;
+        const current = stateRef.current;
+        return {
+          candidates: current.candidates,
+          weights: current.weights,
+          availableCount: current.availableCount,
+          currentDrawId: current.currentDrawId,
+          history: current.history.toArray(),
+          prizes: current.prizes,
+          nextDrawNumber: current.nextDrawNumber,
+          poolEpoch: current.poolEpoch,
+          drawSeed: current.drawSeed,
+          availableIds: await engine.availableIds(),
+          stream: await engine.stream(),
+        };
+      },
+
+      onSnapshot: async (snapshot) => {
+        const engine = engineRef.current;
+        await engine.load(snapshot.candidates, snapshot.weights);
+        const available = new Set(snapshot.availableIds);
+        const drawn = snapshot.candidates.filter((_, id) => !available.has(id));
+        if (drawn.length > 0) await engine.remove(drawn);
+        const { stream } = snapshot;
+        await engine.setSeed(stream ? stream.seed : null, stream ? stream.position : 0);
+        applyRemote({ type: ActionTypes.SNAPSHOT_LOADED, snapshot });
+      },
+
+      onConflict: ({ lost }) => {
+        console.warn(`Sync conflict: another window's action won over "${lost}", reloading its state`);
+      },
+    });
+
+    syncRef.current = sync;
+    sync.requestSnapshot();
+    return () => {
+      syncRef.current = null;
+      sync.close();
+    };
   }, []);
 
-  // Undo last draw
-  const undoLastDraw = useCallback(() => {
-    if (history.length === 0) {
-      throw new Error('No draws to undo');
-    }
-
-    const lastDraw = history[history.length - 1];
-    const newHistory = history.slice(0, -1);
+  // History store as of the last history write, for the pending-bytes estimate
+  const writtenHistoryRef = useRef(createHistoryStore());
+  // Record count at the last durability checkpoint
+  const historyLengthRef = useRef(0);
 
-    setHistory(newHistory);
-    setCurrentDraw(newHistory.length > 0 ? newHistory[newHistory.length - 1] : null);
+  // Staged hydration: prizes, the record count and the newest records first
+  // (the app is usable from here), then older records read one page per idle
+  // callback and added in one step once the last page is in, so the store is
+  // built once rather than per page. Saves wait for it, so a partial history
+  // is never written
+  useEffect(() => {
+    let cancelled = false;
+    const idle = () => new Promise(resolve => scheduleIdle(resolve));
+
+    // A snapshot from another window (sync.requestSnapshot above) may land
+    // first; it already holds the stored history, so hydration stops there
+    const adopted = () => stateRef.current.source === 'snapshot';
+
+    const hydrate = async () => {
+      const [savedPrizes, stored] = await Promise.all([loadPrizes(), openHistory()]);
+      if (cancelled) return;
+      const pages = stored.pages({ first: FIRST_HISTORY_PAGE });
+      const first = await pages.next();
+      if (cancelled) return;
+      const newest = first.done ? [] : first.value;
+      const older = [];
+
+      if (adopted()) return;
+      dispatch({
+        type: ActionTypes.HYDRATED,
+        prizes: savedPrizes && savedPrizes.length > 0 ? savedPrizes : null,
+        history: newest.length > 0 ? newest : null,
+        pendingRecords: stored.length - newest.length,
+      });
 
-    // Restore winners to available pool (handle both old and new winner formats)
-    const winnerNames = lastDraw.winners.map(w => typeof w === 'string' ? w : w.name);
-    const restoredAvailable = Array.from(new Set([...availableCandidates, ...winnerNames]));
-    setAvailableCandidates(restoredAvailable);
+      for (;;) {
+        await idle();
+        if (cancelled) return;
+        const page = await pages.next();
+        if (cancelled || adopted()) return;
+        if (page.done) break;
+        older.unshift(page.value);
+      }
+      const records = older.flat();
+      if (records.length > 0) dispatch({ type: ActionTypes.HISTORY_LOADED, records });
+      writtenHistoryRef.current = createHistoryStore(records.concat(newest));
+      historyLengthRef.current = stored.length;
+    };
 
-    // Reset prize status if it was drawn
-    if (lastDraw.prizeId) {
-      setPrizes(prevPrizes =>
-        prevPrizes.map(p =>
-          p.id === lastDraw.prizeId ? { ...p, status: 'active' } : p
-        )
-      );
-    }
+    hydrate().catch(error => console.error('Hydration failed:', error));
+    return () => {
+      cancelled = true;
+    };
+  }, []);
 
-    // Decrement draw number
-    setNextDrawNumber(prev => Math.max(1, prev - 1));
-  }, [history, availableCandidates]);
-
-  // Prize management methods
-  const addPrize = useCallback((name, winnerCount, description = '') => {
-    const newPrize = {
-      id: crypto.randomUUID(),
-      name,
-      winnerCount,
-      description,
-      createdAt: Date.now(),
-      status: 'active',
+  // Writes go through a write-behind queue: one pending write per key,
+  // flushed in idle time, when the page is hidden, and at checkpoints
+  const writeQueue = useMemo(() => createWriteQueue(), []);
+  useEffect(() => {
+    const stopListening = writeQueue.listen();
+    return () => {
+      stopListening();
+      writeQueue.checkpoint();
     };
-    setPrizes([...prizes, newPrize]);
-    return newPrize.id;
-  }, [prizes]);
-
-  const updatePrize = useCallback((id, updates) => {
-    setPrizes(prevPrizes =>
-      prevPrizes.map(p =>
-        p.id === id ? { ...p, ...updates } : p
-      )
-    );
+  }, [writeQueue]);
+
+  const writeHistory = useCallback((store) => {
+    writtenHistoryRef.current = store;
+    return saveHistory(store);
   }, []);
 
-  const deletePrize = useCallback((id) => {
-    const prize = prizes.find(p => p.id === id);
-    if (prize && prize.status === 'drawn') {
-      throw new Error('Cannot delete a drawn prize');
+  // Only the window holding the writer lock persists (see idbStorage.js
+  // claimWriter); one that takes over rewrites the state it holds
+  useEffect(() => claimWriter(() => {
+    const current = stateRef.current;
+    if (current.pendingRecords === 0) writeQueue.enqueue('history', current.history, writeHistory);
+    if (current.source) writeQueue.enqueue('prizes', current.prizes, savePrizes);
+  }), [writeQueue, writeHistory]);
+
+  // Journal history changes (new records and record patches, see journal.js)
+  // once every stored record is paged in. Entries come from the store's
+  // structural diff, so a forfeit costs its own size, not the history's.
+  // A draw, undo or clear (record count changes) is a durability checkpoint
+  useEffect(() => {
+    if (pendingRecords !== 0) return;
+    const entry = storeEntry(writtenHistoryRef.current, historyStore);
+    writeQueue.enqueue('history', historyStore, writeHistory, entry ? estimateBytes(entry) : 0);
+    if (historyStore.size !== historyLengthRef.current) {
+      historyLengthRef.current = historyStore.size;
+      writeQueue.checkpoint();
     }
-    setPrizes(prevPrizes => prevPrizes.filter(p => p.id !== id));
-  }, [prizes]);
+  }, [historyStore, pendingRecords, writeQueue, writeHistory]);
 
-  // Load last event candidates from localStorage
-  const loadLastEventCandidates = useCallback(() => {
-    const lastCandidates = loadCandidates();
+  // Prize edits coalesce into one write per flush. Saves start once state
+  // has a source (hydrated or adopted), which also writes edits made before
+  // it: HYDRATED merges them into the stored prizes
+  useEffect(() => {
+    if (source) writeQueue.enqueue('prizes', prizes, savePrizes, estimateBytes(prizes));
+  }, [prizes, source, writeQueue]);
+
+  // Pool and winner totals, updated from the history store's diff
+  const poolStats = useMemo(
+    () => selectPoolStats(candidatePool.length, availableCount, historyStore),
+    [candidatePool, availableCount, historyStore]
+  );
+
+  const currentDraw = useMemo(
+    () => (currentDrawId ? historyStore.get(currentDrawId) || null : null),
+    [historyStore, currentDrawId]
+  );
+
+  // Draw actions (draw, forfeit, redraw, undo, prizes) from the framework-free
+  // core, bound to this reducer and engine; stable for the hook's lifetime
+  // Development builds verify the pool invariant before committing a void
+  const core = useMemo(() => createDrawCore({
+    checkInvariants: import.meta.env.DEV,
+    getEngine: () => engineRef.current,
+    getState: () => stateRef.current,
+    dispatch: commit,
+  }), [commit]);
+  const { setCandidates } = core;
+
+  // Load last event candidates from storage
+  const loadLastEventCandidates = useCallback(async () => {
+    const lastCandidates = await loadCandidates();
     if (lastCandidates && lastCandidates.length > 0) {
-      setCandidates(lastCandidates);
+      const lastWeights = await loadCandidateWeights();
+      await setCandidates(
+        lastCandidates,
+        lastWeights && lastWeights.length === lastCandidates.length ? lastWeights : null
+      );
       return true;
     }
     return false;
-  }, []);
-
-  // Save current candidates to localStorage
-  const saveCurrentCandidates = useCallback(() => {
-    if (candidatePool && candidatePool.length > 0) {
-      saveCandidates(candidatePool);
-      return true;
+  }, [setCandidates]);
+
+  // Save current candidates to storage
+  const saveCurrentCandidates = useCallback(async () => {
+    const { candidates, weights } = stateRef.current;
+    if (candidates && candidates.length > 0) {
+      await writeQueue.checkpoint();
+      const saved = await Promise.all([saveCandidates(candidates), saveCandidateWeights(weights)]);
+      return saved.every(Boolean);
     }
     return false;
-  }, [candidatePool]);
-
-  // Forfeit methods
-  const markWinnerAsForfeited = useCallback((drawId, winnerName, reason = '') => {
-    setHistory(prevHistory =>
-      prevHistory.map(draw => {
-        if (draw.id === drawId) {
-          const updatedDraw = {
-            ...draw,
-            winners: draw.winners.map(w =>
-              w.name === winnerName
-                ? { ...w, status: 'forfeited', forfeitedAt: Date.now(), reason }
-                : w
-            ),
-          };
-          // Also update currentDraw if it's the current draw
-          if (currentDraw && currentDraw.id === drawId) {
-            setCurrentDraw(updatedDraw);
-          }
-          return updatedDraw;
-        }
-        return draw;
-      })
-    );
-  }, [currentDraw]);
-
-  const redrawForfeitedSlots = useCallback((drawId, reason = '') => {
-    const drawIndex = history.findIndex(d => d.id === drawId);
-    if (drawIndex === -1) {
-      throw new Error('Draw not found');
-    }
-
-    const draw = history[drawIndex];
-
-    // STEP 1: Identify forfeited slots
-    const forfeited = draw.winners.filter(w => w.status === 'forfeited');
-    const countToRedraw = forfeited.length;
-
-    if (countToRedraw === 0) {
-      throw new Error('No forfeited winners to redraw');
-    }
-
-    // STEP 2: Build exclusion set (never redraw these people)
-    const exclude = new Set();
-
-    // Exclude all winners from this prize (original + forfeited + previous replacements)
-    // This ensures we don't redraw someone who already won or already forfeited
-    draw.winners.forEach(w => exclude.add(w.name));
-
-    // Exclude anyone in redraw history (prevent re-selecting from previous redraws)
-    // This prevents re-forfeiting the same person multiple times
-    if (draw.redrawHistory) {
-      draw.redrawHistory.forEach(entry => {
-        exclude.add(entry.forfeitedWinner);
-        exclude.add(entry.replacementWinner);
-      });
-    }
-
-    // STEP 3: Filter candidate pool to eligible candidates
-    // Use FULL candidatePool (not just availableCandidates) for redraw
-    // This allows redrawing from people who haven't been involved yet
-    // Eligible = in original pool + not in exclusion set
-    const eligibleCandidates = candidatePool.filter(
-      name => !exclude.has(name)
-    );
-
-    // Validate sufficient candidates exist
-    if (eligibleCandidates.length < countToRedraw) {
-      throw new Error(
-        `Not enough candidates (need ${countToRedraw}, have ${eligibleCandidates.length})`
-      );
-    }
-
-    // STEP 4: Draw exact number of replacement winners using Fisher-Yates
-    // CRITICAL: Only draw countToRedraw new winners, NOT all original winners
-    const newWinnersList = drawWinners(eligibleCandidates, countToRedraw);
-
-    // Create replacement winner objects
-    const replacements = newWinnersList.map((name, idx) => ({
-      name,
-      status: 'won',
-      forfeitedAt: null,
-      replacedBy: null,
-      isReplacement: true,
-      originalWinner: forfeited[idx].name,
-    }));
-
-    // Create redraw history entries (audit trail)
-    const redrawEntries = forfeited.map((original, idx) => ({
-      drawId,
-      forfeitedWinner: original.name,
-      replacementWinner: replacements[idx].name,
-      timestamp: Date.now(),
-      reason,
-    }));
-
-    // STEP 5: Remove replacement winners from available candidates
-    // CRITICAL INVARIANT: candidate_pool = all - drawn - forfeited
-    // Replacement winners must be removed immediately to prevent duplicates
-    setAvailableCandidates(prev =>
-      prev.filter(name => !newWinnersList.includes(name))
-    );
-
-    // STEP 6: Update draw record with partial consolidation
-    // Final winners = original winners (both won & forfeited) + replacement winners
-    // Display logic filters to show: status === 'won' (excludes forfeited automatically)
-    const updatedDraw = {
-      ...draw,
-      // Consolidation: preserve all original winners + append replacements only
-      winners: [...draw.winners, ...replacements],
-      redrawHistory: [...(draw.redrawHistory || []), ...redrawEntries],
-    };
-
-    // STEP 7: Update both history and currentDraw
-    setHistory(prevHistory =>
-      prevHistory.map((d, idx) => {
-        if (d.id === drawId) {
-          return updatedDraw;
-        }
-        return d;
-      })
-    );
-
-    // Also update currentDraw if it's the current draw
-    if (currentDraw && currentDraw.id === drawId) {
-      setCurrentDraw(updatedDraw);
-    }
-  }, [history, candidatePool, currentDraw, availableCandidates]);
-
-  const undoLastForfeit = useCallback((drawId) => {
-    const drawIndex = history.findIndex(d => d.id === drawId);
-    if (drawIndex === -1) {
-      throw new Error('Draw not found');
-    }
-
-    const draw = history[drawIndex];
-    if (!draw.redrawHistory || draw.redrawHistory.length === 0) {
-      throw new Error('No forfeits to undo');
-    }
-
-    // Get the last redraw entry
-    const lastRedraw = draw.redrawHistory[draw.redrawHistory.length - 1];
-
-    setHistory(prevHistory =>
-      prevHistory.map(d => {
-        if (d.id === drawId) {
-          // Remove the replacement winner
-          const updatedWinners = d.winners.filter(
-            w => w.name !== lastRedraw.replacementWinner
-          );
-
-          // Restore forfeited winner to won status
-          const finalWinners = updatedWinners.map(w =>
-            w.name === lastRedraw.forfeitedWinner
-              ? { ...w, status: 'won', forfeitedAt: null, replacedBy: null, reason: '' }
-              : w
-          );
-
-          // Remove last redraw entry
-          const updatedRedrawHistory = d.redrawHistory.slice(0, -1);
-
-          return {
-            ...d,
-            winners: finalWinners,
-            redrawHistory: updatedRedrawHistory,
-          };
-        }
-        return d;
-      })
-    );
-
-    // Restore replacement winner to available candidates
-    setAvailableCandidates(prev => [
-      ...prev,
-      lastRedraw.replacementWinner,
-    ]);
-  }, [history]);
+  }, [writeQueue]);
 
   return {
     // State
     candidatePool,
-    availableCandidates,
+    candidateWeights,
+    availableCount,
+    getAvailableCandidates: core.getAvailableCandidates,
     currentDraw,
-    history,
+    // History store (historyStore.js): size, at, slice, get, diff; toArray
+    // materializes every record, so keep it off per-render paths
+    history: historyStore,
     prizes,
     nextDrawNumber,
 
     // Actions
     setCandidates,
-    performDraw,
-    resetPool,
-    clearAll,
-    clearHistory,
-    undoLastDraw,
+    performDraw: core.performDraw,
+    prepareDraw: core.prepareDraw,
+    performEventDraw: core.performEventDraw,
+    resetPool: core.resetPool,
+    clearAll: core.clearAll,
+    clearHistory: core.clearHistory,
+    undoLastDraw: core.undoLastDraw,
+    undo: core.undo,
+    redo: core.redo,
+    canUndo: state.log.length > 0,
+    canRedo: state.future.length > 0,
+    undoSteps: state.log.length,
+    redoSteps: state.future.length,
+    evictedSteps: state.evictedSteps,
 
     // Prize Management
-    addPrize,
-    updatePrize,
-    deletePrize,
+    addPrize: core.addPrize,
+    updatePrize: core.updatePrize,
+    deletePrize: core.deletePrize,
     loadLastEventCandidates,
     saveCurrentCandidates,
 
     // Forfeit & Redraw
-    markWinnerAsForfeited,
-    redrawForfeitedSlots,
-    undoLastForfeit,
+    markWinnerAsForfeited: core.markWinnerAsForfeited,
+    markWinnersAsForfeited: core.markWinnersAsForfeited,
+    redrawForfeitedSlots: core.redrawForfeitedSlots,
+    undoLastForfeit: core.undoLastForfeit,
+    voidDraw: core.voidDraw,
+
+    // Lookup
+    lookupCandidate: core.lookupCandidate,
+
+    // Audit
+    drawSeed,
+    enableSeededDraws: core.enableSeededDraws,
+    disableSeededDraws: core.disableSeededDraws,
+    verifyHistory: core.verifyHistory,
+    checkPoolInvariant: core.checkPoolInvariant,
+
+    // Persistence
+    flushPersistence: writeQueue.checkpoint,
+    getPersistenceMetrics: writeQueue.metrics,
 
     // Computed
     candidateCount: candidatePool.length,
-    availableCount: availableCandidates.length,
-    historyCount: history.length,
+    poolStats,
+    historyCount: historyStore.size,
+    pendingRecords: pendingRecords || 0,
     prizeCount: prizes.length,
   };
 };
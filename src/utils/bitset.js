@@ -0,0 +1,80 @@
+/**
+ * Fixed-size bitset over candidate ids
+ *
+ * Used as an exclusion set for forfeit redraws: set bits are ineligible,
+ * and clear bits are sampled by rank without materializing a filtered array.
+ */
+
+const popcount = (word) => {
+  let v = word - ((word >>> 1) & 0x55555555);
+  v = (v & 0x33333333) + ((v >>> 2) & 0x33333333);
+  return (Math.imul((v + (v >>> 4)) & 0x0f0f0f0f, 0x01010101) >>> 24);
+};
+
+/**
+ * Create an empty bitset
+ * @param {number} size - Number of ids
+ * @returns {Object} Bitset
+ */
+export const createBitset = (size) => {
+  const words = new Uint32Array(Math.ceil(size / 32));
+  let count = 0;
+
+  const has = (id) => (words[id >>> 5] & (1 << (id & 31))) !== 0;
+
+  return {
+    size,
+    get count() {
+      return count;
+    },
+    has,
+
+    add: (id) => {
+      if (id < 0 || id >= size || has(id)) return false;
+      words[id >>> 5] |= 1 << (id & 31);
+      count++;
+      return true;
+    },
+
+    remove: (id) => {
+      if (id < 0 || id >= size || !has(id)) return false;
+      words[id >>> 5] &= ~(1 << (id & 31));
+      count--;
+      return true;
+    },
+
+    /**
+     * Map ranks among clear bits (in id order) to ids, in one sweep
+     * @param {Array<number>} ranks - Distinct ranks in [0, size - count)
+     * @returns {Array<number>} Ids, in the same order as ranks
+     */
+    selectClear: (ranks) => {
+      const order = ranks.map((rank, i) => i).sort((a, b) => ranks[a] - ranks[b]);
+      const result = new Array(ranks.length);
+      let next = 0;
+      let seen = 0;
+
+      for (let w = 0; w < words.length && next < order.length; w++) {
+        const bitsInWord = Math.min(32, size - w * 32);
+        const clear = bitsInWord - popcount(words[w]);
+
+        // Whole word lies before the next wanted rank
+        if (seen + clear <= ranks[order[next]]) {
+          seen += clear;
+          continue;
+        }
+
+        for (let b = 0; b < bitsInWord && next < order.length; b++) {
+          if ((words[w] & (1 << b)) !== 0) continue;
+          while (next < order.length && ranks[order[next]] === seen) {
+            result[order[next]] = w * 32 + b;
+            next++;
+          }
+          seen++;
+        }
+      }
+
+      return result;
+    },
+  };
+};
@@ -0,0 +1,110 @@
+/**
+ * Interned candidate pool with O(1) removal
+ *
+ * Every name is interned once: its id is its position in the candidate list.
+ * The available pool is an Int32Array of ids plus an id -> slot map, so
+ * drawing, undoing and redrawing touch only the affected entries (swap-remove).
+ *
+ * Slot order changes as ids are removed and restored. Seeded draws need an
+ * order that history alone can reproduce, so they sample by rank in
+ * candidate-list order through a lazily built Fenwick index instead.
+ */
+
+import { sampleIndices } from './randomizer.js';
+import { createWeightIndex } from './weightIndex.js';
+
+/**
+ * Create a pool over a list of unique names
+ * @param {Array<string>} names - Candidate names (the string table)
+ * @returns {Object} Candidate pool
+ */
+export const createCandidatePool = (names) => {
+  const total = names.length;
+  const ids = new Map(names.map((name, id) => [name, id]));
+  const slots = new Int32Array(total);
+  const slotOf = new Int32Array(total);
+  let size = 0;
+  let rankIndex = null;
+
+  const reset = () => {
+    for (let id = 0; id < total; id++) {
+      slots[id] = id;
+      slotOf[id] = id;
+    }
+    size = total;
+    rankIndex = null;
+  };
+
+  const has = (id) => id >= 0 && id < total && slotOf[id] !== -1;
+
+  const remove = (id) => {
+    if (!has(id)) return false;
+    const slot = slotOf[id];
+    const last = slots[size - 1];
+    slots[slot] = last;
+    slotOf[last] = slot;
+    slotOf[id] = -1;
+    size--;
+    if (rankIndex) rankIndex.set(id, 0);
+    return true;
+  };
+
+  const restore = (id) => {
+    if (id < 0 || id >= total || has(id)) return false;
+    slots[size] = id;
+    slotOf[id] = size;
+    size++;
+    if (rankIndex) rankIndex.set(id, 1);
+    return true;
+  };
+
+  // Membership counts in candidate-list order, for rank -> id lookups
+  const getRankIndex = () => {
+    if (!rankIndex) {
+      const membership = new Uint8Array(total);
+      for (let slot = 0; slot < size; slot++) membership[slots[slot]] = 1;
+      rankIndex = createWeightIndex(membership);
+    }
+    return rankIndex;
+  };
+
+  reset();
+
+  return {
+    names,
+    total,
+    get size() {
+      return size;
+    },
+    idOf: (name) => ids.get(name),
+    nameOf: (id) => names[id],
+    has,
+    hasName: (name) => ids.has(name) && has(ids.get(name)),
+    remove,
+    restore,
+    removeName: (name) => ids.has(name) && remove(ids.get(name)),
+    restoreName: (name) => ids.has(name) && restore(ids.get(name)),
+    reset,
+
+    /**
+     * Draw count ids uniformly without removing them
+     * @param {number} count - Number of ids
+     * @param {Object} rng - RNG source
+     * @param {Object} options - { ordered } sample by candidate-list rank (seeded draws)
+     * @returns {Array<number>} Ids in draw order
+     */
+    sample: (count, rng, { ordered = false } = {}) => {
+      const picks = sampleIndices(size, count, rng);
+      if (ordered) {
+        const index = getRankIndex();
+        return picks.map(rank => index.find(rank));
+      }
+      return picks.map(slot => slots[slot]);
+    },
+
+    /**
+     * Available names in candidate-list order (O(n), for display/export only)
+     */
+    toNames: () => names.filter((_, id) => slotOf[id] !== -1),
+  };
+};
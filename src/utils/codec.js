@@ -0,0 +1,353 @@
+/**
+ * Compact binary encoding for stored candidates and history
+ *
+ * - Varints: unsigned LEB128, 1 byte below 128, 3 bytes below 2M
+ * - Name lists: front-coded (shared prefix with the previous name + UTF-8
+ *   suffix), so "Employee 000123" after "Employee 000122" costs 3 bytes
+ *   before compression
+ * - Compression: CompressionStream (gzip by default) where available, stored
+ *   uncompressed elsewhere; the format travels with the data
+ * - History: winner names become varint ids into an append-only string table
+ *   (packRecord), and winners still in their initial state keep no object
+ *
+ * Decoding is streaming: compressed chunks are inflated and decoded as they
+ * arrive, so a name list never exists as one big decompressed buffer.
+ */
+
+const encoder = new TextEncoder();
+
+/**
+ * Growable byte buffer
+ */
+const createWriter = (capacity = 1024) => {
+  let bytes = new Uint8Array(capacity);
+  let length = 0;
+
+  const reserve = (extra) => {
+    if (length + extra <= bytes.length) return;
+    let size = bytes.length * 2;
+    while (size < length + extra) size *= 2;
+    const next = new Uint8Array(size);
+    next.set(bytes.subarray(0, length));
+    bytes = next;
+  };
+
+  return {
+    varint: (value) => {
+      reserve(8);
+      let v = value;
+      while (v >= 0x80) {
+        bytes[length++] = (v % 0x80) | 0x80;
+        v = Math.floor(v / 0x80);
+      }
+      bytes[length++] = v;
+    },
+    bytes: (chunk) => {
+      reserve(chunk.length);
+      bytes.set(chunk, length);
+      length += chunk.length;
+    },
+    finish: () => bytes.slice(0, length),
+  };
+};
+
+/**
+ * Encode unsigned integers as varints
+ * @param {Iterable<number>} values
+ * @returns {Uint8Array}
+ */
+export const encodeVarints = (values) => {
+  const writer = createWriter();
+  for (const value of values) writer.varint(value);
+  return writer.finish();
+};
+
+/**
+ * Streaming varint decoder: push byte chunks, get the values completed so far
+ * @returns {Object} { push(chunk) => Array<number> }
+ */
+export const createVarintDecoder = () => {
+  let value = 0;
+  let scale = 1;
+  return {
+    push: (chunk) => {
+      const values = [];
+      for (let i = 0; i < chunk.length; i++) {
+        value += (chunk[i] & 0x7f) * scale;
+        if (chunk[i] & 0x80) {
+          scale *= 0x80;
+        } else {
+          values.push(value);
+          value = 0;
+          scale = 1;
+        }
+      }
+      return values;
+    },
+  };
+};
+
+/**
+ * Decode a varint byte array
+ * @param {Uint8Array} bytes
+ * @returns {Array<number>}
+ */
+export const decodeVarints = (bytes) => createVarintDecoder().push(bytes);
+
+// Shared UTF-16 prefix, never ending inside a surrogate pair
+const sharedPrefix = (a, b) => {
+  const max = Math.min(a.length, b.length);
+  let i = 0;
+  while (i < max && a.charCodeAt(i) === b.charCodeAt(i)) i++;
+  if (i > 0 && (b.charCodeAt(i - 1) & 0xfc00) === 0xd800) i--;
+  return i;
+};
+
+/**
+ * Front-code a name list: per name, varint shared-prefix length (UTF-16
+ * units), varint suffix byte length, UTF-8 suffix
+ * @param {Array<string>} names
+ * @returns {Uint8Array}
+ */
+export const encodeNames = (names) => {
+  const writer = createWriter(names.length * 4 + 16);
+  // Suffixes are encoded into one reused buffer (UTF-8: at most 3 bytes per unit)
+  let scratch = new Uint8Array(256);
+  let previous = '';
+  names.forEach(name => {
+    const shared = sharedPrefix(previous, name);
+    const suffix = name.slice(shared);
+    if (suffix.length * 3 > scratch.length) scratch = new Uint8Array(suffix.length * 3);
+    const { written } = encoder.encodeInto(suffix, scratch);
+    writer.varint(shared);
+    writer.varint(written);
+    writer.bytes(scratch.subarray(0, written));
+    previous = name;
+  });
+  return writer.finish();
+};
+
+/**
+ * Streaming front-coded name decoder; names may span chunk boundaries
+ * @returns {Object} { push(chunk) => Array<string> }
+ */
+export const createNameDecoder = () => {
+  const decoder = new TextDecoder();
+  let pending = new Uint8Array(0);
+  let previous = '';
+
+  // Varint at offset: [value, next offset], or null if the chunk ends first
+  const readVarint = (bytes, offset) => {
+    let value = 0;
+    let scale = 1;
+    for (let i = offset; i < bytes.length; i++) {
+      value += (bytes[i] & 0x7f) * scale;
+      if (!(bytes[i] & 0x80)) return [value, i + 1];
+      scale *= 0x80;
+    }
+    return null;
+  };
+
+  return {
+    push: (chunk) => {
+      let bytes = chunk;
+      if (pending.length > 0) {
+        bytes = new Uint8Array(pending.length + chunk.length);
+        bytes.set(pending);
+        bytes.set(chunk, pending.length);
+      }
+
+      const names = [];
+      let offset = 0;
+      while (offset < bytes.length) {
+        const shared = readVarint(bytes, offset);
+        if (!shared) break;
+        const length = readVarint(bytes, shared[1]);
+        if (!length || length[1] + length[0] > bytes.length) break;
+        const end = length[1] + length[0];
+        previous = previous.slice(0, shared[0]) + decoder.decode(bytes.subarray(length[1], end));
+        names.push(previous);
+        offset = end;
+      }
+      pending = bytes.slice(offset);
+      return names;
+    },
+  };
+};
+
+/**
+ * Decode a complete front-coded name list
+ * @param {Uint8Array} bytes
+ * @returns {Array<string>}
+ */
+export const decodeNames = (bytes) => createNameDecoder().push(bytes);
+
+// ---------------------------------------------------------------------------
+// Compression
+// ---------------------------------------------------------------------------
+
+const canCompress = () => typeof CompressionStream !== 'undefined';
+
+/**
+ * Compress bytes for storage
+ * @param {Uint8Array} bytes
+ * @param {string} format - CompressionStream format ('gzip', 'deflate', 'deflate-raw')
+ * @returns {Promise<Object>} { format: format | 'none', data: Uint8Array }
+ */
+export const compressBytes = async (bytes, format = 'gzip') => {
+  if (!canCompress()) return { format: 'none', data: bytes };
+  const stream = new Blob([bytes]).stream().pipeThrough(new CompressionStream(format));
+  return { format, data: new Uint8Array(await new Response(stream).arrayBuffer()) };
+};
+
+/**
+ * Inflate a stored blob chunk by chunk
+ * @param {Object} packed - From compressBytes
+ * @returns {AsyncGenerator<Uint8Array>}
+ */
+export async function* decompressChunks({ format, data }) {
+  if (format === 'none') {
+    yield data;
+    return;
+  }
+  const reader = new Blob([data]).stream().pipeThrough(new DecompressionStream(format)).getReader();
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) return;
+    yield value;
+  }
+}
+
+/**
+ * Front-code and compress a name list
+ * @returns {Promise<Object>} { format, data }
+ */
+export const packNames = (names) => compressBytes(encodeNames(names));
+
+/**
+ * Decode a packed name list as it inflates
+ * @param {Object} packed - From packNames
+ * @returns {AsyncGenerator<Array<string>>} Batches of names
+ */
+export async function* unpackNames(packed) {
+  const decoder = createNameDecoder();
+  for await (const chunk of decompressChunks(packed)) {
+    const names = decoder.push(chunk);
+    if (names.length > 0) yield names;
+  }
+}
+
+/**
+ * Varint-encode and compress unsigned integers (ticket counts)
+ * @returns {Promise<Object>} { format, data }
+ */
+export const packNumbers = (values) => compressBytes(encodeVarints(values));
+
+/**
+ * @param {Object} packed - From packNumbers
+ * @returns {Promise<Array<number>>}
+ */
+export const unpackNumbers = async (packed) => {
+  const decoder = createVarintDecoder();
+  const values = [];
+  for await (const chunk of decompressChunks(packed)) {
+    decoder.push(chunk).forEach(v => values.push(v));
+  }
+  return values;
+};
+
+// ---------------------------------------------------------------------------
+// History records
+// ---------------------------------------------------------------------------
+
+/**
+ * Append-only string table: name <-> id
+ * @param {Array<string>} names - Known names, ids are their positions
+ * @returns {Object} { intern(name) => id, nameOf(id), names }
+ */
+export const createStringTable = (names = []) => {
+  const ids = new Map(names.map((name, id) => [name, id]));
+  return {
+    names,
+    intern: (name) => {
+      let id = ids.get(name);
+      if (id === undefined) {
+        id = names.length;
+        names.push(name);
+        ids.set(name, id);
+      }
+      return id;
+    },
+    nameOf: (id) => names[id],
+  };
+};
+
+const isInitialWinner = (w) => w.status === 'won'
+  && w.forfeitedAt === null
+  && w.replacedBy === null
+  && w.isReplacement === false
+  && w.originalWinner === null
+  && Object.keys(w).length === 6;
+
+/**
+ * Pack a record for storage: winner and redraw names become varint ids,
+ * winners in their initial state (won, never forfeited) keep only the id
+ * @param {Object} record - DrawRecord
+ * @param {Object} table - createStringTable()
+ * @returns {Object} Packed record (structured-cloneable)
+ */
+export const packRecord = (record, table) => {
+  const { winners, redrawHistory, ...rest } = record;
+  const name = (w) => (typeof w === 'string' ? w : w.name);
+  const changed = [];
+  winners.forEach((w, i) => {
+    if (typeof w === 'string' || isInitialWinner(w)) return;
+    const { name: _, ...fields } = w;
+    changed.push([i, fields]);
+  });
+
+  return {
+    ...rest,
+    packed: {
+      winners: encodeVarints(winners.map(w => table.intern(name(w)))),
+      changed,
+      redraws: encodeVarints((redrawHistory || []).flatMap(entry => [
+        table.intern(entry.forfeitedWinner),
+        table.intern(entry.replacementWinner),
+      ])),
+      redrawFields: (redrawHistory || []).map(({ forfeitedWinner: _f, replacementWinner: _r, ...fields }) => fields),
+    },
+  };
+};
+
+/**
+ * Inverse of packRecord; records stored before packing pass through
+ * @param {Object} stored - Packed or plain record
+ * @param {Object} table - createStringTable() holding the stored names
+ * @returns {Object} DrawRecord
+ */
+export const unpackRecord = (stored, table) => {
+  if (!stored.packed) return stored;
+  const { packed, ...rest } = stored;
+
+  const winners = decodeVarints(packed.winners).map(id => ({
+    name: table.nameOf(id),
+    status: 'won',
+    forfeitedAt: null,
+    replacedBy: null,
+    isReplacement: false,
+    originalWinner: null,
+  }));
+  packed.changed.forEach(([i, fields]) => {
+    winners[i] = { name: winners[i].name, ...fields };
+  });
+
+  const redrawIds = decodeVarints(packed.redraws);
+  const redrawHistory = packed.redrawFields.map((fields, i) => ({
+    ...fields,
+    forfeitedWinner: table.nameOf(redrawIds[2 * i]),
+    replacementWinner: table.nameOf(redrawIds[2 * i + 1]),
+  }));
+
+  return { ...rest, winners, redrawHistory };
+};
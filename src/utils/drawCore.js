@@ -0,0 +1,555 @@
+/**
+ * Framework-free draw core
+ *
+ * The event's actions (draw, whole-event draw, forfeit, redraw, undo/redo,
+ * prizes, pool reset) as plain async functions over three ports:
+ *
+ *   getEngine() - a draw engine: createDrawEngine() (synchronous, Node) or
+ *                 the worker client (promises, browser); both are awaited
+ *   getState()  - the current drawReducer state
+ *   dispatch()  - commits an action to that state
+ *
+ * useLuckyDraw binds the core to React (useReducer, the engine worker and
+ * cross-window sync); createDrawSession binds it to a plain variable for Node
+ * (see cli/lucky-draw.js). Both run the same code, so the semantics and the
+ * pool invariant (pool = all - drawn - forfeited since the last pool reset)
+ * are identical.
+ */
+
+import { ActionTypes, drawReducer, initialDrawState, peekUndo, peekRedo } from './drawState.js';
+import { createDrawEngine } from './drawEngine.js';
+import { replayEvent } from './replay.js';
+import { selectRecord } from './selectors.js';
+import { remainingQuota } from './stratified.js';
+
+export const winnerName = (w) => (typeof w === 'string' ? w : w.name);
+
+/**
+ * Everyone a redraw for this draw must skip: all winners plus redraw history
+ */
+export const involvedNames = (draw) => {
+  const names = draw.winners.map(winnerName);
+  (draw.redrawHistory || []).forEach(entry => {
+    names.push(entry.forfeitedWinner, entry.replacementWinner);
+  });
+  return names;
+};
+
+/**
+ * Build a draw record; every winner starts out as 'won'
+ */
+export const createDrawRecord = ({
+  prizeId,
+  prizeName,
+  count,
+  winners,
+  drawNumber,
+  rng,
+  poolEpoch,
+  quota = null,
+  timestamp = Date.now(),
+}) => ({
+  id: crypto.randomUUID(),
+  prizeId: prizeId || null,
+  prizeName,
+  expectedCount: count,
+  winners: winners.map(name => ({
+    name,
+    status: 'won',
+    forfeitedAt: null,
+    replacedBy: null,
+    isReplacement: false,
+    originalWinner: null,
+  })),
+  timestamp,
+  drawNumber,
+  redrawHistory: [],
+  rng,
+  poolEpoch,
+  quota,
+});
+
+/**
+ * Apply a logged pool delta to the draw engine
+ * @returns {Promise<Object|null>} Engine status, or null when nothing changed
+ */
+export const applyPool = async (engine, pool) => {
+  if (!pool) return null;
+  let status = null;
+  const drawId = pool.drawId ?? null;
+  if (pool.restore && pool.restore.length > 0) {
+    status = await engine.restore(pool.restore, { drawId, forget: Boolean(pool.forget) });
+  }
+  if (pool.remove && pool.remove.length > 0) {
+    status = await engine.remove(pool.remove, { drawId });
+  }
+  return status;
+};
+
+/**
+ * Apply the engine side of an action another window committed
+ * Mirrors what the local action methods do before dispatching
+ */
+export const applyRemoteEffects = async (engine, state, action) => {
+  switch (action.type) {
+    case ActionTypes.CANDIDATES_LOADED:
+      return engine.load(action.candidates, action.weights);
+    case ActionTypes.ALL_CLEARED:
+      return engine.load([], null);
+    case ActionTypes.POOL_RESET:
+      return engine.reset();
+    case ActionTypes.HISTORY_CLEARED:
+      return engine.clearExclusions();
+    case ActionTypes.SEED_CHANGED:
+      return engine.setSeed(action.seed);
+    case ActionTypes.UNDO: {
+      const entry = peekUndo(state);
+      return entry ? applyPool(engine, entry.inverse.pool) : null;
+    }
+    case ActionTypes.REDO: {
+      const entry = peekRedo(state);
+      return entry ? applyPool(engine, entry.action.pool) : null;
+    }
+    default:
+      return applyPool(engine, action.pool);
+  }
+};
+
+// Names `draw` would return to the pool: those no other non-voided draw of the
+// current pool epoch holds (name index lookups, no history scan)
+const releasableNames = (state, draw, names) => {
+  const inCurrentPool = (record) => (record.poolEpoch || 0) === state.poolEpoch;
+  if (!inCurrentPool(draw)) return [];
+  return [...new Set(names)].filter(name => !state.history.appearancesOf(name).some(a =>
+    a.drawId !== draw.id && a.status !== 'voided' && inCurrentPool(state.history.get(a.drawId))
+  ));
+};
+
+/**
+ * Create the draw actions over an engine and a state container
+ * @param {Object} ports - { getEngine, getState, dispatch }, plus checkInvariants
+ *   to verify the pool invariant before committing a void (O(history + n),
+ *   for development and verification runs)
+ * @returns {Object} Action methods (async where they touch the engine)
+ */
+export const createDrawCore = ({ getEngine, getState, dispatch, checkInvariants = false }) => {
+  const core = {
+    // Set candidates from input (manual or file)
+    // weights: optional ticket count per candidate, parallel to candidates
+    setCandidates: async (candidates, weights = null) => {
+      const { available } = await getEngine().load(candidates, weights);
+      dispatch({ type: ActionTypes.CANDIDATES_LOADED, candidates, weights, available });
+    },
+
+    // Perform a draw (sampling runs in the draw engine)
+    // quota: optional per-group limits, e.g. { KR: { min: 2 }, TW: { max: 1 } }
+    performDraw: async (count, prizeLabel = '', prizeId = null, quota = null) => {
+      const { ids, rng, available } = await getEngine().draw(count, { quota });
+      const { candidates, nextDrawNumber: drawNumber, poolEpoch } = getState();
+      const winners = ids.map(id => candidates[id]);
+
+      // Create draw record (seeded draws record where in the stream they started)
+      const drawRecord = createDrawRecord({
+        prizeId,
+        prizeName: prizeLabel,
+        count,
+        winners,
+        drawNumber,
+        rng,
+        poolEpoch,
+        quota,
+      });
+
+      // One action: record, prize status, draw number and pool count
+      // Winners were removed from the available pool by the engine
+      dispatch({
+        type: ActionTypes.DRAWS_COMMITTED,
+        records: [drawRecord],
+        available,
+        pool: { remove: winners },
+      });
+
+      return drawRecord;
+    },
+
+    // Precompute the next draw inside the engine (sealed; performDraw with the
+    // same count and quota commits it, any pool change discards it)
+    prepareDraw: async (count, quota = null) => {
+      await getEngine().prepare(count, { quota });
+    },
+
+    // Run the whole event: draw every active prize in creation order, in one
+    // engine call, then commit all records and prize statuses together.
+    // A quota is rejected rather than silently ignored (see engine.drawBatch)
+    performEventDraw: async (quota = null) => {
+      const eventPrizes = getState().prizes
+        .filter(p => p.status === 'active')
+        .sort((a, b) => a.createdAt - b.createdAt);
+      if (eventPrizes.length === 0) {
+        throw new Error('No active prizes to draw');
+      }
+
+      const { draws, available } = await getEngine().drawBatch(
+        eventPrizes.map(p => p.winnerCount),
+        { quota }
+      );
+      const { candidates, nextDrawNumber: drawNumber, poolEpoch } = getState();
+      const timestamp = Date.now();
+      const drawRecords = eventPrizes.map((prize, i) => createDrawRecord({
+        prizeId: prize.id,
+        prizeName: prize.name,
+        count: prize.winnerCount,
+        winners: draws[i].ids.map(id => candidates[id]),
+        drawNumber: drawNumber + i,
+        rng: draws[i].rng,
+        poolEpoch,
+        timestamp,
+      }));
+
+      dispatch({
+        type: ActionTypes.DRAWS_COMMITTED,
+        records: drawRecords,
+        available,
+        pool: { remove: drawRecords.flatMap(record => record.winners.map(winnerName)) },
+      });
+
+      return drawRecords;
+    },
+
+    // Reset available pool (but keep history); prize statuses go back to 'active'
+    resetPool: async () => {
+      const { available } = await getEngine().reset();
+      dispatch({ type: ActionTypes.POOL_RESET, available });
+    },
+
+    // Clear everything
+    clearAll: async () => {
+      await getEngine().load([], null);
+      dispatch({ type: ActionTypes.ALL_CLEARED });
+    },
+
+    // Clear history only
+    clearHistory: async () => {
+      dispatch({ type: ActionTypes.HISTORY_CLEARED });
+      await getEngine().clearExclusions();
+    },
+
+    // Undo last draw
+    undoLastDraw: async () => {
+      const { history: current } = getState();
+      if (current.size === 0) {
+        throw new Error('No draws to undo');
+      }
+
+      const lastDraw = current.last();
+
+      // Restore winners to available pool (handle both old and new winner formats)
+      const pool = { restore: lastDraw.winners.map(winnerName), drawId: lastDraw.id, forget: true };
+      const { available } = await applyPool(getEngine(), pool);
+
+      // Prize status goes back to active, draw number is decremented
+      dispatch({ type: ActionTypes.DRAWS_REVERTED, drawIds: [lastDraw.id], available, pool });
+    },
+
+    // Prize management methods
+    addPrize: (name, winnerCount, description = '') => {
+      const newPrize = {
+        id: crypto.randomUUID(),
+        name,
+        winnerCount,
+        description,
+        createdAt: Date.now(),
+        status: 'active',
+      };
+      dispatch({ type: ActionTypes.PRIZE_ADDED, prize: newPrize });
+      return newPrize.id;
+    },
+
+    updatePrize: (id, updates) => {
+      dispatch({ type: ActionTypes.PRIZE_UPDATED, id, updates });
+    },
+
+    deletePrize: (id) => {
+      const prize = getState().prizes.find(p => p.id === id);
+      if (prize && prize.status === 'drawn') {
+        throw new Error('Cannot delete a drawn prize');
+      }
+      dispatch({ type: ActionTypes.PRIZE_DELETED, id });
+    },
+
+    // Void any draw (not just the last): its winners go back to the pool and
+    // later draws keep their records and numbers. Names another draw of the
+    // current pool still holds stay out (name index lookup, no replay). With
+    // checkInvariants the resulting pool is verified before committing.
+    // The draw's redraw exclusions are updated, not dropped, so undo and the
+    // rollback below put the engine back exactly as it was
+    voidDraw: async (drawId, reason = '') => {
+      const state = getState();
+      const draw = state.history.get(drawId);
+      if (!draw) {
+        throw new Error('Draw not found');
+      }
+      if (draw.voided) {
+        throw new Error('Draw is already voided');
+      }
+
+      const restore = releasableNames(state, draw, draw.winners.map(winnerName));
+
+      const engine = getEngine();
+      const pool = { restore, drawId };
+      const status = await applyPool(engine, pool);
+      const action = {
+        type: ActionTypes.DRAW_VOIDED,
+        drawId,
+        reason,
+        voidedAt: Date.now(),
+        available: status ? status.available : undefined,
+        pool,
+        prizeStatuses: draw.prizeId ? new Map([[draw.prizeId, 'active']]) : undefined,
+      };
+
+      if (checkInvariants) {
+        const invariant = checkPoolInvariant(drawReducer(state, action), await engine.availableIds());
+        if (!invariant.ok) {
+          await applyPool(engine, { remove: restore, drawId });
+          throw new Error(`Voiding would break the pool invariant (${invariant.leaked.length} drawn but available, `
+            + `${invariant.missing.length} undrawn but unavailable)`);
+        }
+      }
+
+      dispatch(action);
+    },
+
+    // Bulk forfeit: all selected no-shows of a draw in one action (one update, one render)
+    // An empty selection changes nothing: no action, no undo step, no broadcast
+    markWinnersAsForfeited: (drawId, winnerNames, reason = '') => {
+      const draw = getState().history.get(drawId);
+      if (!draw) {
+        throw new Error('Draw not found');
+      }
+      if (winnerNames.length === 0) return;
+
+      const active = new Set(selectRecord(draw).finalWinners.map(w => w.name));
+      const missing = winnerNames.filter(name => !active.has(name));
+      if (missing.length > 0) {
+        throw new Error(`Not an active winner of this draw: ${missing.join(', ')}`);
+      }
+
+      dispatch({
+        type: ActionTypes.WINNERS_FORFEITED,
+        drawId,
+        names: winnerNames,
+        reason,
+        forfeitedAt: Date.now(),
+      });
+    },
+
+    markWinnerAsForfeited: (drawId, winnerName, reason = '') => {
+      core.markWinnersAsForfeited(drawId, [winnerName], reason);
+    },
+
+    redrawForfeitedSlots: async (drawId, reason = '') => {
+      const draw = getState().history.get(drawId);
+      if (!draw) {
+        throw new Error('Draw not found');
+      }
+
+      // STEP 1: Identify forfeited slots
+      const { forfeited, finalWinners } = selectRecord(draw);
+      const countToRedraw = forfeited.length;
+
+      if (countToRedraw === 0) {
+        throw new Error('No forfeited winners to redraw');
+      }
+
+      // STEP 2-4: Draw exact number of replacement winners in the draw engine
+      // Exclusions (never redraw these people) cover all winners from this prize
+      // (original + forfeited + previous replacements) and anyone in redraw
+      // history. The engine keeps them as a per-draw bitset over candidate ids and
+      // samples from the FULL candidate list (not just available candidates),
+      // which allows redrawing from people who haven't been involved yet.
+      // CRITICAL: Only draw countToRedraw new winners, NOT all original winners
+      // Quota draws keep their group limits: kept winners count against them
+      const quota = draw.quota
+        ? remainingQuota(draw.quota, finalWinners.map(w => w.name))
+        : null;
+      const { ids, rng, available } = await getEngine().redraw(
+        drawId,
+        involvedNames(draw),
+        countToRedraw,
+        { quota }
+      );
+      const newWinnersList = ids.map(id => getState().candidates[id]);
+
+      // Create replacement winner objects
+      const replacements = newWinnersList.map((name, idx) => ({
+        name,
+        status: 'won',
+        forfeitedAt: null,
+        replacedBy: null,
+        isReplacement: true,
+        originalWinner: forfeited[idx].name,
+      }));
+
+      // Create redraw history entries (audit trail)
+      const redrawEntries = forfeited.map((original, idx) => ({
+        drawId,
+        forfeitedWinner: original.name,
+        replacementWinner: replacements[idx].name,
+        timestamp: Date.now(),
+        reason,
+        rng,
+        quota,
+      }));
+
+      // STEP 5-7: One action appends replacements and redraw entries to the record
+      // Final winners = original winners (both won & forfeited) + replacement winners
+      // Display logic filters to show: status === 'won' (excludes forfeited automatically)
+      // CRITICAL INVARIANT: candidate_pool = all - drawn - forfeited
+      // Replacement winners were removed by the engine to prevent duplicates
+      dispatch({
+        type: ActionTypes.REDRAW_COMMITTED,
+        drawId,
+        replacements,
+        entries: redrawEntries,
+        available,
+        pool: { remove: newWinnersList, drawId },
+      });
+    },
+
+    undoLastForfeit: async (drawId) => {
+      const draw = getState().history.get(drawId);
+      if (!draw) {
+        throw new Error('Draw not found');
+      }
+      if (draw.voided) {
+        throw new Error('Draw is voided');
+      }
+      if (!draw.redrawHistory || draw.redrawHistory.length === 0) {
+        throw new Error('No forfeits to undo');
+      }
+
+      // Get the last redraw entry
+      const lastRedraw = draw.redrawHistory[draw.redrawHistory.length - 1];
+
+      // Restore replacement winner to available candidates, unless another
+      // draw now holds them too (redraws sample the full list, and a pool
+      // reset lets later draws pick them again)
+      const state = getState();
+      const pool = { restore: releasableNames(state, draw, [lastRedraw.replacementWinner]), drawId };
+      const status = await applyPool(getEngine(), pool);
+
+      dispatch({
+        type: ActionTypes.REDRAW_UNDONE,
+        drawId,
+        available: status ? status.available : undefined,
+        pool,
+      });
+    },
+
+    // Check-in query: every draw a name appears in, from the history name index
+    lookupCandidate: (name) => {
+      const appearances = getState().history.appearancesOf(name);
+      return {
+        name,
+        hasWon: appearances.some(a => a.status === 'won'),
+        appearances,
+      };
+    },
+
+    // Step back / forward through the action log
+    undo: async () => {
+      const entry = peekUndo(getState());
+      if (!entry) {
+        throw new Error('Nothing to undo');
+      }
+      await applyPool(getEngine(), entry.inverse.pool);
+      dispatch({ type: ActionTypes.UNDO });
+    },
+
+    redo: async () => {
+      const entry = peekRedo(getState());
+      if (!entry) {
+        throw new Error('Nothing to redo');
+      }
+      await applyPool(getEngine(), entry.action.pool);
+      dispatch({ type: ActionTypes.REDO });
+    },
+
+    // Available names in candidate-list order (O(n); for display and export)
+    getAvailableCandidates: async () => {
+      const ids = await getEngine().availableIds();
+      return ids.map(id => getState().candidates[id]);
+    },
+
+    // Seeded draws: every draw and redraw records seed + stream position
+    // seed: hex seed to resume, or true for a fresh one
+    enableSeededDraws: async (seed = true) => {
+      dispatch({ type: ActionTypes.SEED_CHANGED, seed: await getEngine().setSeed(seed) });
+    },
+
+    disableSeededDraws: async () => {
+      dispatch({ type: ActionTypes.SEED_CHANGED, seed: await getEngine().setSeed(null) });
+    },
+
+    // Rebuild every seeded draw from the candidate list and compare with history
+    verifyHistory: () => {
+      const { candidates, history: current, weights } = getState();
+      return replayEvent(candidates, current.toArray(), weights);
+    },
+
+    // Pool invariant: available = all - winners drawn since the last reset (voided draws excepted)
+    checkPoolInvariant: async () => checkPoolInvariant(getState(), await getEngine().availableIds()),
+  };
+
+  return core;
+};
+
+/**
+ * Compare the engine's pool with what history says it must be
+ * Drawn = every winner (won, forfeited, replacement) of a non-voided draw
+ * since the last pool reset
+ * @param {Object} state - drawReducer state
+ * @param {ArrayLike<number>} availableIds - The engine's available ids
+ * @returns {Object} { ok, leaked (drawn but available), missing (undrawn but unavailable) }
+ */
+export const checkPoolInvariant = (state, availableIds) => {
+  const { candidates, history, poolEpoch } = state;
+  const drawn = new Set();
+  history.toArray().forEach(record => {
+    if ((record.poolEpoch || 0) !== poolEpoch) return;
+    record.winners.forEach(w => {
+      if (w.status !== 'voided') drawn.add(winnerName(w));
+    });
+  });
+
+  const available = new Uint8Array(candidates.length);
+  for (let i = 0; i < availableIds.length; i++) available[availableIds[i]] = 1;
+
+  const leaked = [];
+  const missing = [];
+  candidates.forEach((name, id) => {
+    if (drawn.has(name) && available[id]) leaked.push(name);
+    if (!drawn.has(name) && !available[id]) missing.push(name);
+  });
+
+  return { ok: leaked.length === 0 && missing.length === 0, leaked, missing };
+};
+
+/**
+ * Standalone session: core + in-thread engine + reducer state in a variable
+ * @param {Object} options - { engine } to share or pre-load an engine, { checkInvariants } (see createDrawCore)
+ * @returns {Object} Core actions plus getState() and engine
+ */
+export const createDrawSession = ({ engine = createDrawEngine(), checkInvariants = false } = {}) => {
+  let state = initialDrawState;
+  const core = createDrawCore({
+    checkInvariants,
+    getEngine: () => engine,
+    getState: () => state,
+    dispatch: (action) => {
+      state = drawReducer(state, action);
+    },
+  });
+  return { ...core, engine, getState: () => state };
+};
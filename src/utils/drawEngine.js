@@ -0,0 +1,361 @@
+/**
+ * Draw engine: pool maintenance and sampling for one event
+ *
+ * Owns the interned candidate pool, weighted indexes, per-group indexes for
+ * quota draws, per-draw redraw exclusions and the seeded RNG. Draw results are candidate ids (positions
+ * in the candidate list) and only the names a caller already holds are sent
+ * back in, so it can run on the main thread or inside drawEngine.worker.js
+ * unchanged.
+ */
+
+import { sampleIndices, sampleWeighted } from './randomizer.js';
+import { createSeed, createSeededRng, describeRng, getDefaultRng } from './rng.js';
+import { createWeightIndex } from './weightIndex.js';
+import { createCandidatePool } from './candidatePool.js';
+import { createBitset } from './bitset.js';
+import { createGroupIndex, sampleStratified } from './stratified.js';
+
+/**
+ * Create a draw engine
+ * @returns {Object} Engine with synchronous methods
+ */
+export const createDrawEngine = () => {
+  let pool = createCandidatePool([]);
+  let weights = null;
+  let weightedAvailable = null;
+  let weightedFull = null;
+  let seededRng = null;
+  let groups = null;
+  let groupsFull = null;
+  const exclusions = new Map();
+  // Precomputed next draw (see prepare); dropped on any pool or seed change
+  let sealed = null;
+
+  const status = () => ({ available: pool.size, total: pool.total });
+
+  const toIds = (names) => names.map(name => pool.idOf(name)).filter(id => id !== undefined);
+
+  const restoreIds = (ids) => {
+    sealed = null;
+    ids.forEach(id => {
+      if (!pool.restore(id)) return;
+      if (weightedAvailable) weightedAvailable.set(id, weights[id]);
+      if (groups) groups.restore(id);
+    });
+  };
+
+  const removeIds = (ids) => {
+    sealed = null;
+    ids.forEach(id => {
+      pool.remove(id);
+      if (weightedAvailable) weightedAvailable.set(id, 0);
+      if (groups) groups.remove(id);
+    });
+  };
+
+  // Group indexes are only built once a quota draw needs them
+  const getGroups = () => {
+    if (!groups) {
+      groups = createGroupIndex(pool.names, weights);
+      for (let id = 0; id < pool.total; id++) {
+        if (!pool.has(id)) groups.remove(id);
+      }
+    }
+    return groups;
+  };
+
+  const getGroupsFull = () => {
+    if (!groupsFull) groupsFull = createGroupIndex(pool.names, weights);
+    return groupsFull;
+  };
+
+  // A prepared draw only commits under the RNG mode (and seed) it was sampled with
+  const drawKey = (count, quota) => `${count}|${JSON.stringify(quota)}|${seededRng ? seededRng.seed : ''}`;
+
+  // Sample a draw; picks leave the sampling indexes but not the pool
+  const sampleDraw = (count, quota) => {
+    if (pool.size === 0) {
+      throw new Error('No available candidates to draw from');
+    }
+    if (count > pool.size) {
+      throw new Error(`Cannot draw ${count} winners from ${pool.size} available candidates`);
+    }
+
+    const rngInfo = describeRng(seededRng);
+    const rng = seededRng || getDefaultRng();
+    let ids;
+    if (quota) {
+      ids = sampleStratified(getGroups(), count, quota, rng);
+    } else if (weightedAvailable) {
+      ids = sampleWeighted(weightedAvailable, count, rng);
+    } else {
+      ids = pool.sample(count, rng, { ordered: Boolean(seededRng) });
+    }
+    return { ids, rngInfo };
+  };
+
+  return {
+    /**
+     * Load a new candidate list (ids = positions in names)
+     * @param {Array<string>} names - Unique candidate names
+     * @param {ArrayLike<number>|null} ticketCounts - Optional weight per candidate
+     */
+    load: (names, ticketCounts = null) => {
+      pool = createCandidatePool(names);
+      sealed = null;
+      weights = ticketCounts ? Array.from(ticketCounts) : null;
+      weightedAvailable = weights ? createWeightIndex(weights) : null;
+      weightedFull = weights ? createWeightIndex(weights) : null;
+      groups = null;
+      groupsFull = null;
+      exclusions.clear();
+      return status();
+    },
+
+    /**
+     * Switch seeded draws on (seed string, or true for a fresh seed) or off (null)
+     * @param {number} position - Stream position to resume at (another window's engine)
+     * @returns {string|null} Active seed
+     */
+    setSeed: (seed, position = 0) => {
+      sealed = null;
+      if (seed === null) {
+        seededRng = null;
+        return null;
+      }
+      seededRng = createSeededRng({ seed: seed === true ? createSeed() : seed, position });
+      return seededRng.seed;
+    },
+
+    /**
+     * Current seeded stream position ({ algorithm, seed, position }), or null when unseeded
+     */
+    stream: () => describeRng(seededRng),
+
+    /**
+     * Draw count winners and remove them from the pool
+     * Seeded draws sample in candidate-list order so replay can rebuild the pool
+     * A matching prepared draw is committed as is, without sampling again
+     * @param {number} count - Number of winners
+     * @param {Object} options - { quota } per-group minimums/maximums
+     * @returns {Object} { ids, rng, ...status }
+     */
+    draw: (count, { quota = null } = {}) => {
+      if (sealed && sealed.key === drawKey(count, quota)) {
+        const { ids, rngInfo, end } = sealed;
+        if (seededRng) seededRng = createSeededRng({ seed: seededRng.seed, position: end });
+        removeIds(ids);
+        return { ids, rng: rngInfo, ...status() };
+      }
+
+      const { ids, rngInfo } = sampleDraw(count, quota);
+      removeIds(ids);
+      return { ids, rng: rngInfo, ...status() };
+    },
+
+    /**
+     * Precompute the next draw and keep it sealed inside the engine
+     * The result is never returned; draw() with the same count and quota
+     * commits it. Any pool or seed change before then discards it. Seeded
+     * draws rewind the stream, so preparing never changes which winners a
+     * seed produces.
+     * @param {number} count - Number of winners
+     * @param {Object} options - { quota }
+     * @returns {Object} { prepared, ...status }
+     */
+    prepare: (count, { quota = null } = {}) => {
+      sealed = null;
+      const start = seededRng ? seededRng.position : 0;
+      const { ids, rngInfo } = sampleDraw(count, quota);
+
+      // Undo the sampling side effects: index picks and stream position
+      if (quota) {
+        ids.forEach(id => groups.restore(id));
+      } else if (weightedAvailable) {
+        ids.forEach(id => weightedAvailable.set(id, weights[id]));
+      }
+      let end = null;
+      if (seededRng) {
+        end = seededRng.position;
+        seededRng = createSeededRng({ seed: seededRng.seed, position: start });
+      }
+
+      sealed = { key: drawKey(count, quota), ids, rngInfo, end };
+      return { prepared: true, ...status() };
+    },
+
+    /**
+     * Draw several prizes in one call, in the given order
+     * Unseeded draws take one sample of the combined size and split it, which
+     * is distributed exactly like consecutive draws. Seeded draws stay
+     * consecutive so each record keeps its own replayable stream position.
+     * All or nothing: if any prize cannot be drawn, earlier prizes' winners go
+     * back to the pool and the seeded stream is rewound. Quota draws are not
+     * batched (group limits apply to one prize's winners)
+     * @param {Array<number>} counts - Winners per prize
+     * @param {Object} options - { quota } rejected, see above
+     * @returns {Object} { draws: [{ ids, rng }], ...status }
+     */
+    drawBatch: (counts, { quota = null } = {}) => {
+      if (quota) {
+        throw new Error('Quota draws cannot be batched; draw each prize on its own');
+      }
+      const needed = counts.reduce((sum, count) => sum + count, 0);
+      if (needed > pool.size) {
+        throw new Error(`Cannot draw ${needed} winners from ${pool.size} available candidates`);
+      }
+
+      let draws;
+      if (seededRng || weightedAvailable) {
+        const start = seededRng ? seededRng.position : 0;
+        const taken = [];
+        try {
+          draws = counts.map(count => {
+            const rngInfo = describeRng(seededRng);
+            const ids = weightedAvailable
+              ? sampleWeighted(weightedAvailable, count, seededRng || getDefaultRng())
+              : pool.sample(count, seededRng, { ordered: true });
+            removeIds(ids);
+            ids.forEach(id => taken.push(id));
+            return { ids, rng: rngInfo };
+          });
+        } catch (error) {
+          restoreIds(taken);
+          if (seededRng) seededRng = createSeededRng({ seed: seededRng.seed, position: start });
+          throw error;
+        }
+      } else {
+        const all = pool.sample(needed, getDefaultRng());
+        removeIds(all);
+        let offset = 0;
+        draws = counts.map(count => {
+          const ids = all.slice(offset, offset + count);
+          offset += count;
+          return { ids, rng: null };
+        });
+      }
+
+      return { draws, ...status() };
+    },
+
+    /**
+     * Return names to the pool (undo of a draw or a redraw)
+     * @param {Array<string>} names - Candidate names
+     * @param {Object} options - { drawId, forget } to update or drop that draw's exclusions
+     */
+    restore: (names, { drawId = null, forget = false } = {}) => {
+      const ids = toIds(names);
+      restoreIds(ids);
+      if (drawId !== null) {
+        if (forget) {
+          exclusions.delete(drawId);
+        } else if (exclusions.has(drawId)) {
+          ids.forEach(id => exclusions.get(drawId).remove(id));
+        }
+      }
+      return status();
+    },
+
+    /**
+     * Take names out of the pool again (redo of a draw or a redraw)
+     * @param {Array<string>} names - Candidate names
+     * @param {Object} options - { drawId } to add them back to that draw's exclusions
+     */
+    remove: (names, { drawId = null } = {}) => {
+      const ids = toIds(names);
+      removeIds(ids);
+      if (drawId !== null && exclusions.has(drawId)) {
+        ids.forEach(id => exclusions.get(drawId).add(id));
+      }
+      return status();
+    },
+
+    /**
+     * Draw replacements for a draw's forfeited slots
+     * Eligible = full candidate list minus everyone involved in this draw
+     * @param {string} drawId - Draw record id
+     * @param {Array<string>} involvedNames - Winners and redraw-history names of the draw
+     * @param {number} count - Slots to fill
+     * @param {Object} options - { quota } what is left of the draw's group quota
+     * @returns {Object} { ids, rng, ...status }
+     */
+    redraw: (drawId, involvedNames, count, { quota = null } = {}) => {
+      const involvedIds = toIds(involvedNames);
+      let exclude = exclusions.get(drawId);
+      if (!exclude) {
+        exclude = createBitset(pool.total);
+        involvedIds.forEach(id => exclude.add(id));
+        exclusions.set(drawId, exclude);
+      }
+
+      const eligibleCount = pool.total - exclude.count;
+      if (eligibleCount < count) {
+        throw new Error(`Not enough candidates (need ${count}, have ${eligibleCount})`);
+      }
+
+      const rngInfo = describeRng(seededRng);
+      const rng = seededRng || getDefaultRng();
+      let ids;
+      if (quota) {
+        // Same pattern over the full-list group indexes
+        const full = getGroupsFull();
+        involvedIds.forEach(id => full.remove(id));
+        try {
+          ids = sampleStratified(full, count, quota, rng);
+          ids.forEach(id => full.restore(id));
+        } finally {
+          involvedIds.forEach(id => full.restore(id));
+        }
+      } else if (weightedFull) {
+        // Zero the exclusions in the full index for this sample only, then restore
+        involvedIds.forEach(id => weightedFull.set(id, 0));
+        try {
+          ids = sampleWeighted(weightedFull, count, rng);
+          ids.forEach(id => weightedFull.set(id, weights[id]));
+        } finally {
+          involvedIds.forEach(id => weightedFull.set(id, weights[id]));
+        }
+      } else {
+        ids = exclude.selectClear(sampleIndices(eligibleCount, count, rng));
+      }
+
+      ids.forEach(id => exclude.add(id));
+      removeIds(ids);
+      return { ids, rng: rngInfo, ...status() };
+    },
+
+    /**
+     * Return everyone to the pool (history is kept by the caller)
+     */
+    reset: () => {
+      sealed = null;
+      pool.reset();
+      weightedAvailable = weights ? createWeightIndex(weights) : null;
+      if (groups) groups.reset();
+      return status();
+    },
+
+    /**
+     * Drop all redraw exclusions (history cleared)
+     */
+    clearExclusions: () => {
+      exclusions.clear();
+      return status();
+    },
+
+    /**
+     * Available ids in candidate-list order
+     * @returns {Int32Array} Ids
+     */
+    availableIds: () => {
+      const ids = new Int32Array(pool.size);
+      let next = 0;
+      for (let id = 0; id < pool.total; id++) {
+        if (pool.has(id)) ids[next++] = id;
+      }
+      return ids;
+    },
+
+    status,
+  };
+};
@@ -0,0 +1,115 @@
+/**
+ * Promise-based client for the draw engine
+ *
+ * Runs the engine in a dedicated Web Worker when available, so sampling and
+ * pool maintenance never block rendering. Falls back to an in-thread engine
+ * with the same async API (e.g. in environments without module workers).
+ */
+
+import { createDrawEngine } from './drawEngine.js';
+
+const toArray = (result) => {
+  if (result instanceof Int32Array) return Array.from(result);
+  if (result && result.ids instanceof Int32Array) {
+    return { ...result, ids: Array.from(result.ids) };
+  }
+  if (result && Array.isArray(result.draws)) {
+    return { ...result, draws: result.draws.map(draw => ({ ...draw, ids: Array.from(draw.ids) })) };
+  }
+  return result;
+};
+
+/**
+ * In-thread engine behind the same async interface
+ */
+const createLocalTransport = () => {
+  const engine = createDrawEngine();
+  return {
+    call: (method, args) => {
+      try {
+        return Promise.resolve(engine[method](...args));
+      } catch (error) {
+        return Promise.reject(error);
+      }
+    },
+    terminate: () => {},
+  };
+};
+
+/**
+ * Worker-backed engine; replies are matched to requests by id
+ */
+const createWorkerTransport = () => {
+  const worker = new Worker(new URL('../workers/drawEngine.worker.js', import.meta.url), {
+    type: 'module',
+  });
+  const pending = new Map();
+  let nextId = 1;
+
+  worker.onmessage = (event) => {
+    const { id, result, error } = event.data;
+    const request = pending.get(id);
+    if (!request) return;
+    pending.delete(id);
+    if (error) {
+      request.reject(new Error(error));
+    } else {
+      request.resolve(result);
+    }
+  };
+
+  worker.onerror = (event) => {
+    console.error('Draw engine worker failed:', event.message);
+    pending.forEach(request => request.reject(new Error('Draw engine worker failed')));
+    pending.clear();
+  };
+
+  return {
+    call: (method, args, transfer = []) => {
+      return new Promise((resolve, reject) => {
+        const id = nextId++;
+        pending.set(id, { resolve, reject });
+        worker.postMessage({ id, method, args }, transfer);
+      });
+    },
+    terminate: () => worker.terminate(),
+  };
+};
+
+/**
+ * Create a draw engine client
+ * @returns {Object} Engine client; every method returns a Promise
+ */
+export const createDrawEngineClient = () => {
+  let transport;
+  try {
+    transport = typeof Worker === 'undefined' ? createLocalTransport() : createWorkerTransport();
+  } catch (error) {
+    console.error('Falling back to in-thread draw engine:', error);
+    transport = createLocalTransport();
+  }
+
+  const call = (method, args = [], transfer = []) =>
+    transport.call(method, args, transfer).then(toArray);
+
+  return {
+    load: (names, weights = null) => {
+      // Ticket counts travel as a transferable typed array
+      const ticketCounts = weights ? Uint32Array.from(weights) : null;
+      return call('load', [names, ticketCounts], ticketCounts ? [ticketCounts.buffer] : []);
+    },
+    setSeed: (seed, position = 0) => call('setSeed', [seed, position]),
+    stream: () => call('stream'),
+    draw: (count, options) => call('draw', [count, options]),
+    prepare: (count, options) => call('prepare', [count, options]),
+    drawBatch: (counts, options) => call('drawBatch', [counts, options]),
+    restore: (names, options) => call('restore', [names, options]),
+    remove: (names, options) => call('remove', [names, options]),
+    redraw: (drawId, involvedNames, count, options) =>
+      call('redraw', [drawId, involvedNames, count, options]),
+    reset: () => call('reset'),
+    clearExclusions: () => call('clearExclusions'),
+    availableIds: () => call('availableIds'),
+    terminate: () => transport.terminate(),
+  };
+};
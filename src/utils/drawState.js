@@ -0,0 +1,520 @@
+/**
+ * Event-sourced state core for a lucky draw event
+ *
+ * All event state lives in one object driven by drawReducer. Every undoable
+ * action is appended to an action log together with its inverse, which the
+ * reducer derives from the state the action was applied to. Undo applies the
+ * inverse and redo re-applies the action, so both only touch what the action
+ * changed. Inverses are compact diffs: pool deltas as names, and record
+ * patches holding only the winner / redraw entries that changed.
+ *
+ * The undo log is capped at UNDO_MEMORY_LIMIT estimated bytes (logBytes);
+ * the oldest entries are evicted first. Redo entries are not counted: they
+ * are entries undo moved off the log, and a new action drops them.
+ *
+ * Actions with pool effects carry `pool: { remove, restore, drawId }` (names)
+ * and the engine's resulting `available` count. The reducer never talks to the
+ * draw engine; callers apply `pool` to the engine and then dispatch.
+ *
+ * Actions without a cheap inverse (pool reset, clearing history) are barriers:
+ * they clear the log, so undo never steps across them.
+ *
+ * The reducer is deterministic, so other windows stay in step by replaying
+ * the same actions (see sync.js); SNAPSHOT_LOADED replaces everything with a
+ * peer's state when they cannot.
+ *
+ * `history` is a persistent history store (see historyStore.js): record
+ * updates copy only the path to the changed record, never the whole history.
+ */
+
+import { createHistoryStore } from './historyStore.js';
+
+export const ActionTypes = {
+  HYDRATED: 'hydrated',
+  HISTORY_LOADED: 'historyLoaded',
+  CANDIDATES_LOADED: 'candidatesLoaded',
+  SEED_CHANGED: 'seedChanged',
+  DRAWS_COMMITTED: 'drawsCommitted',
+  DRAWS_REVERTED: 'drawsReverted',
+  DRAW_VOIDED: 'drawVoided',
+  WINNERS_FORFEITED: 'winnersForfeited',
+  REDRAW_COMMITTED: 'redrawCommitted',
+  REDRAW_UNDONE: 'redrawUndone',
+  RECORD_PATCHED: 'recordPatched',
+  PRIZE_ADDED: 'prizeAdded',
+  PRIZE_UPDATED: 'prizeUpdated',
+  PRIZE_DELETED: 'prizeDeleted',
+  POOL_RESET: 'poolReset',
+  HISTORY_CLEARED: 'historyCleared',
+  ALL_CLEARED: 'allCleared',
+  SNAPSHOT_LOADED: 'snapshotLoaded',
+  UNDO: 'undo',
+  REDO: 'redo',
+};
+
+const T = ActionTypes;
+
+// Not logged: they neither need nor break undo
+const UNLOGGED = new Set([T.HYDRATED, T.HISTORY_LOADED, T.SEED_CHANGED]);
+// Logged as barriers: no inverse, the log is cleared
+const BARRIERS = new Set([
+  T.CANDIDATES_LOADED,
+  T.POOL_RESET,
+  T.HISTORY_CLEARED,
+  T.ALL_CLEARED,
+  T.SNAPSHOT_LOADED,
+]);
+
+// Estimated bytes the undo log may hold before the oldest entries go
+export const UNDO_MEMORY_LIMIT = 4 * 1024 * 1024;
+
+export const initialDrawState = {
+  candidates: [],
+  weights: null,
+  availableCount: 0,
+  currentDrawId: null,
+  history: createHistoryStore(),
+  prizes: [],
+  nextDrawNumber: 1,
+  poolEpoch: 0,
+  drawSeed: null,
+  log: [],
+  future: [],
+  logBytes: 0,
+  evictedSteps: 0,
+  // Stored records not paged in yet; null until hydrated
+  pendingRecords: null,
+  // Where history came from: null (nothing yet), 'storage' (hydrated) or
+  // 'snapshot' (adopted from another window; storage pages are then ignored)
+  source: null,
+};
+
+// Stored prizes, then prizes added before hydration finished; an id in
+// both keeps the in-memory (newer) version in the stored position
+const mergePrizes = (stored, current) => {
+  if (current.length === 0) return stored;
+  const byId = new Map(current.map(prize => [prize.id, prize]));
+  const merged = stored.map(prize => {
+    const edited = byId.get(prize.id);
+    byId.delete(prize.id);
+    return edited || prize;
+  });
+  return merged.concat([...byId.values()]);
+};
+
+// Largest value of a numeric record field (a loop: no argument spreading,
+// which overflows the stack on very large histories)
+const maxOf = (records, key) => {
+  let max = 0;
+  for (let i = 0; i < records.length; i++) {
+    if (records[i][key] > max) max = records[i][key];
+  }
+  return max;
+};
+
+const lastId = (history) => (history.size > 0 ? history.last().id : null);
+
+const setPrizeStatus = (prizes, statuses) => {
+  if (statuses.size === 0) return prizes;
+  return prizes.map(p => (statuses.has(p.id) ? { ...p, status: statuses.get(p.id) } : p));
+};
+
+const withPool = (state, action) =>
+  (action.available !== undefined ? { ...state, availableCount: action.available } : state);
+
+const invertPool = (pool) => pool && {
+  remove: pool.restore || [],
+  restore: pool.remove || [],
+  drawId: pool.drawId ?? null,
+};
+
+// Array patch: slots that differ by reference, plus the target length
+const diffArray = (from = [], to = []) => {
+  const set = [];
+  for (let i = 0; i < to.length; i++) {
+    if (from[i] !== to[i]) set.push([i, to[i]]);
+  }
+  return { length: to.length, set };
+};
+
+const patchArray = (array = [], { length, set }) => {
+  const next = array.slice(0, length);
+  set.forEach(([i, value]) => {
+    next[i] = value;
+  });
+  return next;
+};
+
+/**
+ * Compact patch turning record `from` into record `to`
+ * Unchanged winners and redraw entries are shared by reference, so only the
+ * touched slots end up in the patch
+ */
+export const diffRecord = (from, to) => {
+  const patch = {};
+  new Set([...Object.keys(from), ...Object.keys(to)]).forEach(key => {
+    if (from[key] === to[key]) return;
+    patch[key] = Array.isArray(from[key]) && Array.isArray(to[key])
+      ? { array: diffArray(from[key], to[key]) }
+      : { value: to[key] };
+  });
+  return patch;
+};
+
+/**
+ * Apply a diffRecord patch (returns a new record)
+ */
+export const patchRecord = (record, patch) => {
+  const next = { ...record };
+  Object.entries(patch).forEach(([key, change]) => {
+    next[key] = change.array ? patchArray(record[key], change.array) : change.value;
+  });
+  return next;
+};
+
+// Replace a record; the inverse is a patch back to the previous version.
+// Optional action.prizeStatuses (prize id -> status) are applied and inverted too
+const updateRecord = (state, record, updated, action) => {
+  let { prizes } = state;
+  let previousStatuses;
+  if (action.prizeStatuses) {
+    previousStatuses = new Map();
+    action.prizeStatuses.forEach((_, id) => {
+      const prize = prizes.find(p => p.id === id);
+      if (prize) previousStatuses.set(id, prize.status);
+    });
+    prizes = setPrizeStatus(prizes, action.prizeStatuses);
+  }
+
+  return [
+    withPool({ ...state, prizes, history: state.history.update(updated) }, action),
+    {
+      type: T.RECORD_PATCHED,
+      drawId: record.id,
+      patch: diffRecord(updated, record),
+      available: action.available !== undefined ? state.availableCount : undefined,
+      pool: invertPool(action.pool),
+      prizeStatuses: previousStatuses,
+    },
+  ];
+};
+
+/**
+ * Apply a domain action; returns [nextState, inverse]
+ */
+const apply = (state, action) => {
+  switch (action.type) {
+    // Stage one of hydration: prizes and the newest history records;
+    // action.pendingRecords older ones follow as HISTORY_LOADED.
+    // A no-op once another window's snapshot was adopted: that state already
+    // includes everything stored, and merging would duplicate records
+    case T.HYDRATED: {
+      if (state.source === 'snapshot') return [state, null];
+      const next = {
+        ...state,
+        prizes: action.prizes ? mergePrizes(action.prizes, state.prizes) : state.prizes,
+        pendingRecords: action.pendingRecords || 0,
+        source: 'storage',
+      };
+      if (action.history && action.history.length > 0) {
+        const records = action.history;
+        next.history = createHistoryStore(records.concat(state.history.toArray()));
+        next.nextDrawNumber = Math.max(state.nextDrawNumber, maxOf(records, 'drawNumber') + 1);
+        next.poolEpoch = Math.max(state.poolEpoch, maxOf(records, 'poolEpoch'));
+      }
+      return [next, null];
+    }
+
+    // Every older stored record, prepended in one store build once all pages
+    // are read. Dropped once history was replaced (cleared, or a snapshot
+    // from another window)
+    case T.HISTORY_LOADED: {
+      if (state.source !== 'storage' || !state.pendingRecords) return [state, null];
+      const { records } = action;
+      return [{
+        ...state,
+        history: createHistoryStore(records.concat(state.history.toArray())),
+        nextDrawNumber: Math.max(state.nextDrawNumber, maxOf(records, 'drawNumber') + 1),
+        poolEpoch: Math.max(state.poolEpoch, maxOf(records, 'poolEpoch')),
+        pendingRecords: Math.max(0, state.pendingRecords - records.length),
+      }, null];
+    }
+
+    case T.CANDIDATES_LOADED:
+      return [{
+        ...state,
+        candidates: action.candidates,
+        weights: action.weights,
+        availableCount: action.available,
+        currentDrawId: null,
+      }, null];
+
+    case T.SEED_CHANGED:
+      return [{ ...state, drawSeed: action.seed }, null];
+
+    case T.DRAWS_COMMITTED: {
+      const { records } = action;
+      const statuses = new Map();
+      const previous = new Map();
+      records.forEach(record => {
+        if (!record.prizeId) return;
+        statuses.set(record.prizeId, 'drawn');
+        const prize = state.prizes.find(p => p.id === record.prizeId);
+        if (prize) previous.set(prize.id, prize.status);
+      });
+
+      const next = withPool({
+        ...state,
+        history: state.history.append(records),
+        prizes: setPrizeStatus(state.prizes, statuses),
+        nextDrawNumber: state.nextDrawNumber + records.length,
+        currentDrawId: records[records.length - 1].id,
+      }, action);
+
+      return [next, {
+        type: T.DRAWS_REVERTED,
+        drawIds: records.map(record => record.id),
+        prizeStatuses: previous,
+        nextDrawNumber: state.nextDrawNumber,
+        currentDrawId: state.currentDrawId,
+        available: state.availableCount,
+        pool: invertPool(action.pool),
+      }];
+    }
+
+    case T.DRAWS_REVERTED: {
+      // Reverts the newest records (the tail of history)
+      const count = action.drawIds.length;
+      const removed = [];
+      for (let i = state.history.size - count; i < state.history.size; i++) {
+        removed.push(state.history.at(i));
+      }
+      const history = state.history.truncate(state.history.size - count);
+
+      const statuses = action.prizeStatuses || new Map(
+        removed.filter(record => record.prizeId).map(record => [record.prizeId, 'active'])
+      );
+
+      const next = withPool({
+        ...state,
+        history,
+        prizes: setPrizeStatus(state.prizes, statuses),
+        nextDrawNumber: action.nextDrawNumber ?? Math.max(1, state.nextDrawNumber - count),
+        currentDrawId: action.currentDrawId !== undefined ? action.currentDrawId : lastId(history),
+      }, action);
+
+      return [next, {
+        type: T.DRAWS_COMMITTED,
+        records: removed,
+        available: state.availableCount,
+        pool: invertPool(action.pool),
+      }];
+    }
+
+    // Void any draw, not just the newest: the record stays in history (later
+    // draws keep their numbers) with every winner marked 'voided'
+    case T.DRAW_VOIDED: {
+      const record = state.history.get(action.drawId);
+      if (!record || record.voided) return [state, null];
+      const updated = {
+        ...record,
+        winners: record.winners.map(w => (typeof w === 'string'
+          ? { name: w, status: 'voided' }
+          : { ...w, status: 'voided' })),
+        voided: { timestamp: action.voidedAt, reason: action.reason },
+      };
+      return updateRecord(state, record, updated, action);
+    }
+
+    case T.WINNERS_FORFEITED: {
+      const record = state.history.get(action.drawId);
+      if (!record) return [state, null];
+      // Name -> slot lookup, then patch only the selected slots
+      const slots = new Map(record.winners.map((w, i) => [w.name, i]));
+      const winners = record.winners.slice();
+      let changed = false;
+      action.names.forEach(name => {
+        const i = slots.get(name);
+        if (i === undefined) return;
+        winners[i] = { ...winners[i], status: 'forfeited', forfeitedAt: action.forfeitedAt, reason: action.reason };
+        changed = true;
+      });
+      // Nothing matched: no new record version and no undo step
+      if (!changed) return [state, null];
+      return updateRecord(state, record, { ...record, winners }, action);
+    }
+
+    case T.REDRAW_COMMITTED: {
+      const record = state.history.get(action.drawId);
+      if (!record) return [state, null];
+      // Consolidation: preserve all original winners + append replacements only
+      const updated = {
+        ...record,
+        winners: [...record.winners, ...action.replacements],
+        redrawHistory: [...(record.redrawHistory || []), ...action.entries],
+      };
+      return updateRecord(state, record, updated, action);
+    }
+
+    case T.REDRAW_UNDONE: {
+      const record = state.history.get(action.drawId);
+      if (!record) return [state, null];
+      const lastRedraw = record.redrawHistory[record.redrawHistory.length - 1];
+
+      // Remove the replacement winner and restore the forfeited winner to won
+      const updated = {
+        ...record,
+        winners: record.winners
+          .filter(w => w.name !== lastRedraw.replacementWinner)
+          .map(w =>
+            w.name === lastRedraw.forfeitedWinner
+              ? { ...w, status: 'won', forfeitedAt: null, replacedBy: null, reason: '' }
+              : w
+          ),
+        redrawHistory: record.redrawHistory.slice(0, -1),
+      };
+      return updateRecord(state, record, updated, action);
+    }
+
+    case T.RECORD_PATCHED: {
+      const record = state.history.get(action.drawId);
+      if (!record) return [state, null];
+      return updateRecord(state, record, patchRecord(record, action.patch), action);
+    }
+
+    case T.PRIZE_ADDED: {
+      const prizes = state.prizes.slice();
+      prizes.splice(action.index ?? prizes.length, 0, action.prize);
+      return [{ ...state, prizes }, { type: T.PRIZE_DELETED, id: action.prize.id }];
+    }
+
+    case T.PRIZE_UPDATED: {
+      const prize = state.prizes.find(p => p.id === action.id);
+      if (!prize) return [state, null];
+      const previous = {};
+      Object.keys(action.updates).forEach(key => {
+        previous[key] = prize[key];
+      });
+      return [
+        { ...state, prizes: state.prizes.map(p => (p.id === action.id ? { ...p, ...action.updates } : p)) },
+        { type: T.PRIZE_UPDATED, id: action.id, updates: previous },
+      ];
+    }
+
+    case T.PRIZE_DELETED: {
+      const index = state.prizes.findIndex(p => p.id === action.id);
+      if (index === -1) return [state, null];
+      return [
+        { ...state, prizes: state.prizes.filter(p => p.id !== action.id) },
+        { type: T.PRIZE_ADDED, prize: state.prizes[index], index },
+      ];
+    }
+
+    case T.POOL_RESET:
+      return [withPool({
+        ...state,
+        currentDrawId: null,
+        poolEpoch: state.poolEpoch + 1,
+        prizes: state.prizes.map(p => ({ ...p, status: 'active' })),
+      }, action), null];
+
+    case T.HISTORY_CLEARED:
+      return [{ ...state, history: createHistoryStore(), currentDrawId: null, pendingRecords: 0 }, null];
+
+    // Another window's full state (its draw engine was loaded to match)
+    case T.SNAPSHOT_LOADED: {
+      const { snapshot } = action;
+      return [{
+        ...state,
+        candidates: snapshot.candidates,
+        weights: snapshot.weights,
+        availableCount: snapshot.availableCount,
+        currentDrawId: snapshot.currentDrawId,
+        history: createHistoryStore(snapshot.history),
+        prizes: snapshot.prizes,
+        nextDrawNumber: snapshot.nextDrawNumber,
+        poolEpoch: snapshot.poolEpoch,
+        drawSeed: snapshot.drawSeed,
+        pendingRecords: 0,
+        source: 'snapshot',
+      }, null];
+    }
+
+    case T.ALL_CLEARED:
+      return [{
+        ...state,
+        candidates: [],
+        weights: null,
+        availableCount: 0,
+        currentDrawId: null,
+        history: createHistoryStore(),
+        prizes: state.prizes.map(p => ({ ...p, status: 'active' })),
+        pendingRecords: 0,
+      }, null];
+
+    default:
+      return [state, null];
+  }
+};
+
+// Rough UTF-16 footprint of a log entry or stored value (Maps count as empty)
+export const estimateBytes = (value) => JSON.stringify(value).length * 2;
+
+/**
+ * Reducer over event state plus its action log
+ */
+export const drawReducer = (state, action) => {
+  if (action.type === T.UNDO) {
+    if (state.log.length === 0) return state;
+    const entry = state.log[state.log.length - 1];
+    const [next] = apply(state, entry.inverse);
+    return {
+      ...next,
+      log: state.log.slice(0, -1),
+      future: [...state.future, entry],
+      logBytes: state.logBytes - entry.bytes,
+    };
+  }
+
+  if (action.type === T.REDO) {
+    if (state.future.length === 0) return state;
+    const entry = state.future[state.future.length - 1];
+    const [next] = apply(state, entry.action);
+    return {
+      ...next,
+      log: [...state.log, entry],
+      future: state.future.slice(0, -1),
+      logBytes: state.logBytes + entry.bytes,
+    };
+  }
+
+  const [next, inverse] = apply(state, action);
+  if (next === state || UNLOGGED.has(action.type)) return next;
+  if (BARRIERS.has(action.type) || !inverse) {
+    return { ...next, log: [], future: [], logBytes: 0 };
+  }
+
+  // A new action drops the redo branch; evict the oldest steps over the cap
+  const entry = { action, inverse, bytes: estimateBytes({ action, inverse }) };
+  const log = [...state.log, entry];
+  let logBytes = state.logBytes + entry.bytes;
+  let evicted = 0;
+  while (logBytes > UNDO_MEMORY_LIMIT && evicted < log.length - 1) {
+    logBytes -= log[evicted].bytes;
+    evicted++;
+  }
+
+  return {
+    ...next,
+    log: evicted > 0 ? log.slice(evicted) : log,
+    future: [],
+    logBytes,
+    evictedSteps: state.evictedSteps + evicted,
+  };
+};
+
+/**
+ * Log entries undo/redo would apply next (callers apply their pool effects)
+ */
+export const peekUndo = (state) => (state.log.length > 0 ? state.log[state.log.length - 1] : null);
+export const peekRedo = (state) => (state.future.length > 0 ? state.future[state.future.length - 1] : null);
@@ -12,25 +12,68 @@ const normalizeCandidates = (candidates) => {
 };
 
 /**
- * Parse CSV content
+ * Read a ticket cell: null when empty (one ticket), the count for a whole
+ * number >= 0, NaN for anything else (negative, fractional, text)
  */
-export const parseCSV = (content) => {
+const readTickets = (cell) => {
+  if (cell === undefined || cell === null || String(cell).trim() === '') return null;
+  const tickets = Number(cell);
+  return Number.isInteger(tickets) && tickets >= 0 ? tickets : NaN;
+};
+
+/**
+ * Normalize [name, tickets] rows into names plus a parallel weights array
+ * An empty ticket cell counts as 1 ticket, 0 leaves the row out (not eligible)
+ * and any other non-whole count rejects the file; duplicate names add their
+ * tickets. A first row whose ticket cell is text (Name,Tickets) is a header.
+ * weights is null when no row has a ticket column, so plain lists stay unweighted
+ */
+const normalizeWeightedCandidates = (rows) => {
+  const positions = new Map();
+  const names = [];
+  const weights = [];
+  let hasWeights = false;
+  let first = true;
+
+  rows.forEach((row, index) => {
+    const cells = Array.isArray(row) ? row : [row];
+    if (cells[0] === undefined || cells[0] === null) return;
+
+    const name = String(cells[0]).trim();
+    if (name.length === 0) return;
+    const isFirst = first;
+    first = false;
+
+    const tickets = readTickets(cells[1]);
+    if (Number.isNaN(tickets)) {
+      if (isFirst && Number.isNaN(Number(cells[1]))) return;
+      throw new Error(`Invalid ticket count "${cells[1]}" for "${name}" on row ${index + 1}: use a whole number (0 to exclude)`);
+    }
+    if (tickets !== null) hasWeights = true;
+    if (tickets === 0) return;
+    const weight = tickets === null ? 1 : tickets;
+
+    if (positions.has(name)) {
+      weights[positions.get(name)] += weight;
+    } else {
+      positions.set(name, names.length);
+      names.push(name);
+      weights.push(weight);
+    }
+  });
+
+  return { names, weights: hasWeights ? weights : null };
+};
+
+/**
+ * Read raw rows from a CSV string
+ */
+const readCSVRows = (content) => {
   return new Promise((resolve, reject) => {
     Papa.parse(content, {
       header: false,
       skipEmptyLines: true,
-      complete: (results) => {
-        const candidates = results.data
-          .map(row => {
-            if (Array.isArray(row)) {
-              return row[0]; // Get first column
-            }
-            return row;
-          })
-          .filter(item => item);
-
-        resolve(normalizeCandidates(candidates));
-      },
+      complete: (results) => resolve(results.data),
       error: (error) => {
         reject(new Error(`CSV parsing error: ${error.message}`));
       },
@@ -39,9 +82,9 @@ export const parseCSV = (content) => {
 };
 
 /**
- * Parse Excel file
+ * Read raw rows from the first sheet of an Excel file
  */
-export const parseExcel = (file) => {
+const readExcelRows = (file) => {
   return new Promise((resolve, reject) => {
     const reader = new FileReader();
 
@@ -49,18 +92,7 @@ export const parseExcel = (file) => {
       try {
         const workbook = XLSX.read(event.target.result, { type: 'array' });
         const firstSheet = workbook.Sheets[workbook.SheetNames[0]];
-        const data = XLSX.utils.sheet_to_json(firstSheet, { header: 1 });
-
-        const candidates = data
-          .map(row => {
-            if (Array.isArray(row)) {
-              return row[0]; // Get first column
-            }
-            return row;
-          })
-          .filter(item => item);
-
-        resolve(normalizeCandidates(candidates));
+        resolve(XLSX.utils.sheet_to_json(firstSheet, { header: 1 }));
       } catch (error) {
         reject(new Error(`Excel parsing error: ${error.message}`));
       }
@@ -74,6 +106,34 @@ export const parseExcel = (file) => {
   });
 };
 
+/**
+ * Keep the first column of each row
+ */
+const firstColumn = (rows) => {
+  return rows
+    .map(row => {
+      if (Array.isArray(row)) {
+        return row[0]; // Get first column
+      }
+      return row;
+    })
+    .filter(item => item);
+};
+
+/**
+ * Parse CSV content
+ */
+export const parseCSV = (content) => {
+  return readCSVRows(content).then(rows => normalizeCandidates(firstColumn(rows)));
+};
+
+/**
+ * Parse Excel file
+ */
+export const parseExcel = (file) => {
+  return readExcelRows(file).then(rows => normalizeCandidates(firstColumn(rows)));
+};
+
 /**
  * Parse file based on extension
  */
@@ -102,6 +162,35 @@ export const parseFile = (file) => {
   return Promise.reject(new Error('Unsupported file format. Please use CSV or Excel (.xlsx)'));
 };
 
+/**
+ * Parse file with an optional second "tickets" column
+ * @returns {Promise<{names: string[], weights: number[]|null}>}
+ */
+export const parseFileWithWeights = (file) => {
+  const fileName = file.name.toLowerCase();
+
+  if (fileName.endsWith('.csv')) {
+    return new Promise((resolve, reject) => {
+      const reader = new FileReader();
+      reader.onload = (event) => {
+        readCSVRows(event.target.result)
+          .then(rows => resolve(normalizeWeightedCandidates(rows)))
+          .catch(reject);
+      };
+      reader.onerror = () => {
+        reject(new Error('Failed to read CSV file'));
+      };
+      reader.readAsText(file);
+    });
+  }
+
+  if (fileName.endsWith('.xlsx') || fileName.endsWith('.xls')) {
+    return readExcelRows(file).then(normalizeWeightedCandidates);
+  }
+
+  return Promise.reject(new Error('Unsupported file format. Please use CSV or Excel (.xlsx)'));
+};
+
 /**
  * Parse manual text input (comma or newline separated)
  */
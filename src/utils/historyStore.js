@@ -0,0 +1,475 @@
+/**
+ * Persistent (structurally shared) history of draw records
+ *
+ * Records are kept in draw order in a 32-way trie (a persistent vector).
+ * Two hash array mapped tries index them: draw id -> position, and candidate
+ * name -> ids of the draws the name appears in. Every update
+ * returns a new store that shares all untouched nodes with the old one, so
+ * replacing one record, appending or dropping the newest records copies only
+ * the O(log32 n) path to the change. Old stores stay valid, which is what the
+ * reducer's undo log relies on.
+ *
+ * diff(previous) lists the positions whose record differs from an older
+ * version without materializing either one: subtrees the versions share are
+ * skipped by reference, so after a forfeit it visits one O(log32 n) path.
+ * The journal, the history selectors and the persistence layer work from it;
+ * slice() reads a window of records for rendering. toArray() materializes
+ * every record (export, replay, snapshots for other windows) and is never on
+ * the per-update path. createHistoryStore builds a store from an array in one
+ * linear pass.
+ */
+
+const BITS = 5;
+const WIDTH = 1 << BITS;
+const MASK = WIDTH - 1;
+
+const popcount = (word) => {
+  let v = word - ((word >>> 1) & 0x55555555);
+  v = (v & 0x33333333) + ((v >>> 2) & 0x33333333);
+  return (Math.imul((v + (v >>> 4)) & 0x0f0f0f0f, 0x01010101) >>> 24);
+};
+
+// ---------------------------------------------------------------------------
+// Persistent vector: position -> record
+// ---------------------------------------------------------------------------
+
+const vectorGet = (root, shift, index) => {
+  let node = root;
+  for (let level = shift; level > 0; level -= BITS) {
+    node = node[(index >>> level) & MASK];
+  }
+  return node[index & MASK];
+};
+
+const vectorSet = (node, level, index, value) => {
+  const copy = node.slice();
+  if (level === 0) {
+    copy[index & MASK] = value;
+  } else {
+    const sub = (index >>> level) & MASK;
+    copy[sub] = vectorSet(node[sub], level - BITS, index, value);
+  }
+  return copy;
+};
+
+const newPath = (level, value) => (level === 0 ? [value] : [newPath(level - BITS, value)]);
+
+const vectorPush = (node, level, index, value) => {
+  const copy = node ? node.slice() : [];
+  if (level === 0) {
+    copy[index & MASK] = value;
+  } else {
+    const sub = (index >>> level) & MASK;
+    copy[sub] = vectorPush(node && node[sub], level - BITS, index, value);
+  }
+  return copy;
+};
+
+// Drop the element at index (the last one); empty nodes become null
+const vectorPop = (node, level, index) => {
+  if (level === 0) {
+    return (index & MASK) === 0 ? null : node.slice(0, index & MASK);
+  }
+  const sub = (index >>> level) & MASK;
+  const child = vectorPop(node[sub], level - BITS, index);
+  if (child === null && sub === 0) return null;
+  const copy = node.slice(0, child === null ? sub : sub + 1);
+  if (child !== null) copy[sub] = child;
+  return copy;
+};
+
+// Visit every position where two same-height vectors differ; subtrees they
+// share are skipped. visit(index, record, previousRecord), either undefined
+// where that vector has no record
+const vectorDiff = (a, b, level, base, visit) => {
+  if (a === b) return;
+  const length = Math.max(a ? a.length : 0, b ? b.length : 0);
+  for (let i = 0; i < length; i++) {
+    const childA = a ? a[i] : undefined;
+    const childB = b ? b[i] : undefined;
+    if (level === 0) {
+      if (childA !== childB) visit(base + i, childB, childA);
+    } else {
+      vectorDiff(childA, childB, level - BITS, base + i * (1 << level), visit);
+    }
+  }
+};
+
+// A root at shift `from` as the first branch of a tree of shift `to`
+const liftRoot = (root, from, to) => {
+  let node = root;
+  for (let level = from; node && level < to; level += BITS) node = [node];
+  return node;
+};
+
+// ---------------------------------------------------------------------------
+// Hash array mapped trie: draw id -> position
+// ---------------------------------------------------------------------------
+
+// FNV-1a over the id string
+const hashOf = (key) => {
+  let hash = 0x811c9dc5;
+  for (let i = 0; i < key.length; i++) {
+    hash ^= key.charCodeAt(i);
+    hash = Math.imul(hash, 0x01000193);
+  }
+  return hash >>> 0;
+};
+
+const EMPTY_NODE = { bitmap: 0, children: [] };
+
+const mapGet = (root, key) => {
+  const hash = hashOf(key);
+  let node = root;
+  for (let shift = 0; ; shift += BITS) {
+    if (node.entries) {
+      const entry = node.entries.find(e => e.key === key);
+      return entry ? entry.value : undefined;
+    }
+    const bit = 1 << ((hash >>> shift) & MASK);
+    if ((node.bitmap & bit) === 0) return undefined;
+    const child = node.children[popcount(node.bitmap & (bit - 1))];
+    if (child.key !== undefined) return child.key === key ? child.value : undefined;
+    node = child;
+  }
+};
+
+const mergeLeaves = (a, b, shift) => {
+  if (shift >= 32) return { entries: [a, b] };
+  const slotA = (a.hash >>> shift) & MASK;
+  const slotB = (b.hash >>> shift) & MASK;
+  if (slotA === slotB) {
+    return { bitmap: 1 << slotA, children: [mergeLeaves(a, b, shift + BITS)] };
+  }
+  return { bitmap: (1 << slotA) | (1 << slotB), children: slotA < slotB ? [a, b] : [b, a] };
+};
+
+const mapSet = (node, shift, leaf) => {
+  if (node.entries) {
+    return { entries: [...node.entries.filter(e => e.key !== leaf.key), leaf] };
+  }
+  const bit = 1 << ((leaf.hash >>> shift) & MASK);
+  const at = popcount(node.bitmap & (bit - 1));
+  const children = node.children.slice();
+
+  if ((node.bitmap & bit) === 0) {
+    children.splice(at, 0, leaf);
+    return { bitmap: node.bitmap | bit, children };
+  }
+
+  const child = node.children[at];
+  if (child.key === undefined) {
+    children[at] = mapSet(child, shift + BITS, leaf);
+  } else if (child.key === leaf.key) {
+    children[at] = leaf;
+  } else {
+    children[at] = mergeLeaves(child, leaf, shift + BITS);
+  }
+  return { bitmap: node.bitmap, children };
+};
+
+// In-place insert, only for nodes a bulk build just created
+const mapInsertMutable = (node, shift, leaf) => {
+  if (node.entries) {
+    const i = node.entries.findIndex(e => e.key === leaf.key);
+    if (i === -1) node.entries.push(leaf);
+    else node.entries[i] = leaf;
+    return;
+  }
+  const bit = 1 << ((leaf.hash >>> shift) & MASK);
+  const at = popcount(node.bitmap & (bit - 1));
+
+  if ((node.bitmap & bit) === 0) {
+    node.children.splice(at, 0, leaf);
+    node.bitmap |= bit;
+    return;
+  }
+
+  const child = node.children[at];
+  if (child.key === undefined) {
+    mapInsertMutable(child, shift + BITS, leaf);
+  } else if (child.key === leaf.key) {
+    node.children[at] = leaf;
+  } else {
+    node.children[at] = mergeLeaves(child, leaf, shift + BITS);
+  }
+};
+
+const mapDelete = (node, shift, key, hash) => {
+  if (node.entries) {
+    const entries = node.entries.filter(e => e.key !== key);
+    return entries.length === 1 ? entries[0] : { entries };
+  }
+  const bit = 1 << ((hash >>> shift) & MASK);
+  if ((node.bitmap & bit) === 0) return node;
+  const at = popcount(node.bitmap & (bit - 1));
+  const child = node.children[at];
+
+  let replacement;
+  if (child.key === undefined) {
+    replacement = mapDelete(child, shift + BITS, key, hash);
+    // Collapse single-leaf subtrees so lookups stay short
+    if (replacement.children && replacement.children.length === 1 && replacement.children[0].key !== undefined) {
+      replacement = replacement.children[0];
+    }
+  } else if (child.key !== key) {
+    return node;
+  }
+
+  const children = node.children.slice();
+  if (replacement && (replacement.key !== undefined || replacement.bitmap || replacement.entries)) {
+    children[at] = replacement;
+    return { bitmap: node.bitmap, children };
+  }
+  children.splice(at, 1);
+  return { bitmap: node.bitmap & ~bit, children };
+};
+
+// ---------------------------------------------------------------------------
+// History store
+// ---------------------------------------------------------------------------
+
+const recordNames = (record) => (record.winners || []).map(w => (typeof w === 'string' ? w : w.name));
+
+// name -> ids of the draws it appears in (unordered; sorted on lookup)
+const addName = (names, name, drawId) => {
+  const hash = hashOf(name);
+  const ids = mapGet(names, name) || [];
+  return mapSet(names, 0, { key: name, hash, value: [...ids, drawId] });
+};
+
+const removeName = (names, name, drawId) => {
+  const hash = hashOf(name);
+  const ids = mapGet(names, name);
+  if (!ids) return names;
+  const rest = ids.filter(id => id !== drawId);
+  return rest.length > 0
+    ? mapSet(names, 0, { key: name, hash, value: rest })
+    : mapDelete(names, 0, name, hash);
+};
+
+// Append one record to a raw store state
+const push = (state, record) => {
+  let { root: r, shift: s } = state;
+  const index = state.size;
+  if (index === 0) {
+    r = [record];
+    s = 0;
+  } else if (index === 1 << (s + BITS)) {
+    // Root is full: grow the tree by one level
+    r = [r, newPath(s, record)];
+    s += BITS;
+  } else {
+    r = vectorPush(r, s, index, record);
+  }
+
+  let names = state.names;
+  new Set(recordNames(record)).forEach(name => {
+    names = addName(names, name, record.id);
+  });
+
+  return {
+    root: r,
+    shift: s,
+    size: index + 1,
+    ids: mapSet(state.ids, 0, { key: record.id, hash: hashOf(record.id), value: index }),
+    names,
+  };
+};
+
+const makeStore = (state) => {
+  const { root, shift, size, ids, names } = state;
+  let array = null;
+
+  const at = (index) => (index >= 0 && index < size ? vectorGet(root, shift, index) : undefined);
+  const get = (id) => {
+    const index = mapGet(ids, id);
+    return index === undefined ? undefined : vectorGet(root, shift, index);
+  };
+
+  return {
+    size,
+    at,
+    get,
+    indexOf: (id) => {
+      const index = mapGet(ids, id);
+      return index === undefined ? -1 : index;
+    },
+    has: (id) => mapGet(ids, id) !== undefined,
+    last: () => at(size - 1),
+
+    /**
+     * Every draw a candidate appears in, with their status there
+     * @param {string} name - Candidate name
+     * @returns {Array<Object>} [{ drawId, drawNumber, prizeName, status, isReplacement }], oldest first
+     */
+    appearancesOf: (name) => (mapGet(names, name) || [])
+      .slice()
+      .sort((a, b) => mapGet(ids, a) - mapGet(ids, b))
+      .map(drawId => {
+        const record = get(drawId);
+        const winner = record.winners.find(w => (typeof w === 'string' ? w : w.name) === name);
+        return {
+          drawId,
+          drawNumber: record.drawNumber,
+          prizeName: record.prizeName,
+          status: typeof winner === 'string' ? 'won' : winner.status,
+          isReplacement: Boolean(winner.isReplacement),
+        };
+      }),
+
+    /**
+     * Append records (newest last)
+     */
+    append: (records) => {
+      let next = state;
+      records.forEach(record => {
+        next = push(next, record);
+      });
+      return makeStore(next);
+    },
+
+    /**
+     * Replace the record with the same id; copies only its path
+     */
+    update: (record) => {
+      const index = mapGet(ids, record.id);
+      if (index === undefined) return null;
+
+      // Only names that joined or left the record touch the name index
+      const before = new Set(recordNames(vectorGet(root, shift, index)));
+      const after = new Set(recordNames(record));
+      let nextNames = names;
+      before.forEach(name => {
+        if (!after.has(name)) nextNames = removeName(nextNames, name, record.id);
+      });
+      after.forEach(name => {
+        if (!before.has(name)) nextNames = addName(nextNames, name, record.id);
+      });
+
+      return makeStore({ ...state, root: vectorSet(root, shift, index, record), names: nextNames });
+    },
+
+    /**
+     * Keep the first `length` records (drop the newest)
+     */
+    truncate: (length) => {
+      if (length <= 0) return emptyStore();
+      let r = root;
+      let s = shift;
+      let nextIds = ids;
+      let nextNames = names;
+      for (let index = size - 1; index >= length; index--) {
+        const record = vectorGet(r, s, index);
+        nextIds = mapDelete(nextIds, 0, record.id, hashOf(record.id));
+        new Set(recordNames(record)).forEach(name => {
+          nextNames = removeName(nextNames, name, record.id);
+        });
+        r = vectorPop(r, s, index);
+        // Drop a root level once only its first branch is left
+        while (r && s > 0 && r.length === 1) {
+          r = r[0];
+          s -= BITS;
+        }
+      }
+      return makeStore({ root: r, shift: s, size: length, ids: nextIds, names: nextNames });
+    },
+
+    /**
+     * Changes since an older version of this history
+     * Only paths the two versions do not share are walked, so the cost
+     * follows the size of the change, not of the history
+     * @param {Object} previous - Another history store
+     * @returns {Object} { length, changed: [[index, record, previousRecord]], removed: [records
+     *   past the new end] }; previousRecord is undefined for new positions
+     */
+    diff: (previous) => {
+      const changed = [];
+      const removed = [];
+      const height = Math.max(shift, previous.shift);
+      vectorDiff(
+        liftRoot(previous.root, previous.shift, height),
+        liftRoot(root, shift, height),
+        height,
+        0,
+        (index, record, before) => {
+          if (record === undefined) removed.push(before);
+          else changed.push([index, record, before]);
+        }
+      );
+      return { length: size, changed, removed };
+    },
+
+    /**
+     * Records at positions [start, end), O(log32 n) each (rendering windows)
+     */
+    slice: (start = 0, end = size) => {
+      const from = Math.max(0, start);
+      const to = Math.min(size, end);
+      const records = [];
+      for (let i = from; i < to; i++) records.push(vectorGet(root, shift, i));
+      return records;
+    },
+
+    // Vector internals, for diff
+    root,
+    shift,
+
+    /**
+     * Records in draw order (built once per store version; not for per-update paths)
+     */
+    toArray: () => {
+      if (!array) {
+        array = new Array(size);
+        for (let i = 0; i < size; i++) array[i] = vectorGet(root, shift, i);
+      }
+      return array;
+    },
+
+    [Symbol.iterator]: function* iterate() {
+      for (let i = 0; i < size; i++) yield vectorGet(root, shift, i);
+    },
+  };
+};
+
+const emptyStore = () => makeStore({ root: null, shift: 0, size: 0, ids: EMPTY_NODE, names: EMPTY_NODE });
+
+// Bulk build in O(n): leaves are filled and grouped level by level, and both
+// tries are filled in place (no node exists outside the build yet). The
+// result has the same shape as appending the records one by one
+const buildState = (records) => {
+  if (records.length === 0) return emptyStore();
+
+  let nodes = [];
+  for (let i = 0; i < records.length; i += WIDTH) nodes.push(records.slice(i, i + WIDTH));
+  let shift = 0;
+  while (nodes.length > 1) {
+    const parents = [];
+    for (let i = 0; i < nodes.length; i += WIDTH) parents.push(nodes.slice(i, i + WIDTH));
+    nodes = parents;
+    shift += BITS;
+  }
+
+  const ids = { bitmap: 0, children: [] };
+  const names = { bitmap: 0, children: [] };
+  records.forEach((record, index) => {
+    mapInsertMutable(ids, 0, { key: record.id, hash: hashOf(record.id), value: index });
+    new Set(recordNames(record)).forEach(name => {
+      const drawIds = mapGet(names, name);
+      if (drawIds) {
+        drawIds.push(record.id);
+      } else {
+        mapInsertMutable(names, 0, { key: name, hash: hashOf(name), value: [record.id] });
+      }
+    });
+  });
+
+  return makeStore({ root: nodes[0], shift, size: records.length, ids, names });
+};
+
+/**
+ * Create a history store from draw records (oldest first)
+ * @param {Array<Object>} records - Draw records with unique ids
+ * @returns {Object} Immutable history store
+ */
+export const createHistoryStore = (records = []) => buildState(records);
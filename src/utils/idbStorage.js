@@ -0,0 +1,549 @@
+/**
+ * IndexedDB persistence (async counterpart of storage.js)
+ *
+ * Same load/save functions as storage.js, returning promises. Data lives in
+ * object stores instead of one JSON string per key:
+ *
+ * - prizes: one row per prize, keyed by list position
+ * - records: snapshot of the history, one row per record keyed by position
+ * - journal: history changes since the snapshot (journal.js), one entry per
+ *   save holding only new records and record patches. Compaction folds the
+ *   entries into the snapshot at idle time every COMPACT_AFTER entries
+ * - strings: winner names of stored records; records keep varint ids into it
+ *   (codec.js packRecord)
+ * - candidates: names (front-coded) and weights (varints) in compressed
+ *   chunks, keyed ['names' | 'weights', chunk]
+ *
+ * Values are stored by structured clone, so nothing is stringified on the
+ * main thread, and writes commit in the background. There is no 5 MB cap;
+ * a failed write (quota, private mode) is reported through the returned
+ * promise instead of only a console line.
+ *
+ * On first open the luckyDraw_* localStorage keys are migrated in the upgrade
+ * transaction and then removed. Where IndexedDB is unavailable (or cannot be
+ * opened) every function falls back to localStorage.
+ */
+
+import * as local from './storage.js';
+import { storeEntry, replayRange, journalLength } from './journal.js';
+import { createHistoryStore } from './historyStore.js';
+import { scheduleIdle } from './idle.js';
+import {
+  createStringTable,
+  packRecord,
+  unpackRecord,
+  packNames,
+  unpackNames,
+  packNumbers,
+  unpackNumbers,
+} from './codec.js';
+
+const { STORAGE_KEYS, getFromStorage, removeFromStorage } = local;
+
+const DB_NAME = 'luckyDraw';
+const DB_VERSION = 3;
+const STORES = {
+  PRIZES: 'prizes',
+  RECORDS: 'records',
+  CANDIDATES: 'candidates',
+  JOURNAL: 'journal',
+  STRINGS: 'strings',
+};
+// Web Lock held by the one window that persists history and prizes
+const WRITER_LOCK = 'luckyDraw-writer';
+// Journal entries after which they are folded into the records snapshot
+const COMPACT_AFTER = 50;
+// Names per candidates row: each row is packed and inflated on its own
+const CANDIDATE_CHUNK = 50_000;
+
+const requestToPromise = (request) => new Promise((resolve, reject) => {
+  request.onsuccess = () => resolve(request.result);
+  request.onerror = () => reject(request.error);
+});
+
+const transactionDone = (tx) => new Promise((resolve, reject) => {
+  tx.oncomplete = () => resolve();
+  tx.onerror = () => reject(tx.error);
+  tx.onabort = () => reject(tx.error || new Error('Transaction aborted'));
+});
+
+const chunkRange = (kind) => IDBKeyRange.bound([kind, 0], [kind, Infinity]);
+
+const putList = (store, list) => {
+  list.forEach((value, i) => store.put(value, i));
+};
+
+const putChunked = (store, kind, values) => {
+  store.delete(chunkRange(kind));
+  for (let i = 0; i * CANDIDATE_CHUNK < values.length; i++) {
+    store.put(values.slice(i * CANDIDATE_CHUNK, (i + 1) * CANDIDATE_CHUNK), [kind, i]);
+  }
+};
+
+// Pack every chunk before the transaction opens (compression is async)
+const packChunked = (values, pack) => {
+  const chunks = [];
+  for (let i = 0; i * CANDIDATE_CHUNK < values.length; i++) {
+    chunks.push(pack(values.slice(i * CANDIDATE_CHUNK, (i + 1) * CANDIDATE_CHUNK)));
+  }
+  return Promise.all(chunks);
+};
+
+/**
+ * Copy the localStorage keys into the new stores (upgrade transaction)
+ */
+const migrateLocalStorage = (tx) => {
+  putList(tx.objectStore(STORES.PRIZES), getFromStorage(STORAGE_KEYS.PRIZES) || []);
+  putList(tx.objectStore(STORES.RECORDS), getFromStorage(STORAGE_KEYS.HISTORY) || []);
+  const candidates = tx.objectStore(STORES.CANDIDATES);
+  putChunked(candidates, 'names', getFromStorage(STORAGE_KEYS.CANDIDATES) || []);
+  putChunked(candidates, 'weights', getFromStorage(STORAGE_KEYS.CANDIDATE_WEIGHTS) || []);
+};
+
+let dbPromise = null;
+
+/**
+ * Open (and on first run create and migrate) the database
+ * @returns {Promise<IDBDatabase|null>} null when IndexedDB is unavailable
+ */
+const openDatabase = () => {
+  if (dbPromise) return dbPromise;
+  if (typeof indexedDB === 'undefined') {
+    dbPromise = Promise.resolve(null);
+    return dbPromise;
+  }
+
+  let migrated = false;
+  dbPromise = new Promise((resolve, reject) => {
+    const request = indexedDB.open(DB_NAME, DB_VERSION);
+    request.onupgradeneeded = (event) => {
+      const db = request.result;
+      if (event.oldVersion < 1) {
+        [STORES.PRIZES, STORES.RECORDS, STORES.CANDIDATES].forEach(name => db.createObjectStore(name));
+        migrateLocalStorage(request.transaction);
+        migrated = true;
+      }
+      if (event.oldVersion < 2) {
+        db.createObjectStore(STORES.JOURNAL, { autoIncrement: true });
+      }
+      // Rows written before version 3 (plain records, name arrays) still load
+      if (event.oldVersion < 3) {
+        db.createObjectStore(STORES.STRINGS);
+      }
+    };
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+    request.onblocked = () => reject(new Error('IndexedDB upgrade blocked by another window'));
+  }).then(db => {
+    // The upgrade transaction committed: the old keys are no longer needed
+    if (migrated) Object.values(STORAGE_KEYS).forEach(removeFromStorage);
+    return db;
+  }).catch(error => {
+    console.error('IndexedDB unavailable, using localStorage:', error);
+    return null;
+  });
+  return dbPromise;
+};
+
+/**
+ * Run fn(stores) in one transaction
+ * @returns {Promise<any>} fn's result once the transaction completed
+ */
+const withStores = async (mode, names, fn) => {
+  const db = await openDatabase();
+  const tx = db.transaction(names, mode);
+  const [result] = await Promise.all([
+    fn(...names.map(name => tx.objectStore(name))),
+    transactionDone(tx),
+  ]);
+  return result;
+};
+
+const readAll = (mode, name, query) => withStores(mode, [name], store => requestToPromise(store.getAll(query)));
+
+// Write helpers resolve to a success flag, like storage.js
+const write = (label, fn) => fn().then(() => true, error => {
+  if (error && error.name === 'QuotaExceededError') {
+    console.error(`IndexedDB quota exceeded for ${label}`);
+  } else {
+    console.error(`Error writing to IndexedDB (${label}):`, error);
+  }
+  return false;
+});
+
+const read = (label, fn, fallback) => fn().catch(error => {
+  console.error(`Error reading from IndexedDB (${label}):`, error);
+  return fallback;
+});
+
+// History as last written (snapshot + journal): the history store, the
+// positions changed since the last compaction and the number of journal
+// entries. saved is null while the stored state is unknown
+let history = { saved: null, touched: new Set(), entries: 0 };
+let compactionPending = false;
+// While a compaction commits: what saves journaled after it started, which
+// becomes `touched` and `entries` once it committed
+let compacting = null;
+
+// Record a journal entry's positions (and in a running compaction's tally)
+const track = (entry) => {
+  [history, compacting].forEach(target => {
+    if (!target) return;
+    entry.put.forEach(([i]) => target.touched.add(i));
+    entry.patch.forEach(([i]) => target.touched.add(i));
+    target.entries++;
+  });
+};
+
+// Whether this window writes history and prizes. Synced windows hold the
+// same state, but each would journal it against its own last save, so stale
+// entries from one could roll back another's. Without Web Locks every window
+// writes (a single window is the common case)
+const hasLocks = () => typeof navigator !== 'undefined' && Boolean(navigator.locks);
+let writer = !hasLocks();
+
+/**
+ * Compete for the writer lock; only its holder writes history and prizes
+ * (other windows' saves resolve true without writing, the holder writes the
+ * same synced state). A window taking over starts from a full history
+ * snapshot, since what it last saved may be stale
+ * @param {Function} onWriter - Called once this window holds the lock
+ * @returns {Function} Release the lock (or stop waiting for it)
+ */
+export const claimWriter = (onWriter) => {
+  if (!hasLocks()) {
+    onWriter();
+    return () => {};
+  }
+  const controller = new AbortController();
+  let release = () => {};
+  const held = new Promise(resolve => {
+    release = resolve;
+  });
+  navigator.locks.request(WRITER_LOCK, { signal: controller.signal }, () => {
+    writer = true;
+    history = { saved: null, touched: new Set(), entries: 0 };
+    onWriter();
+    return held;
+  }).catch(error => {
+    if (error.name !== 'AbortError') console.error('Writer lock failed:', error);
+  });
+  return () => {
+    writer = false;
+    controller.abort();
+    release();
+  };
+};
+
+// Winner names of stored records, as ids into this table. The strings store
+// holds it in rows keyed by their first id; `persisted` names are committed
+let strings = { table: createStringTable(), persisted: 0 };
+
+// Store the table's new names in the transaction that references them
+const putStrings = (store) => {
+  const { table, persisted } = strings;
+  const length = table.names.length;
+  if (length > persisted) store.put(table.names.slice(persisted), persisted);
+  return () => {
+    strings.persisted = Math.max(strings.persisted, length);
+  };
+};
+
+const loadStrings = (keys, rows) => {
+  const names = [];
+  keys.forEach((start, i) => {
+    rows[i].forEach((name, j) => {
+      names[start + j] = name;
+    });
+  });
+  strings = { table: createStringTable(names), persisted: names.length };
+};
+
+const packEntry = (entry) => ({
+  ...entry,
+  put: entry.put.map(([i, record]) => [i, packRecord(record, strings.table)]),
+});
+
+const unpackEntry = (entry) => ({
+  ...entry,
+  put: entry.put.map(([i, record]) => [i, unpackRecord(record, strings.table)]),
+});
+
+/**
+ * Fold the journal into the records snapshot (idle time): rewrites only the
+ * positions the entries touched, then clears the journal, in one transaction
+ */
+const compact = () => {
+  compactionPending = false;
+  let committed = () => {};
+  const folding = history;
+  return write('compaction', () => withStores(
+    'readwrite',
+    [STORES.RECORDS, STORES.JOURNAL, STORES.STRINGS],
+    (snapshot, journal, stringStore) => {
+      const { saved, touched } = folding;
+      if (!saved) return;
+      touched.forEach(i => {
+        if (i < saved.size) snapshot.put(packRecord(saved.at(i), strings.table), i);
+      });
+      snapshot.delete(IDBKeyRange.lowerBound(saved.size));
+      journal.clear();
+      committed = putStrings(stringStore);
+      compacting = { touched: new Set(), entries: 0 };
+    }
+  )).then(ok => {
+    // Until the journal is cleared for good, every entry still counts
+    const since = compacting;
+    compacting = null;
+    if (ok) committed();
+    if (ok && since && history === folding) {
+      history.touched = since.touched;
+      history.entries = since.entries;
+    }
+    return ok;
+  });
+};
+
+const scheduleCompaction = () => {
+  if (compactionPending) return;
+  compactionPending = true;
+  scheduleIdle(compact, { timeout: 5000 });
+};
+
+/**
+ * Clear all Lucky Draw data
+ * @returns {Promise<void>}
+ */
+export const clearAllStorage = async () => {
+  if (!(await openDatabase())) {
+    local.clearAllStorage();
+    return;
+  }
+  await write('clear', () => withStores('readwrite', Object.values(STORES), (...stores) => {
+    stores.forEach(store => store.clear());
+    history = { saved: createHistoryStore(), touched: new Set(), entries: 0 };
+    strings = { table: createStringTable(), persisted: 0 };
+  }));
+};
+
+/**
+ * Load prizes
+ * @returns {Promise<Array>} Array of Prize objects or empty array
+ */
+export const loadPrizes = async () => {
+  if (!(await openDatabase())) return local.loadPrizes();
+  return read(STORES.PRIZES, () => readAll('readonly', STORES.PRIZES), []);
+};
+
+/**
+ * Save prizes (replaces the stored list)
+ * @param {Array} prizes - Array of Prize objects
+ * @returns {Promise<boolean>} Success status
+ */
+export const savePrizes = async (prizes) => {
+  if (!writer) return true;
+  if (!(await openDatabase())) return local.savePrizes(prizes);
+  return write(STORES.PRIZES, () => withStores('readwrite', [STORES.PRIZES], store => {
+    store.clear();
+    putList(store, prizes);
+  }));
+};
+
+/**
+ * Open stored history for staged loading: only the record count, the
+ * journal and the string table are read up front
+ * @returns {Promise<Object>} { length, pages({ first, growth }) }. pages is an
+ *   async generator of record arrays, newest first: `first` records, then
+ *   pages growing by `growth` (so prepending them stays linear overall)
+ */
+export const openHistory = async () => {
+  if (!(await openDatabase())) {
+    const records = local.loadHistory();
+    return {
+      length: records.length,
+      pages: async function* pages() {
+        if (records.length > 0) yield records;
+      },
+    };
+  }
+
+  history = { saved: null, touched: new Set(), entries: 0 };
+  const opened = history;
+  const head = await read(STORES.RECORDS, () => withStores(
+    'readonly',
+    [STORES.RECORDS, STORES.JOURNAL, STORES.STRINGS],
+    (records, journal, stringStore) => Promise.all([
+      requestToPromise(records.count()),
+      requestToPromise(journal.getAll()),
+      requestToPromise(stringStore.getAllKeys()),
+      requestToPromise(stringStore.getAll()),
+    ])
+  ), null);
+
+  if (!head) {
+    return { length: 0, pages: async function* pages() {} };
+  }
+  const [snapshotLength, storedEntries, stringKeys, stringRows] = head;
+  loadStrings(stringKeys, stringRows);
+  const entries = storedEntries.map(unpackEntry);
+  const length = journalLength(snapshotLength, entries);
+
+  return {
+    length,
+    pages: async function* pages({ first = 50, growth = 2 } = {}) {
+      const loaded = [];
+      let end = length;
+      let size = first;
+      while (end > 0) {
+        const start = Math.max(0, end - size);
+        const rows = await readAll('readonly', STORES.RECORDS, IDBKeyRange.bound(start, end - 1));
+        const page = replayRange(rows.map(record => unpackRecord(record, strings.table)), start, end, entries);
+        loaded.push(page);
+        yield page;
+        end = start;
+        size *= growth;
+      }
+
+      // Fully loaded: journal from here on, unless a save already replaced
+      // the stored history meanwhile (or this window took over as writer)
+      if (history === opened && history.saved === null) {
+        const touched = new Set();
+        entries.forEach(entry => {
+          entry.put.forEach(([i]) => touched.add(i));
+          entry.patch.forEach(([i]) => touched.add(i));
+        });
+        history = { saved: createHistoryStore(loaded.reverse().flat()), touched, entries: entries.length };
+        if (entries.length >= COMPACT_AFTER) scheduleCompaction();
+      }
+    },
+  };
+};
+
+/**
+ * Load all of history at once
+ * @returns {Promise<Array>} Array of DrawRecord objects or empty array
+ */
+export const loadHistory = async () => {
+  const { pages } = await openHistory();
+  const loaded = [];
+  for await (const page of pages({ first: Infinity })) loaded.unshift(page);
+  return loaded.flat();
+};
+
+/**
+ * Save history: appends one journal entry with only what changed since the
+ * last save (new records, record patches, new length). Pass the history store
+ * itself: the entry then comes from its structural diff against the last
+ * saved version instead of a scan over every record
+ * @param {Object|Array} records - History store, or an array of DrawRecord objects
+ * @returns {Promise<boolean>} Success status
+ */
+export const saveHistory = async (records) => {
+  if (!writer) return true;
+  const store = Array.isArray(records) ? createHistoryStore(records) : records;
+  if (!(await openDatabase())) return local.saveHistory(store.toArray());
+  let committed = () => {};
+  const ok = await write(STORES.JOURNAL, () => withStores(
+    'readwrite',
+    [STORES.RECORDS, STORES.JOURNAL, STORES.STRINGS],
+    (snapshot, journal, stringStore) => {
+      const previous = history.saved;
+      history.saved = store;
+
+      // Unknown stored state (nothing loaded, failed write): new snapshot
+      if (!previous) {
+        snapshot.clear();
+        journal.clear();
+        stringStore.clear();
+        strings = { table: createStringTable(), persisted: 0 };
+        putList(snapshot, store.toArray().map(record => packRecord(record, strings.table)));
+        committed = putStrings(stringStore);
+        history.touched.clear();
+        history.entries = 0;
+        if (compacting) compacting = { touched: new Set(), entries: 0 };
+        return;
+      }
+
+      const entry = storeEntry(previous, store);
+      if (!entry) return;
+      journal.add(packEntry(entry));
+      committed = putStrings(stringStore);
+      track(entry);
+    }
+  ));
+
+  if (!ok) {
+    history.saved = null;
+    return ok;
+  }
+  committed();
+  if (history.entries >= COMPACT_AFTER) scheduleCompaction();
+  return ok;
+};
+
+/**
+ * Load candidates
+ * @returns {Promise<Array>} Array of candidate names or empty array
+ */
+export const loadCandidates = async () => {
+  if (!(await openDatabase())) return local.loadCandidates();
+  const rows = await read(STORES.CANDIDATES, () => readAll('readonly', STORES.CANDIDATES, chunkRange('names')), []);
+  // Rows inflate and decode one at a time, in batches as they stream
+  const names = [];
+  for (const row of rows) {
+    if (Array.isArray(row)) {
+      row.forEach(name => names.push(name));
+    } else {
+      for await (const batch of unpackNames(row)) {
+        batch.forEach(name => names.push(name));
+      }
+    }
+  }
+  return names;
+};
+
+/**
+ * Save candidates
+ * @param {Array} candidates - Array of candidate names
+ * @returns {Promise<boolean>} Success status
+ */
+export const saveCandidates = async (candidates) => {
+  if (!(await openDatabase())) return local.saveCandidates(candidates);
+  return write(STORES.CANDIDATES, async () => {
+    const rows = await packChunked(candidates, packNames);
+    return withStores('readwrite', [STORES.CANDIDATES], store => {
+      store.delete(chunkRange('names'));
+      rows.forEach((row, i) => store.put(row, ['names', i]));
+    });
+  });
+};
+
+/**
+ * Load candidate ticket counts
+ * @returns {Promise<Array|null>} Weights parallel to the saved candidates, or null if unweighted
+ */
+export const loadCandidateWeights = async () => {
+  if (!(await openDatabase())) return local.loadCandidateWeights();
+  const rows = await read(STORES.CANDIDATES, () => readAll('readonly', STORES.CANDIDATES, chunkRange('weights')), []);
+  if (rows.length === 0) return null;
+  const chunks = await Promise.all(rows.map(row => (Array.isArray(row) ? row : unpackNumbers(row))));
+  return chunks.flat();
+};
+
+/**
+ * Save candidate ticket counts
+ * @param {Array|null} weights - Weights parallel to candidates, or null to clear
+ * @returns {Promise<boolean>} Success status
+ */
+export const saveCandidateWeights = async (weights) => {
+  if (!(await openDatabase())) return local.saveCandidateWeights(weights);
+  return write(STORES.CANDIDATES, async () => {
+    const rows = await packChunked(weights || [], packNumbers);
+    return withStores('readwrite', [STORES.CANDIDATES], store => {
+      store.delete(chunkRange('weights'));
+      rows.forEach((row, i) => store.put(row, ['weights', i]));
+    });
+  });
+};
+
+export { STORES };
@@ -0,0 +1,23 @@
+/**
+ * Idle-time scheduling
+ *
+ * Runs work when the main thread has nothing better to do, via
+ * requestIdleCallback where available and a short timeout elsewhere (Safari).
+ */
+
+const FALLBACK_DELAY_MS = 50;
+
+/**
+ * Run task once the browser is idle
+ * @param {Function} task - Work to run
+ * @param {Object} options - { timeout } ms after which it runs even if never idle
+ * @returns {Function} Cancel
+ */
+export const scheduleIdle = (task, { timeout = 1000 } = {}) => {
+  if (typeof requestIdleCallback === 'function') {
+    const handle = requestIdleCallback(() => task(), { timeout });
+    return () => cancelIdleCallback(handle);
+  }
+  const handle = setTimeout(task, FALLBACK_DELAY_MS);
+  return () => clearTimeout(handle);
+};
@@ -0,0 +1,80 @@
+/**
+ * Append-only history journal
+ *
+ * Persisting history as a whole re-serializes every record after each draw
+ * or forfeit. Instead, each saved history version is written as one journal
+ * entry describing only what changed since the previous version:
+ *
+ * - put: records that are new at a position (a draw, an event draw)
+ * - patch: record patches (diffRecord) for records that changed in place, so
+ *   forfeiting one winner of a 1000-winner draw stores one winner slot
+ * - length: the new record count (undo and clear shrink it)
+ *
+ * Records are immutable and unchanged ones are shared by reference between
+ * history versions, so an entry comes from the two history stores'
+ * structural diff (storeEntry), which only walks the paths they do not
+ * share. The stored state is a snapshot (one row per record) plus the
+ * journal; loading replays the entries over snapshot pages (replayRange),
+ * and compaction folds them back in.
+ */
+
+import { diffRecord, patchRecord } from './drawState.js';
+
+// Entry from [index, record, previousRecord] changes
+const entryOf = (changed, previousLength, length) => {
+  const put = [];
+  const patch = [];
+  changed.forEach(([i, record, old]) => {
+    if (old && old.id === record.id) {
+      patch.push([i, diffRecord(old, record)]);
+    } else {
+      put.push([i, record]);
+    }
+  });
+
+  if (put.length === 0 && patch.length === 0 && previousLength === length) return null;
+  return { length, put, patch };
+};
+
+/**
+ * Journal entry turning history store `previous` into `next` (historyStore.js),
+ * from their structural diff: costs what changed, not the size of history
+ * @param {Object} previous - Last saved store
+ * @param {Object} next - Store to save
+ * @returns {Object|null} { length, put: [[index, record]], patch: [[index, patch]] }, or null if unchanged
+ */
+export const storeEntry = (previous, next) => (
+  entryOf(next.diff(previous).changed, previous.size, next.size)
+);
+
+/**
+ * Final length of history after the entries
+ * @param {number} snapshotLength - Records in the snapshot
+ * @param {Array} entries - Journal entries, oldest first
+ */
+export const journalLength = (snapshotLength, entries) => (
+  entries.length > 0 ? entries[entries.length - 1].length : snapshotLength
+);
+
+/**
+ * Rebuild only positions [start, end) of history (paged loading)
+ * @param {Array} rows - Snapshot records at positions start, start + 1, ...
+ * @param {number} start - Position of rows[0]
+ * @param {number} end - First position not needed
+ * @param {Array} entries - Journal entries, oldest first
+ * @returns {Array} Records at positions start .. end - 1
+ */
+export const replayRange = (rows, start, end, entries) => {
+  const records = rows.slice(0, end - start);
+  const inRange = ([i]) => i >= start && i < end;
+  entries.forEach(entry => {
+    records.length = Math.max(0, Math.min(records.length, entry.length - start));
+    entry.put.filter(inRange).forEach(([i, record]) => {
+      records[i - start] = record;
+    });
+    entry.patch.filter(inRange).forEach(([i, patch]) => {
+      records[i - start] = patchRecord(records[i - start], patch);
+    });
+  });
+  return records;
+};
@@ -1,26 +1,208 @@
+/**
+ * Sampling engine for drawing unique winners
+ *
+ * drawWinners picks a strategy by pool size and draw size:
+ * - floyd:     k much smaller than n, O(k) time and memory
+ * - partial:   partial Fisher-Yates, stops after k swaps
+ * - reservoir: streamed sources (iterables without a known length)
+ *
+ * Every strategy returns a uniformly random k-permutation of the source,
+ * so each candidate has the same chance of landing in each winner slot.
+ * Randomness comes from a pluggable source (see rng.js); the default is
+ * batched crypto.getRandomValues with rejection sampling.
+ *
+ * Weighted draws (ticket counts) go through sampleWeighted and a Fenwick
+ * weight index (see weightIndex.js). Group quotas go through per-group
+ * indexes (see stratified.js).
+ */
+
+import { getDefaultRng } from './rng.js';
+import { createGroupIndex, sampleStratified } from './stratified.js';
+
+// Use Floyd's algorithm when the pool is at least this many times the draw size
+const FLOYD_RATIO = 16;
+
 /**
  * Fisher-Yates shuffle algorithm
  * Creates a shuffled copy of an array
  */
-export const fisherYatesShuffle = (array) => {
+export const fisherYatesShuffle = (array, rng = getDefaultRng()) => {
   const shuffled = [...array];
 
   for (let i = shuffled.length - 1; i > 0; i--) {
-    const j = Math.floor(Math.random() * (i + 1));
+    const j = rng.nextInt(i + 1);
     [shuffled[i], shuffled[j]] = [shuffled[j], shuffled[i]];
   }
 
   return shuffled;
 };
 
+/**
+ * Partial Fisher-Yates over indices: shuffle only the first k of [0, n)
+ * Works on an Int32Array, so candidate names are never copied
+ */
+const partialIndices = (n, k, rng) => {
+  const indices = new Int32Array(n);
+  for (let i = 0; i < n; i++) indices[i] = i;
+
+  const result = new Array(k);
+  for (let i = 0; i < k; i++) {
+    const j = i + rng.nextInt(n - i);
+    const picked = indices[j];
+    indices[j] = indices[i];
+    indices[i] = picked;
+    result[i] = picked;
+  }
+
+  return result;
+};
+
+/**
+ * Floyd's algorithm: k distinct indices from [0, n) in O(k)
+ * The picked set is uniform; a final k-element shuffle makes the order uniform too
+ */
+const floydIndices = (n, k, rng) => {
+  const picked = new Set();
+
+  for (let j = n - k; j < n; j++) {
+    const t = rng.nextInt(j + 1);
+    picked.add(picked.has(t) ? j : t);
+  }
+
+  const result = Array.from(picked);
+  for (let i = result.length - 1; i > 0; i--) {
+    const j = rng.nextInt(i + 1);
+    [result[i], result[j]] = [result[j], result[i]];
+  }
+
+  return result;
+};
+
+/**
+ * Partial Fisher-Yates: first k positions of a shuffle of array
+ */
+export const partialFisherYates = (array, k, rng = getDefaultRng()) => {
+  return partialIndices(array.length, k, rng).map(i => array[i]);
+};
+
+/**
+ * Floyd's algorithm: k unique elements of array in O(k)
+ */
+export const floydSample = (array, k, rng = getDefaultRng()) => {
+  return floydIndices(array.length, k, rng).map(i => array[i]);
+};
+
+/**
+ * Draw k distinct indices from [0, n) in uniformly random order
+ * Same strategy choice and random stream as drawWinners on an array of length n,
+ * so index-based pools reproduce array-based draws exactly
+ * @param {number} n - Size of the index range
+ * @param {number} k - Number of indices
+ * @param {Object} rng - RNG source
+ * @returns {Array<number>} Indices in draw order
+ */
+export const sampleIndices = (n, k, rng = getDefaultRng()) => {
+  if (k > n) {
+    throw new Error(`Cannot draw ${k} winners from ${n} candidates`);
+  }
+  return k * FLOYD_RATIO <= n ? floydIndices(n, k, rng) : partialIndices(n, k, rng);
+};
+
+/**
+ * Reservoir sampling (Algorithm R) over any iterable
+ * Also reports how many items were seen, so callers can detect a short source
+ */
+export const reservoirSample = (iterable, k, rng = getDefaultRng()) => {
+  const reservoir = [];
+  let seen = 0;
+
+  for (const item of iterable) {
+    if (seen < k) {
+      reservoir.push(item);
+    } else {
+      const j = rng.nextInt(seen + 1);
+      if (j < k) reservoir[j] = item;
+    }
+    seen++;
+  }
+
+  // Reservoir order is biased towards arrival order; shuffle the k slots
+  for (let i = reservoir.length - 1; i > 0; i--) {
+    const j = rng.nextInt(i + 1);
+    [reservoir[i], reservoir[j]] = [reservoir[j], reservoir[i]];
+  }
+
+  return { sample: reservoir, seen };
+};
+
+/**
+ * Pick the sampling strategy for a draw of k from a source
+ * @param {Array|Iterable} candidates - Candidate source
+ * @param {number} count - Number of winners
+ * @returns {'floyd'|'partial'|'reservoir'} Strategy name
+ */
+export const selectStrategy = (candidates, count) => {
+  if (!Array.isArray(candidates)) {
+    return 'reservoir';
+  }
+  return count * FLOYD_RATIO <= candidates.length ? 'floyd' : 'partial';
+};
+
 /**
  * Draw N unique winners from available candidates
+ * @param {Array|Iterable} candidates - Candidate names (array or streamed iterable)
+ * @param {number} count - Number of winners
+ * @param {Object} options - { strategy, rng } to force a sampler or random source,
+ *   { quota } to draw under per-group minimums/maximums (see stratified.js)
+ * @returns {Array} Winners in draw order
  */
-export const drawWinners = (candidates, count) => {
+export const drawWinners = (candidates, count, { strategy, rng = getDefaultRng(), quota = null } = {}) => {
+  if (quota) {
+    const list = Array.isArray(candidates) ? candidates : Array.from(candidates);
+    return sampleStratified(createGroupIndex(list), count, quota, rng).map(id => list[id]);
+  }
+
+  const chosen = strategy || selectStrategy(candidates, count);
+
+  if (chosen === 'reservoir') {
+    const { sample, seen } = reservoirSample(candidates, count, rng);
+    if (count > seen) {
+      throw new Error(`Cannot draw ${count} winners from ${seen} candidates`);
+    }
+    return sample;
+  }
+
   if (count > candidates.length) {
     throw new Error(`Cannot draw ${count} winners from ${candidates.length} candidates`);
   }
 
-  const shuffled = fisherYatesShuffle(candidates);
-  return shuffled.slice(0, count);
+  return chosen === 'floyd'
+    ? floydSample(candidates, count, rng)
+    : partialFisherYates(candidates, count, rng);
+};
+
+/**
+ * Draw N unique indices from a weight index, proportional to weight
+ * Each pick is zeroed in the index (O(log n)), so the index doubles as the pool
+ * @param {Object} index - Weight index from createWeightIndex
+ * @param {number} count - Number of winners
+ * @param {Object} rng - RNG source
+ * @returns {Array<number>} Picked indices in draw order
+ */
+export const sampleWeighted = (index, count, rng = getDefaultRng()) => {
+  const picked = [];
+
+  for (let i = 0; i < count; i++) {
+    const total = index.total();
+    if (total <= 0) {
+      // Give back what was taken so a failed draw leaves the pool untouched
+      picked.forEach(({ at, weight }) => index.set(at, weight));
+      throw new Error(`Cannot draw ${count} winners from ${i} weighted candidates`);
+    }
+    const at = index.find(rng.nextInt(total));
+    picked.push({ at, weight: index.get(at) });
+    index.set(at, 0);
+  }
+
+  return picked.map(({ at }) => at);
 };
@@ -0,0 +1,206 @@
+/**
+ * Audit replay for seeded draws
+ *
+ * Rebuilds every draw and redraw of an event from the candidate list plus the
+ * seed and stream position stored on each record, in a single pass ordered by
+ * time. Seeded draws always sample from the pool in candidate-list order, so
+ * the pool only needs to be reconstructed as a set. Weighted events keep one
+ * Fenwick index for the whole pass and update it per winner. Quota draws
+ * rebuild the group indexes from the pool set for each event. A voided draw
+ * returns its winners to the pool at the time it was voided.
+ */
+
+import { drawWinners, sampleWeighted } from './randomizer.js';
+import { createSeededRng } from './rng.js';
+import { createWeightIndex } from './weightIndex.js';
+import { createGroupIndex, sampleStratified } from './stratified.js';
+
+const winnerName = (w) => (typeof w === 'string' ? w : w.name);
+
+/**
+ * Flatten history into draw and redraw-batch events sorted by time
+ * Redraw entries created by one redraw call share the same rng position
+ */
+const collectEvents = (history) => {
+  const events = [];
+
+  history.forEach(record => {
+    events.push({
+      type: 'draw',
+      record,
+      timestamp: record.timestamp,
+      position: record.rng ? record.rng.position : -1,
+    });
+
+    const batches = new Map();
+    (record.redrawHistory || []).forEach(entry => {
+      const key = entry.rng ? `${entry.rng.seed}:${entry.rng.position}` : `t:${entry.timestamp}`;
+      if (!batches.has(key)) {
+        const batch = {
+          type: 'redraw',
+          record,
+          entries: [],
+          timestamp: entry.timestamp,
+          position: entry.rng ? entry.rng.position : -1,
+        };
+        batches.set(key, batch);
+        events.push(batch);
+      }
+      batches.get(key).entries.push(entry);
+    });
+
+    if (record.voided) {
+      events.push({ type: 'void', record, timestamp: record.voided.timestamp, position: Infinity });
+    }
+  });
+
+  return events.sort((a, b) => a.timestamp - b.timestamp || a.position - b.position);
+};
+
+const sameList = (a, b) => a.length === b.length && a.every((name, i) => name === b[i]);
+
+/**
+ * Replay an event and compare against the stored history
+ * @param {Array} candidates - Full candidate list, in load order
+ * @param {Array} history - Array of DrawRecord objects
+ * @param {Array|null} weights - Ticket counts parallel to candidates, for weighted events
+ * @returns {Object} { verified, skipped, mismatches }
+ */
+export const replayEvent = (candidates, history, weights = null) => {
+  const removed = new Set();
+  // name -> ids of the draws (this pool epoch) holding it out of the pool
+  const heldBy = new Map();
+  const excludedByDraw = new Map();
+  const mismatches = [];
+  let verified = 0;
+  let skipped = 0;
+  let poolEpoch = 0;
+
+  const positions = weights ? new Map(candidates.map((name, i) => [name, i])) : null;
+  let available = weights ? createWeightIndex(weights) : null;
+  const full = weights ? createWeightIndex(weights) : null;
+
+  const sampleUniform = (exclusions, count, rng) => {
+    const pool = candidates.filter(name => !exclusions.has(name));
+    return drawWinners(pool, count, { rng });
+  };
+
+  const sampleQuota = (exclusions, count, quota, rng) => {
+    const groups = createGroupIndex(candidates, weights);
+    candidates.forEach((name, i) => {
+      if (exclusions.has(name)) groups.remove(i);
+    });
+    return sampleStratified(groups, count, quota, rng).map(i => candidates[i]);
+  };
+
+  const sampleFromIndex = (index, count, rng) => {
+    const picked = sampleWeighted(index, count, rng);
+    picked.forEach(i => index.set(i, weights[i]));
+    return picked.map(i => candidates[i]);
+  };
+
+  const sampleRedraw = (exclusions, count, rng) => {
+    const zeroed = [...exclusions].map(name => positions.get(name)).filter(i => i !== undefined);
+    zeroed.forEach(i => full.set(i, 0));
+    try {
+      return sampleFromIndex(full, count, rng);
+    } finally {
+      zeroed.forEach(i => full.set(i, weights[i]));
+    }
+  };
+
+  const markRemoved = (name, drawId) => {
+    removed.add(name);
+    if (!heldBy.has(name)) heldBy.set(name, new Set());
+    heldBy.get(name).add(drawId);
+    if (available && positions.has(name)) available.set(positions.get(name), 0);
+  };
+
+  // Voiding returns names no other draw of the pool still holds
+  const voidDraw = (record) => {
+    record.winners.map(winnerName).forEach(name => {
+      const holders = heldBy.get(name);
+      if (!holders || !holders.delete(record.id) || holders.size > 0) return;
+      heldBy.delete(name);
+      removed.delete(name);
+      if (available && positions.has(name)) available.set(positions.get(name), weights[positions.get(name)]);
+    });
+  };
+
+  collectEvents(history).forEach(event => {
+    const { record } = event;
+
+    if (event.type === 'void') {
+      if ((record.poolEpoch || 0) === poolEpoch) voidDraw(record);
+      return;
+    }
+
+    if (event.type === 'draw') {
+      // resetPool returns everyone to the pool but keeps history
+      if ((record.poolEpoch || 0) !== poolEpoch) {
+        poolEpoch = record.poolEpoch || 0;
+        removed.clear();
+        heldBy.clear();
+        if (weights) available = createWeightIndex(weights);
+      }
+
+      const actual = record.winners
+        .filter(w => typeof w === 'string' || !w.isReplacement)
+        .map(winnerName);
+
+      if (record.rng) {
+        const count = record.expectedCount || actual.length;
+        const rng = createSeededRng(record.rng);
+        let expected;
+        if (record.quota) {
+          expected = sampleQuota(removed, count, record.quota, rng);
+        } else {
+          expected = weights
+            ? sampleFromIndex(available, count, rng)
+            : sampleUniform(removed, count, rng);
+        }
+        if (sameList(expected, actual)) {
+          verified++;
+        } else {
+          mismatches.push({ drawId: record.id, drawNumber: record.drawNumber, type: 'draw', expected, actual });
+        }
+      } else {
+        skipped++;
+      }
+
+      actual.forEach(name => markRemoved(name, record.id));
+      excludedByDraw.set(record.id, new Set(actual));
+      return;
+    }
+
+    const exclude = excludedByDraw.get(record.id);
+    const actual = event.entries.map(entry => entry.replacementWinner);
+    const { rng, quota } = event.entries[0];
+
+    if (rng) {
+      let expected;
+      if (quota) {
+        expected = sampleQuota(exclude, actual.length, quota, createSeededRng(rng));
+      } else {
+        expected = weights
+          ? sampleRedraw(exclude, actual.length, createSeededRng(rng))
+          : sampleUniform(exclude, actual.length, createSeededRng(rng));
+      }
+      if (sameList(expected, actual)) {
+        verified++;
+      } else {
+        mismatches.push({ drawId: record.id, drawNumber: record.drawNumber, type: 'redraw', expected, actual });
+      }
+    } else {
+      skipped++;
+    }
+
+    event.entries.forEach(entry => exclude.add(entry.forfeitedWinner));
+    actual.forEach(name => {
+      exclude.add(name);
+      markRemoved(name, record.id);
+    });
+  });
+
+  return { verified, skipped, mismatches };
+};
@@ -0,0 +1,174 @@
+/**
+ * Random number sources for the randomizer
+ *
+ * Every source exposes the same shape:
+ *   nextUint32() -> integer in [0, 2^32)
+ *   nextInt(bound) -> unbiased integer in [0, bound)
+ */
+
+const UINT32_RANGE = 0x100000000;
+
+// crypto.getRandomValues fills at most 65536 bytes per call
+const MAX_BATCH = 16384;
+
+/**
+ * Unbiased integer in [0, bound) from a uint32 source via rejection sampling
+ * Values past the last whole multiple of bound are discarded, so no residue is favoured
+ * @param {Function} nextUint32 - Source of uniform 32-bit integers
+ * @param {number} bound - Exclusive upper bound, 1..2^32
+ * @returns {number} Uniform integer
+ */
+export const boundedInt = (nextUint32, bound) => {
+  if (!Number.isInteger(bound) || bound < 1 || bound > UINT32_RANGE) {
+    throw new Error(`Invalid random bound: ${bound}`);
+  }
+
+  const limit = UINT32_RANGE - (UINT32_RANGE % bound);
+  let value = nextUint32();
+  while (value >= limit) {
+    value = nextUint32();
+  }
+  return value % bound;
+};
+
+/**
+ * Cryptographic source backed by a pooled Uint32Array
+ * Entropy is pulled in batches so a million-element shuffle costs ~60 getRandomValues calls
+ * @param {Object} options - { batchSize } uint32 values per refill (max 16384)
+ * @returns {Object} RNG source
+ */
+export const createCryptoRng = ({ batchSize = MAX_BATCH } = {}) => {
+  if (!globalThis.crypto || typeof globalThis.crypto.getRandomValues !== 'function') {
+    throw new Error('crypto.getRandomValues is not available');
+  }
+
+  const pool = new Uint32Array(Math.min(Math.max(1, batchSize), MAX_BATCH));
+  let cursor = pool.length;
+
+  const nextUint32 = () => {
+    if (cursor === pool.length) {
+      globalThis.crypto.getRandomValues(pool);
+      cursor = 0;
+    }
+    return pool[cursor++];
+  };
+
+  return {
+    kind: 'crypto',
+    nextUint32,
+    nextInt: (bound) => boundedInt(nextUint32, bound),
+  };
+};
+
+/**
+ * Math.random source, only for environments without Web Crypto
+ * @returns {Object} RNG source
+ */
+export const createMathRng = () => {
+  const nextUint32 = () => Math.floor(Math.random() * UINT32_RANGE);
+
+  return {
+    kind: 'math',
+    nextUint32,
+    nextInt: (bound) => boundedInt(nextUint32, bound),
+  };
+};
+
+let defaultRng = null;
+
+/**
+ * Shared default source: crypto when available, Math.random otherwise
+ * @returns {Object} RNG source
+ */
+export const getDefaultRng = () => {
+  if (!defaultRng) {
+    try {
+      defaultRng = createCryptoRng();
+    } catch (error) {
+      console.error('Falling back to Math.random for draws:', error);
+      defaultRng = createMathRng();
+    }
+  }
+  return defaultRng;
+};
+
+/**
+ * New random 128-bit seed as a 32-character hex string
+ * @returns {string} Seed
+ */
+export const createSeed = () => {
+  const words = new Uint32Array(4);
+  globalThis.crypto.getRandomValues(words);
+  return Array.from(words, w => w.toString(16).padStart(8, '0')).join('');
+};
+
+/**
+ * SplitMix32 step, used to expand a seed into generator state
+ */
+const splitMix32 = (x) => {
+  let z = (x + 0x9e3779b9) | 0;
+  z = Math.imul(z ^ (z >>> 16), 0x85ebca6b);
+  z = Math.imul(z ^ (z >>> 13), 0xc2b2ae35);
+  return (z ^ (z >>> 16)) >>> 0;
+};
+
+/**
+ * Seeded xoshiro128** source with a tracked stream position
+ * The same seed and position always continue the same sequence, which is
+ * what draw records store so an event can be replayed for audit.
+ * Seeking to a position steps the generator (~100M steps/sec), so restoring
+ * any position within an event is effectively instant.
+ * @param {Object} options - { seed, position } hex seed and uint32 values already consumed
+ * @returns {Object} RNG source with seed and position
+ */
+export const createSeededRng = ({ seed, position = 0 }) => {
+  if (typeof seed !== 'string' || !/^[0-9a-f]{1,32}$/i.test(seed)) {
+    throw new Error(`Invalid seed: ${seed}`);
+  }
+
+  const padded = seed.padStart(32, '0');
+  const s = new Uint32Array(4);
+  let mix = 0;
+  for (let i = 0; i < 4; i++) {
+    mix = splitMix32(mix ^ parseInt(padded.slice(i * 8, i * 8 + 8), 16));
+    s[i] = mix;
+  }
+
+  let consumed = 0;
+
+  const nextUint32 = () => {
+    const x = Math.imul(s[1], 5);
+    const result = Math.imul((x << 7) | (x >>> 25), 9) >>> 0;
+    const t = s[1] << 9;
+    s[2] ^= s[0];
+    s[3] ^= s[1];
+    s[1] ^= s[2];
+    s[0] ^= s[3];
+    s[2] ^= t;
+    s[3] = (s[3] << 11) | (s[3] >>> 21);
+    consumed++;
+    return result;
+  };
+
+  for (let i = 0; i < position; i++) nextUint32();
+
+  return {
+    kind: 'xoshiro128**',
+    seed: seed.toLowerCase(),
+    get position() {
+      return consumed;
+    },
+    nextUint32,
+    nextInt: (bound) => boundedInt(nextUint32, bound),
+  };
+};
+
+/**
+ * Snapshot of a seeded source, stored on draw records
+ * @param {Object} rng - RNG source
+ * @returns {Object|null} { algorithm, seed, position } or null for unseeded sources
+ */
+export const describeRng = (rng) => {
+  if (!rng || rng.seed === undefined) return null;
+  return { algorithm: rng.kind, seed: rng.seed, position: rng.position };
+};
@@ -0,0 +1,135 @@
+/**
+ * Memoized selectors over draw records and history
+ *
+ * Records, their winners arrays and history versions (stores or arrays) are
+ * never mutated: every change produces new objects. Derived views are therefore
+ * cached in WeakMaps keyed by those objects and computed once per version;
+ * re-rendering an unchanged record is a cache hit, and a stale version's
+ * entry is collected along with it.
+ */
+
+const winnersCache = new WeakMap();
+const historyCache = new WeakMap();
+
+const EMPTY = Object.freeze([]);
+
+const EMPTY_SUMMARY = Object.freeze({
+  winners: EMPTY,
+  finalWinners: EMPTY,
+  activeOriginals: EMPTY,
+  replacements: EMPTY,
+  forfeited: EMPTY,
+  hasReplacements: false,
+});
+
+/**
+ * Split a winners array by status in one pass
+ * Handles both old (string[]) and new (WinnerObject[]) formats
+ * @param {Array<string|Object>} winners - A record's winners
+ * @returns {Object} { winners (normalized), finalWinners (status 'won'), activeOriginals
+ *   (won, not replacements), replacements, forfeited, hasReplacements }
+ */
+export const selectWinners = (winners) => {
+  if (!winners || winners.length === 0) return EMPTY_SUMMARY;
+
+  let summary = winnersCache.get(winners);
+  if (summary) return summary;
+
+  const normalized = [];
+  const finalWinners = [];
+  const activeOriginals = [];
+  const replacements = [];
+  const forfeited = [];
+
+  winners.forEach(w => {
+    const winner = typeof w === 'string' ? { name: w, status: 'won' } : w;
+    normalized.push(winner);
+    if (winner.status === 'won') {
+      finalWinners.push(winner);
+      if (!winner.isReplacement) activeOriginals.push(winner);
+    } else if (winner.status === 'forfeited') {
+      forfeited.push(winner);
+    }
+    if (winner.isReplacement) replacements.push(winner);
+  });
+
+  summary = {
+    winners: normalized,
+    finalWinners,
+    activeOriginals,
+    replacements,
+    forfeited,
+    hasReplacements: replacements.length > 0,
+  };
+  winnersCache.set(winners, summary);
+  return summary;
+};
+
+/**
+ * Winner summary of a draw record (cached per record version)
+ */
+export const selectRecord = (record) => selectWinners(record && record.winners);
+
+// Add (sign 1) or take away (sign -1) one record's winner counts
+const countRecord = (stats, record, sign) => {
+  const summary = selectRecord(record);
+  stats.finalWinners += sign * summary.finalWinners.length;
+  stats.replacements += sign * summary.replacements.length;
+  stats.forfeited += sign * summary.forfeited.length;
+};
+
+// Newest history store with cached stats: the next version's totals are
+// derived from it through the store's structural diff
+let lastStore = null;
+
+/**
+ * Event-wide winner totals (cached per history version)
+ * For a history store (historyStore.js) the totals of a new version are the
+ * previous version's, adjusted for the records diff() reports as changed, so
+ * a forfeit or a draw costs O(changed records), not O(history). Arrays are
+ * counted in full, with per-record counts from the record cache
+ * @param {Object|Array<Object>} history - History store or draw records
+ * @returns {Object} { draws, finalWinners, replacements, forfeited }
+ */
+export const selectHistoryStats = (history) => {
+  let stats = historyCache.get(history);
+  if (stats) return stats;
+
+  if (Array.isArray(history)) {
+    stats = { draws: history.length, finalWinners: 0, replacements: 0, forfeited: 0 };
+    history.forEach(record => countRecord(stats, record, 1));
+  } else if (lastStore && historyCache.has(lastStore)) {
+    const { changed, removed } = history.diff(lastStore);
+    stats = { ...historyCache.get(lastStore), draws: history.size };
+    changed.forEach(([, record, previous]) => {
+      if (previous) countRecord(stats, previous, -1);
+      countRecord(stats, record, 1);
+    });
+    removed.forEach(record => countRecord(stats, record, -1));
+  } else {
+    stats = { draws: history.size, finalWinners: 0, replacements: 0, forfeited: 0 };
+    for (const record of history) countRecord(stats, record, 1);
+  }
+
+  if (!Array.isArray(history)) lastStore = history;
+  historyCache.set(history, stats);
+  return stats;
+};
+
+/**
+ * Candidate pool statistics
+ * @param {number} total - Candidates loaded
+ * @param {number} available - Candidates still in the pool
+ * @param {Object|Array<Object>} history - History store or draw records
+ * @returns {Object} { total, available, drawn, usagePercent, ...selectHistoryStats(history) }
+ */
+export const selectPoolStats = (total, available, history) => {
+  const drawn = total - available;
+  return {
+    ...selectHistoryStats(history),
+    total,
+    available,
+    drawn,
+    usagePercent: total > 0 ? Math.round((drawn / total) * 100) : 0,
+  };
+};
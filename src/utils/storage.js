@@ -7,6 +7,7 @@ const STORAGE_KEYS = {
   PRIZES: 'luckyDraw_prizes',
   HISTORY: 'luckyDraw_history',
   CANDIDATES: 'luckyDraw_candidates',
+  CANDIDATE_WEIGHTS: 'luckyDraw_candidateWeights',
 };
 
 /**
@@ -114,6 +115,27 @@ export const saveCandidates = (candidates) => {
   return setToStorage(STORAGE_KEYS.CANDIDATES, candidates);
 };
 
+/**
+ * Load candidate ticket counts from localStorage
+ * @returns {Array|null} Weights parallel to the saved candidates, or null if unweighted
+ */
+export const loadCandidateWeights = () => {
+  return getFromStorage(STORAGE_KEYS.CANDIDATE_WEIGHTS);
+};
+
+/**
+ * Save candidate ticket counts to localStorage
+ * @param {Array|null} weights - Weights parallel to candidates, or null to clear
+ * @returns {boolean} Success status
+ */
+export const saveCandidateWeights = (weights) => {
+  if (!weights) {
+    removeFromStorage(STORAGE_KEYS.CANDIDATE_WEIGHTS);
+    return true;
+  }
+  return setToStorage(STORAGE_KEYS.CANDIDATE_WEIGHTS, weights);
+};
+
 /**
  * Export storage keys for direct use if needed
  */
@@ -0,0 +1,224 @@
+/**
+ * Stratified draws by candidate group
+ *
+ * A candidate's group is its name prefix (`KR-MinJoon` -> `KR`); names
+ * without a prefix are ungrouped. Every group keeps its own Fenwick index
+ * over its members (in candidate-list order), so a quota draw samples each
+ * stratum directly: minimums are filled group by group, then the remaining
+ * slots are drawn from the union of groups still under their maximum.
+ *
+ * Quotas look like { KR: { min: 2 }, TW: { max: 1 }, SG: { min: 1, max: 1 } }.
+ */
+
+import { createWeightIndex } from './weightIndex.js';
+
+const PREFIX_PATTERN = /^([A-Za-z]+)-/;
+
+/**
+ * Group key of a candidate name ('' when it has no prefix)
+ */
+export const groupOf = (name) => {
+  const match = PREFIX_PATTERN.exec(name);
+  return match ? match[1].toUpperCase() : '';
+};
+
+/**
+ * Build per-group pool indexes over a candidate list
+ * @param {Array<string>} names - Candidate names (ids = positions)
+ * @param {ArrayLike<number>|null} weights - Optional ticket count per candidate
+ * @returns {Object} Group index; every candidate starts out available
+ */
+export const createGroupIndex = (names, weights = null) => {
+  const keys = [...new Set(names.map(groupOf))].sort();
+  const keyIndex = new Map(keys.map((key, g) => [key, g]));
+  const groupIds = new Int32Array(names.length);
+  const local = new Int32Array(names.length);
+  const members = keys.map(() => []);
+
+  names.forEach((name, id) => {
+    const g = keyIndex.get(groupOf(name));
+    groupIds[id] = g;
+    local[id] = members[g].length;
+    members[g].push(id);
+  });
+
+  const weightOf = (id) => (weights ? weights[id] : 1);
+  const available = new Uint8Array(names.length);
+  const counts = new Int32Array(keys.length);
+  let indexes = [];
+
+  const reset = () => {
+    available.fill(1);
+    members.forEach((ids, g) => {
+      counts[g] = ids.length;
+    });
+    indexes = members.map(ids => createWeightIndex(ids.map(weightOf)));
+  };
+
+  reset();
+
+  return {
+    keys,
+    keyIndex: (key) => keyIndex.get(key),
+    members,
+    indexes: () => indexes,
+    count: (g) => counts[g],
+    has: (id) => available[id] === 1,
+
+    remove: (id) => {
+      if (available[id] !== 1) return false;
+      available[id] = 0;
+      counts[groupIds[id]]--;
+      indexes[groupIds[id]].set(local[id], 0);
+      return true;
+    },
+
+    restore: (id) => {
+      if (available[id] !== 0) return false;
+      available[id] = 1;
+      counts[groupIds[id]]++;
+      indexes[groupIds[id]].set(local[id], weightOf(id));
+      return true;
+    },
+
+    reset,
+  };
+};
+
+/**
+ * Draw count ids under group quotas
+ * Picks are removed from the group index; on failure the index is left untouched
+ * @param {Object} groups - Group index from createGroupIndex
+ * @param {number} count - Number of winners
+ * @param {Object} quota - { [group]: { min, max } }
+ * @param {Object} rng - RNG source
+ * @returns {Array<number>} Ids in draw order (minimum fills first)
+ */
+export const sampleStratified = (groups, count, quota, rng) => {
+  const limits = groups.keys.map(key => ({
+    min: (quota[key] && quota[key].min) || 0,
+    max: quota[key] && quota[key].max !== undefined ? quota[key].max : Infinity,
+  }));
+
+  // Quota groups with no candidates at all can never meet a minimum
+  Object.keys(quota).forEach(key => {
+    if (groups.keyIndex(key) === undefined && (quota[key].min || 0) > 0) {
+      throw new Error(`Not enough ${key} candidates (need ${quota[key].min}, have 0)`);
+    }
+  });
+
+  const minTotal = limits.reduce((sum, limit) => sum + limit.min, 0);
+  if (minTotal > count) {
+    throw new Error(`Group minimums need ${minTotal} winners, but only ${count} are being drawn`);
+  }
+
+  let capacity = 0;
+  limits.forEach((limit, g) => {
+    const have = groups.count(g);
+    if (limit.min > limit.max) {
+      throw new Error(`Group ${groups.keys[g]} has min ${limit.min} above max ${limit.max}`);
+    }
+    if (limit.min > have) {
+      throw new Error(`Not enough ${groups.keys[g]} candidates (need ${limit.min}, have ${have})`);
+    }
+    capacity += Math.min(have, limit.max);
+  });
+  if (capacity < count) {
+    throw new Error(`Cannot draw ${count} winners within group limits (${capacity} eligible)`);
+  }
+
+  const indexes = groups.indexes();
+  const taken = new Int32Array(limits.length);
+  const picked = [];
+
+  const take = (g, target) => {
+    const id = groups.members[g][indexes[g].find(target)];
+    groups.remove(id);
+    taken[g]++;
+    picked.push(id);
+  };
+
+  try {
+    // Minimums: sample each stratum on its own
+    limits.forEach((limit, g) => {
+      for (let i = 0; i < limit.min; i++) {
+        const total = indexes[g].total();
+        if (total <= 0) throw new Error(`Not enough weighted ${groups.keys[g]} candidates`);
+        take(g, rng.nextInt(total));
+      }
+    });
+
+    // Remaining slots: one draw over every group still under its maximum
+    while (picked.length < count) {
+      let total = 0;
+      limits.forEach((limit, g) => {
+        if (taken[g] < limit.max) total += indexes[g].total();
+      });
+      if (total <= 0) throw new Error(`Cannot draw ${count} winners within group limits`);
+
+      let target = rng.nextInt(total);
+      for (let g = 0; g < limits.length; g++) {
+        if (taken[g] >= limits[g].max) continue;
+        const groupTotal = indexes[g].total();
+        if (target < groupTotal) {
+          take(g, target);
+          break;
+        }
+        target -= groupTotal;
+      }
+    }
+  } catch (error) {
+    picked.forEach(id => groups.restore(id));
+    throw error;
+  }
+
+  return picked;
+};
+
+/**
+ * Quota left for a redraw once the kept winners are counted
+ * @param {Object} quota - The draw's original quota
+ * @param {Array<string>} keptNames - Winners that still hold their prize
+ * @returns {Object} Adjusted quota
+ */
+export const remainingQuota = (quota, keptNames) => {
+  const kept = new Map();
+  keptNames.forEach(name => {
+    const key = groupOf(name);
+    kept.set(key, (kept.get(key) || 0) + 1);
+  });
+
+  const result = {};
+  Object.entries(quota).forEach(([key, limit]) => {
+    const have = kept.get(key) || 0;
+    const adjusted = {};
+    if (limit.min) adjusted.min = Math.max(0, limit.min - have);
+    if (limit.max !== undefined) adjusted.max = Math.max(0, limit.max - have);
+    result[key] = adjusted;
+  });
+  return result;
+};
+
+/**
+ * Parse quota text such as "KR>=2, TW<=1, SG=1"
+ * @param {string} text - Comma- or newline-separated rules
+ * @returns {Object|null} Quota, or null when empty
+ */
+export const parseQuota = (text) => {
+  const rules = text.split(/[,\n]/).map(rule => rule.trim()).filter(Boolean);
+  if (rules.length === 0) return null;
+
+  const quota = {};
+  rules.forEach(rule => {
+    const match = /^([A-Za-z]+)\s*(>=|<=|=)\s*(\d+)$/.exec(rule);
+    if (!match) {
+      throw new Error(`Invalid group rule "${rule}" (use e.g. KR>=2, TW<=1, SG=1)`);
+    }
+    const key = match[1].toUpperCase();
+    const value = parseInt(match[3], 10);
+    const limit = quota[key] || (quota[key] = {});
+    if (match[2] !== '<=') limit.min = value;
+    if (match[2] !== '>=') limit.max = value;
+  });
+  return quota;
+};
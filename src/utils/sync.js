@@ -0,0 +1,180 @@
+/**
+ * Cross-tab sync over BroadcastChannel
+ *
+ * Every window is a replica with a random id. A local action is broadcast as
+ * a patch (the reducer action itself, usually a few hundred bytes) stamped
+ * with the sender's version vector: replica id -> number of that replica's
+ * actions it has applied. A receiver applies a patch when it is the next one
+ * from its sender and everything the sender had seen is already applied here.
+ *
+ * - Gap (the sender saw actions this replica missed): request a snapshot
+ * - Concurrent (this replica applied actions the sender had not seen): a
+ *   conflict. The action from the lowest replica id wins; replicas holding a
+ *   losing action adopt a snapshot from the winner, others drop the patch
+ *
+ * New windows request a snapshot on start, so a projector window picks up the
+ * operator's state without re-reading localStorage.
+ */
+
+const CHANNEL_NAME = 'luckyDraw_sync';
+// A request nobody answers (first window, peer closed) stops blocking patches
+const SNAPSHOT_TIMEOUT_MS = 1000;
+
+/**
+ * Random replica id (sortable string)
+ */
+export const createReplicaId = () => {
+  const bytes = new Uint8Array(8);
+  globalThis.crypto.getRandomValues(bytes);
+  return Array.from(bytes, b => b.toString(16).padStart(2, '0')).join('');
+};
+
+/**
+ * Decide what to do with a patch
+ * @param {Object} local - This replica's version vector
+ * @param {string} from - Sender replica id
+ * @param {Object} vector - Sender's vector including the patch
+ * @returns {Object} { verdict: 'apply' | 'duplicate' | 'gap' | 'conflict', winner }
+ */
+export const classifyPatch = (local, from, vector) => {
+  const expected = (local[from] || 0) + 1;
+  if (vector[from] < expected) return { verdict: 'duplicate' };
+  if (vector[from] > expected) return { verdict: 'gap' };
+
+  let gap = false;
+  const conflicting = [];
+  new Set([...Object.keys(local), ...Object.keys(vector)]).forEach(id => {
+    if (id === from) return;
+    const mine = local[id] || 0;
+    const theirs = vector[id] || 0;
+    if (theirs > mine) gap = true;
+    if (mine > theirs) conflicting.push(id);
+  });
+
+  if (conflicting.length > 0) {
+    // Lowest replica id among the conflicting actions wins
+    const winner = [from, ...conflicting].sort()[0];
+    return { verdict: 'conflict', winner };
+  }
+  return { verdict: gap ? 'gap' : 'apply' };
+};
+
+/**
+ * Open the sync channel for this window
+ * Where BroadcastChannel is unavailable the channel is inert (single window)
+ * @param {Object} handlers
+ * @param {Function} handlers.onPatch - (action, meta) => Promise, apply a remote action
+ * @param {Function} handlers.onSnapshot - (snapshot) => Promise, replace local state
+ * @param {Function} handlers.getSnapshot - () => Promise<Object>, current state for a peer
+ * @param {Function} handlers.onConflict - ({ winner, lost }) => void, optional
+ * @param {string} name - Channel name
+ * @returns {Object} { replicaId, vector, publish, requestSnapshot, close }
+ */
+export const createSyncChannel = ({
+  onPatch,
+  onSnapshot,
+  getSnapshot,
+  onConflict = () => {},
+}, name = CHANNEL_NAME) => {
+  const replicaId = createReplicaId();
+  let vector = {};
+
+  if (typeof BroadcastChannel === 'undefined') {
+    return {
+      replicaId,
+      vector: () => vector,
+      publish: () => {},
+      requestSnapshot: () => {},
+      close: () => {},
+    };
+  }
+
+  const channel = new BroadcastChannel(name);
+  // While a snapshot is on its way, patches are dropped (the snapshot or a
+  // later gap covers them)
+  let awaitingSnapshot = false;
+  let snapshotTimer = null;
+  let queue = Promise.resolve();
+
+  const post = (message) => channel.postMessage({ ...message, from: replicaId });
+
+  const requestSnapshot = (to = null) => {
+    awaitingSnapshot = true;
+    clearTimeout(snapshotTimer);
+    snapshotTimer = setTimeout(() => {
+      awaitingSnapshot = false;
+    }, SNAPSHOT_TIMEOUT_MS);
+    post({ type: 'request', to });
+  };
+
+  // Messages are handled one at a time, in arrival order
+  const enqueue = (task) => {
+    queue = queue.then(task).catch(error => {
+      console.error('Sync error:', error);
+    });
+  };
+
+  channel.onmessage = (event) => {
+    const message = event.data;
+    if (!message || message.from === replicaId) return;
+    if (message.to && message.to !== replicaId) return;
+
+    enqueue(async () => {
+      switch (message.type) {
+        case 'patch': {
+          if (awaitingSnapshot) return;
+          const { verdict, winner } = classifyPatch(vector, message.from, message.vector);
+          if (verdict === 'apply') {
+            await onPatch(message.action, { from: message.from, stream: message.stream });
+            vector = { ...vector, [message.from]: message.vector[message.from] };
+          } else if (verdict === 'gap') {
+            requestSnapshot(message.from);
+          } else if (verdict === 'conflict' && winner === message.from) {
+            onConflict({ winner, lost: message.action.type });
+            requestSnapshot(winner);
+          }
+          return;
+        }
+
+        case 'request': {
+          const snapshot = await getSnapshot();
+          post({ type: 'snapshot', to: message.from, vector, snapshot });
+          return;
+        }
+
+        case 'snapshot': {
+          if (!awaitingSnapshot) return;
+          awaitingSnapshot = false;
+          clearTimeout(snapshotTimer);
+          await onSnapshot(message.snapshot);
+          vector = { ...message.vector };
+          return;
+        }
+
+        default:
+      }
+    });
+  };
+
+  return {
+    replicaId,
+    vector: () => vector,
+
+    /**
+     * Broadcast a local action (call in commit order)
+     * @param {Object} action - Reducer action
+     * @param {Object|null} stream - Seeded RNG position after the action
+     */
+    publish: (action, stream = null) => {
+      vector = { ...vector, [replicaId]: (vector[replicaId] || 0) + 1 };
+      post({ type: 'patch', vector, action, stream });
+    },
+
+    requestSnapshot,
+
+    close: () => {
+      clearTimeout(snapshotTimer);
+      channel.close();
+    },
+  };
+};
@@ -0,0 +1,73 @@
+/**
+ * Fenwick tree over per-candidate ticket counts
+ *
+ * Index i holds the weight of candidate i (in candidate-list order).
+ * Point updates and prefix lookups are O(log n), so removing a winner from
+ * the weighted pool never needs a rebuild.
+ */
+
+/**
+ * Build a weight index in O(n)
+ * @param {ArrayLike<number>} weights - Non-negative integer weight per candidate
+ * @returns {Object} Weight index
+ */
+export const createWeightIndex = (weights) => {
+  const n = weights.length;
+  const values = new Float64Array(n);
+  const tree = new Float64Array(n + 1);
+
+  for (let i = 0; i < n; i++) {
+    values[i] = weights[i];
+    tree[i + 1] += weights[i];
+    const parent = (i + 1) + ((i + 1) & -(i + 1));
+    if (parent <= n) tree[parent] += tree[i + 1];
+  }
+
+  let highBit = 1;
+  while (highBit * 2 <= n) highBit *= 2;
+
+  const add = (i, delta) => {
+    for (let pos = i + 1; pos <= n; pos += pos & -pos) {
+      tree[pos] += delta;
+    }
+  };
+
+  const total = () => {
+    let sum = 0;
+    for (let pos = n; pos > 0; pos -= pos & -pos) sum += tree[pos];
+    return sum;
+  };
+
+  return {
+    size: n,
+    total,
+    get: (i) => values[i],
+
+    /**
+     * Set candidate i's weight (0 removes it from the pool)
+     */
+    set: (i, weight) => {
+      const delta = weight - values[i];
+      if (delta !== 0) {
+        values[i] = weight;
+        add(i, delta);
+      }
+    },
+
+    /**
+     * Smallest index whose prefix sum exceeds target, for target in [0, total)
+     */
+    find: (target) => {
+      let pos = 0;
+      let remaining = target;
+      for (let step = highBit; step > 0; step >>= 1) {
+        const next = pos + step;
+        if (next <= n && tree[next] <= remaining) {
+          pos = next;
+          remaining -= tree[next];
+        }
+      }
+      return pos;
+    },
+  };
+};
@@ -0,0 +1,137 @@
+/**
+ * Coalesced write-behind queue for persistence
+ *
+ * State changes enqueue a write per key (prizes, history, ...) instead of
+ * writing immediately. A key holds only its newest value, so ten prize edits
+ * or a burst of forfeits between flushes cost one write each. Pending writes
+ * are flushed:
+ *
+ * - in idle time (scheduleIdle, at most `timeout` ms after the first enqueue)
+ * - when the page is hidden or unloaded (visibilitychange / pagehide)
+ * - at checkpoints: checkpoint() flushes now and resolves once everything
+ *   enqueued so far is written (used after draws, before saving candidates)
+ *
+ * Flushes run one after another, so writes to a key land in enqueue order.
+ */
+
+import { scheduleIdle } from './idle.js';
+
+/**
+ * Create a write-behind queue
+ * @param {Object} options - { timeout } ms after which an idle flush runs anyway
+ * @returns {Object} { enqueue, checkpoint, listen, metrics }
+ */
+export const createWriteQueue = ({ timeout = 2000 } = {}) => {
+  // key -> { value, write, bytes }
+  let pending = new Map();
+  let cancelIdle = null;
+  let flushing = Promise.resolve();
+
+  const stats = {
+    flushes: 0,
+    writes: 0,
+    coalesced: 0,
+    failed: 0,
+    lastFlushMs: 0,
+    maxFlushMs: 0,
+    totalFlushMs: 0,
+  };
+
+  const runFlush = async (batch) => {
+    const started = performance.now();
+    const results = await Promise.all([...batch.values()].map(({ value, write }) => (
+      Promise.resolve()
+        .then(() => write(value))
+        .catch(error => {
+          console.error('Persistence write failed:', error);
+          return false;
+        })
+    )));
+
+    const elapsed = performance.now() - started;
+    stats.flushes++;
+    stats.writes += batch.size;
+    stats.failed += results.filter(ok => ok === false).length;
+    stats.lastFlushMs = elapsed;
+    stats.maxFlushMs = Math.max(stats.maxFlushMs, elapsed);
+    stats.totalFlushMs += elapsed;
+  };
+
+  /**
+   * Start writing everything pending
+   * @returns {Promise<void>} Resolves once those writes (and earlier flushes) finished
+   */
+  const flush = () => {
+    if (cancelIdle) {
+      cancelIdle();
+      cancelIdle = null;
+    }
+    if (pending.size > 0) {
+      const batch = pending;
+      pending = new Map();
+      flushing = flushing.then(() => runFlush(batch));
+    }
+    return flushing;
+  };
+
+  return {
+    /**
+     * Queue a write; replaces a pending write for the same key
+     * @param {string} key - What is written (one pending value per key)
+     * @param {any} value - Value to write
+     * @param {Function} write - (value) => Promise<boolean> | boolean
+     * @param {number} bytes - Estimated size, for metrics
+     */
+    enqueue: (key, value, write, bytes = 0) => {
+      if (pending.has(key)) stats.coalesced++;
+      pending.set(key, { value, write, bytes });
+      if (!cancelIdle) {
+        cancelIdle = scheduleIdle(() => {
+          cancelIdle = null;
+          flush();
+        }, { timeout });
+      }
+    },
+
+    checkpoint: flush,
+
+    /**
+     * Flush when the page is hidden or unloaded (browser only)
+     * @returns {Function} Remove the listeners
+     */
+    listen: () => {
+      if (typeof document === 'undefined') return () => {};
+      const onVisibilityChange = () => {
+        if (document.visibilityState === 'hidden') flush();
+      };
+      document.addEventListener('visibilitychange', onVisibilityChange);
+      window.addEventListener('pagehide', flush);
+      return () => {
+        document.removeEventListener('visibilitychange', onVisibilityChange);
+        window.removeEventListener('pagehide', flush);
+      };
+    },
+
+    /**
+     * @returns {Object} { pendingKeys, pendingBytes, flushes, writes, coalesced, failed,
+     *   lastFlushMs, maxFlushMs, avgFlushMs }
+     */
+    metrics: () => {
+      let pendingBytes = 0;
+      pending.forEach(({ bytes }) => {
+        pendingBytes += bytes;
+      });
+      return {
+        pendingKeys: pending.size,
+        pendingBytes,
+        flushes: stats.flushes,
+        writes: stats.writes,
+        coalesced: stats.coalesced,
+        failed: stats.failed,
+        lastFlushMs: stats.lastFlushMs,
+        maxFlushMs: stats.maxFlushMs,
+        avgFlushMs: stats.flushes > 0 ? stats.totalFlushMs / stats.flushes : 0,
+      };
+    },
+  };
+};
@@ -0,0 +1,40 @@
+/**
+ * Draw engine worker
+ *
+ * Runs createDrawEngine off the main thread. Messages are
+ * { id, method, args } and replies are { id, result } or { id, error }.
+ * Id arrays are sent back as transferable Int32Arrays.
+ */
+
+import { createDrawEngine } from '../utils/drawEngine.js';
+
+const engine = createDrawEngine();
+
+self.onmessage = (event) => {
+  const { id, method, args = [] } = event.data;
+
+  try {
+    if (typeof engine[method] !== 'function') {
+      throw new Error(`Unknown draw engine method: ${method}`);
+    }
+
+    const result = engine[method](...args);
+    const transfer = [];
+
+    if (result instanceof Int32Array) {
+      transfer.push(result.buffer);
+    } else if (result && Array.isArray(result.ids)) {
+      result.ids = Int32Array.from(result.ids);
+      transfer.push(result.ids.buffer);
+    } else if (result && Array.isArray(result.draws)) {
+      result.draws.forEach(draw => {
+        draw.ids = Int32Array.from(draw.ids);
+        transfer.push(draw.ids.buffer);
+      });
+    }
+
+    self.postMessage({ id, result }, transfer);
+  } catch (error) {
+    self.postMessage({ id, error: error.message });
+  }
+};
@@ -0,0 +1,90 @@
+import { test } from 'node:test';
+import assert from 'node:assert/strict';
+import {
+  encodeVarints,
+  decodeVarints,
+  createVarintDecoder,
+  encodeNames,
+  decodeNames,
+  createNameDecoder,
+  packNames,
+  unpackNames,
+  packNumbers,
+  unpackNumbers,
+  createStringTable,
+  packRecord,
+  unpackRecord,
+} from '../src/utils/codec.js';
+import { createDrawSession } from '../src/utils/drawCore.js';
+
+// Feed bytes to a streaming decoder in small uneven chunks
+const pushChunked = (decoder, bytes) => {
+  const out = [];
+  for (let i = 0, size = 1; i < bytes.length; i += size, size = (size % 5) + 1) {
+    out.push(...decoder.push(bytes.subarray(i, i + size)));
+  }
+  return out;
+};
+
+test('varints round-trip, whole and chunked', () => {
+  const values = [0, 1, 127, 128, 255, 16383, 16384, 2 ** 31 - 1, 2 ** 32, Number.MAX_SAFE_INTEGER];
+  const bytes = encodeVarints(values);
+  assert.deepEqual(decodeVarints(bytes), values);
+  assert.deepEqual(pushChunked(createVarintDecoder(), bytes), values);
+  assert.equal(encodeVarints([127]).length, 1);
+  assert.equal(encodeVarints([128]).length, 2);
+});
+
+test('front-coded names round-trip, whole and chunked', () => {
+  const names = ['', 'Ann', 'Anna', 'Annabel', 'Bob', 'Bob', 'Émile', 'Émilie', '李雷', '李小龙', '😀 one', '😀 two', 'z'];
+  const bytes = encodeNames(names);
+  assert.deepEqual(decodeNames(bytes), names);
+  assert.deepEqual(pushChunked(createNameDecoder(), bytes), names);
+});
+
+test('shared prefixes shrink sorted lists', () => {
+  const names = Array.from({ length: 1000 }, (_, i) => `Participant ${String(i).padStart(4, '0')}`);
+  const raw = new TextEncoder().encode(names.join('\n')).length;
+  assert.ok(encodeNames(names).length < raw / 2);
+});
+
+test('packed names and numbers round-trip through compression', async () => {
+  const names = Array.from({ length: 20000 }, (_, i) => `Name ${i} ${'x'.repeat(i % 7)}`);
+  const unpacked = [];
+  for await (const batch of unpackNames(await packNames(names))) unpacked.push(...batch);
+  assert.deepEqual(unpacked, names);
+
+  const numbers = Array.from({ length: 5000 }, (_, i) => (i * 7919) % 100000);
+  assert.deepEqual(await unpackNumbers(await packNumbers(numbers)), numbers);
+});
+
+test('records from real draws round-trip through packRecord', async () => {
+  const session = createDrawSession();
+  await session.setCandidates(Array.from({ length: 40 }, (_, i) => `Person ${i}`));
+  const plain = await session.performDraw(10, 'Plain');
+  const edited = await session.performDraw(5, 'Edited');
+  session.markWinnersAsForfeited(edited.id, edited.winners.slice(0, 2).map(w => w.name), 'absent');
+  await session.redrawForfeitedSlots(edited.id);
+  await session.voidDraw(plain.id, 'misprint');
+
+  const table = createStringTable();
+  const records = session.getState().history.toArray();
+  const stored = records.map(record => structuredClone(packRecord(record, table)));
+  // A table rebuilt from its names (as loaded from storage) decodes the same
+  const loaded = createStringTable(table.names.slice());
+  assert.deepEqual(stored.map(record => unpackRecord(record, loaded)), records);
+});
+
+test('records stored before packing pass through', () => {
+  const legacy = { id: 'r1', winners: ['Ann', 'Bob'] };
+  assert.equal(unpackRecord(legacy, createStringTable()), legacy);
+});
+
+test('the string table interns each name once', () => {
+  const table = createStringTable(['Ann']);
+  assert.equal(table.intern('Ann'), 0);
+  assert.equal(table.intern('Bob'), 1);
+  assert.equal(table.intern('Bob'), 1);
+  assert.equal(table.nameOf(1), 'Bob');
+  assert.deepEqual(table.names, ['Ann', 'Bob']);
+});
@@ -0,0 +1,156 @@
+import { test } from 'node:test';
+import assert from 'node:assert/strict';
+import { createDrawSession } from '../src/utils/drawCore.js';
+import { createDrawEngine } from '../src/utils/drawEngine.js';
+
+const people = (n) => Array.from({ length: n }, (_, i) => `P${String(i).padStart(3, '0')}`);
+
+// What undo must bring back: history, pool and the engine's available ids
+const capture = (session) => ({
+  history: JSON.stringify(session.getState().history.toArray()),
+  availableCount: session.getState().availableCount,
+  availableIds: Array.from(session.engine.availableIds()),
+});
+
+const assertInvariant = async (session) => {
+  const { ok, leaked, missing } = await session.checkPoolInvariant();
+  assert.ok(ok, `pool invariant broken: leaked ${leaked}, missing ${missing}`);
+};
+
+test('seeded draws replay from the candidate list', async () => {
+  const session = createDrawSession({ checkInvariants: true });
+  await session.setCandidates(people(50));
+  await session.enableSeededDraws('ffeeddccbbaa99887766554433221100');
+  await session.performDraw(5);
+  const draw = await session.performDraw(4);
+  session.markWinnerAsForfeited(draw.id, draw.winners[0].name);
+  await session.redrawForfeitedSlots(draw.id);
+  const { verified, mismatches } = session.verifyHistory();
+  assert.ok(verified >= 2);
+  assert.deepEqual(mismatches, []);
+});
+
+test('a failed batch leaves the pool and seeded stream untouched', () => {
+  const engine = createDrawEngine();
+  engine.load(people(10), [5, 0, 5, 0, 0, 0, 0, 0, 0, 1]);
+  engine.setSeed('0123456789abcdef0123456789abcdef');
+  const stream = engine.stream();
+  // Only three names carry tickets: the second count cannot be met
+  assert.throws(() => engine.drawBatch([2, 3]));
+  assert.equal(engine.status().available, 10);
+  assert.deepEqual(engine.stream(), stream);
+});
+
+test('quota draws are not batched', () => {
+  const engine = createDrawEngine();
+  engine.load(people(10));
+  assert.throws(() => engine.drawBatch([1], { quota: { P: { min: 1 } } }), /Quota/);
+  assert.equal(engine.status().available, 10);
+});
+
+test('forfeiting no winners commits nothing', async () => {
+  const session = createDrawSession();
+  await session.setCandidates(people(4));
+  const draw = await session.performDraw(2);
+  const before = session.getState();
+  session.markWinnersAsForfeited(draw.id, []);
+  assert.throws(() => session.markWinnersAsForfeited(draw.id, ['nobody']), /Not an active winner/);
+  assert.equal(session.getState(), before);
+});
+
+test('undo and redo step back and forth across forfeit, redraw and void', async () => {
+  const session = createDrawSession({ checkInvariants: true });
+  await session.setCandidates(people(30));
+  await session.enableSeededDraws('00112233445566778899aabbccddeeff');
+
+  const steps = [capture(session)];
+  const first = await session.performDraw(5, 'First');
+  steps.push(capture(session));
+  const second = await session.performDraw(3, 'Second');
+  steps.push(capture(session));
+  const forfeited = first.winners.slice(0, 2).map(w => w.name);
+  session.markWinnersAsForfeited(first.id, forfeited, 'absent');
+  steps.push(capture(session));
+  await session.redrawForfeitedSlots(first.id);
+  steps.push(capture(session));
+  await session.voidDraw(second.id, 'misprint');
+  steps.push(capture(session));
+  await assertInvariant(session);
+
+  for (let i = steps.length - 2; i >= 0; i--) {
+    await session.undo();
+    assert.deepEqual(capture(session), steps[i]);
+    await assertInvariant(session);
+  }
+  for (let i = 1; i < steps.length; i++) {
+    await session.redo();
+    assert.deepEqual(capture(session), steps[i]);
+    await assertInvariant(session);
+  }
+
+  const redrawn = session.getState().history.get(first.id);
+  const names = redrawn.winners.map(w => w.name);
+  assert.equal(new Set(names).size, names.length);
+  forfeited.forEach(name => assert.ok(names.includes(name)));
+  assert.ok(session.getState().history.get(second.id).voided);
+});
+
+test('undoLastForfeit restores the forfeited winner and releases the replacement', async () => {
+  const session = createDrawSession({ checkInvariants: true });
+  await session.setCandidates(people(10));
+  const draw = await session.performDraw(3);
+  const before = capture(session);
+  session.markWinnerAsForfeited(draw.id, draw.winners[0].name);
+  await session.redrawForfeitedSlots(draw.id);
+  await session.undoLastForfeit(draw.id);
+  await assertInvariant(session);
+  assert.equal(session.getState().availableCount, before.availableCount);
+});
+
+test('undoLastForfeit keeps a replacement another draw of the pool holds', async () => {
+  const session = createDrawSession({ checkInvariants: true });
+  await session.setCandidates(['a', 'b', 'c']);
+  const draw = await session.performDraw(1);
+  session.markWinnerAsForfeited(draw.id, draw.winners[0].name);
+  await session.redrawForfeitedSlots(draw.id);
+  await session.resetPool();
+  // Everyone is drawn again, the old replacement included
+  const next = await session.performDraw(3);
+  await session.undoLastForfeit(draw.id);
+  await assertInvariant(session);
+
+  await session.voidDraw(next.id);
+  await assertInvariant(session);
+  await session.undo();
+  await assertInvariant(session);
+  await session.redo();
+  await assertInvariant(session);
+});
+
+test('void keeps the draw\'s redraw exclusions through undo', async () => {
+  const session = createDrawSession();
+  await session.setCandidates(people(20));
+  const draw = await session.performDraw(3);
+  session.markWinnerAsForfeited(draw.id, draw.winners[0].name);
+  await session.redrawForfeitedSlots(draw.id);
+  await session.voidDraw(draw.id);
+  await session.undo();
+
+  session.markWinnerAsForfeited(draw.id, session.getState().history.get(draw.id).winners[1].name);
+  await session.redrawForfeitedSlots(draw.id);
+  const names = session.getState().history.get(draw.id).winners.map(w => w.name);
+  assert.equal(new Set(names).size, names.length);
+  await assertInvariant(session);
+});
+
+test('voiding returns each draw\'s winners to the pool', async () => {
+  const session = createDrawSession({ checkInvariants: true });
+  await session.setCandidates(people(6));
+  const first = await session.performDraw(2);
+  const second = await session.performDraw(4);
+  await session.voidDraw(second.id, 'misprint');
+  assert.equal(session.getState().availableCount, 4);
+  await session.voidDraw(first.id, 'misprint');
+  assert.equal(session.getState().availableCount, 6);
+  await assertInvariant(session);
+});
@@ -0,0 +1,140 @@
+import { test } from 'node:test';
+import assert from 'node:assert/strict';
+import {
+  ActionTypes as T,
+  UNDO_MEMORY_LIMIT,
+  drawReducer,
+  initialDrawState,
+  estimateBytes,
+} from '../src/utils/drawState.js';
+
+const record = (i) => ({
+  id: `r${i}`,
+  drawNumber: i + 1,
+  poolEpoch: 0,
+  winners: [{ name: `n${i}`, status: 'won' }],
+});
+
+const addPrize = (state, id, description = '') => drawReducer(state, {
+  type: T.PRIZE_ADDED,
+  prize: { id, name: id, winnerCount: 1, description },
+});
+
+const logSize = (log) => log.reduce((sum, entry) => sum + entry.bytes, 0);
+
+test('the undo log evicts its oldest steps over UNDO_MEMORY_LIMIT', () => {
+  // Each step logs about a quarter of the cap
+  const description = 'x'.repeat(UNDO_MEMORY_LIMIT / 8);
+  let state = initialDrawState;
+  for (let i = 0; i < 6; i++) state = addPrize(state, `p${i}`, description);
+
+  assert.ok(state.evictedSteps > 0);
+  assert.equal(state.log.length + state.evictedSteps, 6);
+  assert.ok(state.logBytes <= UNDO_MEMORY_LIMIT);
+  assert.equal(state.logBytes, logSize(state.log));
+
+  // Undo reaches back only as far as the log
+  while (state.log.length > 0) state = drawReducer(state, { type: T.UNDO });
+  assert.equal(state.prizes.length, state.evictedSteps);
+});
+
+test('logBytes follows undo, redo and a new action', () => {
+  let state = initialDrawState;
+  for (let i = 0; i < 4; i++) state = addPrize(state, `p${i}`, 'x'.repeat(i * 100));
+  state = drawReducer(state, { type: T.UNDO });
+  state = drawReducer(state, { type: T.UNDO });
+  assert.equal(state.logBytes, logSize(state.log));
+  state = drawReducer(state, { type: T.REDO });
+  assert.equal(state.logBytes, logSize(state.log));
+  state = addPrize(state, 'new');
+  assert.equal(state.future.length, 0);
+  assert.equal(state.logBytes, logSize(state.log));
+});
+
+test('one step over the cap is still kept', () => {
+  const state = addPrize(initialDrawState, 'big', 'x'.repeat(UNDO_MEMORY_LIMIT));
+  assert.equal(state.log.length, 1);
+  assert.ok(estimateBytes(state.log[0]) > UNDO_MEMORY_LIMIT);
+});
+
+test('a new action drops the redo branch', () => {
+  let state = addPrize(initialDrawState, 'a');
+  state = addPrize(state, 'b');
+  state = drawReducer(state, { type: T.UNDO });
+  assert.equal(state.future.length, 1);
+  state = addPrize(state, 'c');
+  assert.equal(state.future.length, 0);
+  assert.deepEqual(state.prizes.map(p => p.id), ['a', 'c']);
+});
+
+test('a forfeit that matches no winner is not logged', () => {
+  const state = drawReducer(initialDrawState, {
+    type: T.HYDRATED, prizes: null, history: [record(0)], pendingRecords: 0,
+  });
+  const next = drawReducer(state, {
+    type: T.WINNERS_FORFEITED, drawId: 'r0', names: ['nobody'], reason: '', forfeitedAt: 1,
+  });
+  assert.equal(next, state);
+});
+
+test('hydration after an adopted snapshot adds no records', () => {
+  const stored = Array.from({ length: 10 }, (_, i) => record(i));
+  let state = drawReducer(initialDrawState, {
+    type: T.SNAPSHOT_LOADED,
+    snapshot: {
+      candidates: [],
+      weights: null,
+      availableCount: 0,
+      currentDrawId: null,
+      history: stored.concat(record(10)),
+      prizes: [],
+      nextDrawNumber: 12,
+      poolEpoch: 0,
+      drawSeed: null,
+    },
+  });
+  state = drawReducer(state, { type: T.HYDRATED, prizes: null, history: stored.slice(5), pendingRecords: 5 });
+  state = drawReducer(state, { type: T.HISTORY_LOADED, records: stored.slice(0, 5) });
+  assert.equal(state.history.size, 11);
+  assert.equal(state.source, 'snapshot');
+});
+
+test('prizes added before hydration are merged with the stored ones', () => {
+  let state = addPrize(initialDrawState, 'early');
+  state = drawReducer(state, {
+    type: T.HYDRATED,
+    prizes: [{ id: 'stored', name: 'Stored', winnerCount: 2 }],
+    history: null,
+    pendingRecords: 0,
+  });
+  assert.deepEqual(state.prizes.map(p => p.id), ['stored', 'early']);
+
+  // The early add is still undoable
+  state = drawReducer(state, { type: T.UNDO });
+  assert.deepEqual(state.prizes.map(p => p.id), ['stored']);
+});
+
+test('older records are prepended in one step once loaded', () => {
+  const stored = Array.from({ length: 10 }, (_, i) => record(i));
+  let state = drawReducer(initialDrawState, {
+    type: T.HYDRATED, prizes: null, history: stored.slice(5), pendingRecords: 5,
+  });
+  assert.equal(state.history.size, 5);
+  assert.equal(state.nextDrawNumber, 11);
+
+  // A draw made before the older records arrived stays newest
+  const local = { ...record(10), id: 'local' };
+  state = drawReducer(state, { type: T.DRAWS_COMMITTED, records: [local], available: 0 });
+  state = drawReducer(state, { type: T.HISTORY_LOADED, records: stored.slice(0, 5) });
+  assert.deepEqual(state.history.toArray(), [...stored, local]);
+  assert.equal(state.pendingRecords, 0);
+});
+
+test('older records are dropped once history was cleared', () => {
+  let state = drawReducer(initialDrawState, {
+    type: T.HYDRATED, prizes: null, history: [record(5)], pendingRecords: 5,
+  });
+  state = drawReducer(state, { type: T.HISTORY_CLEARED });
+  state = drawReducer(state, { type: T.HISTORY_LOADED, records: [record(0)] });
+  assert.equal(state.history.size, 0);
+});
@@ -0,0 +1,103 @@
+import { test } from 'node:test';
+import assert from 'node:assert/strict';
+import { createHistoryStore } from '../src/utils/historyStore.js';
+
+let nextId = 0;
+const record = (names) => ({
+  id: `r${nextId++}`,
+  winners: names.map(name => ({ name, status: 'won' })),
+});
+
+// Deterministic pseudo-random sequence
+const createRandom = (seed) => () => {
+  seed = (seed * 1103515245 + 12345) % 2147483648;
+  return seed / 2147483648;
+};
+
+// Positions whose record differs, found by comparing every position
+const bruteDiff = (previous, next) => {
+  const changed = [];
+  for (let i = 0; i < next.size; i++) {
+    if (previous.at(i) !== next.at(i)) changed.push(i);
+  }
+  const removed = [];
+  for (let i = next.size; i < previous.size; i++) removed.push(previous.at(i).id);
+  return { changed, removed };
+};
+
+test('diff matches a full comparison across random edits', () => {
+  const random = createRandom(7);
+  let store = createHistoryStore();
+  const versions = [store];
+  for (let step = 0; step < 1500; step++) {
+    const roll = random();
+    if (roll < 0.45) {
+      store = store.append([record([`n${step}`])]);
+    } else if (roll < 0.55) {
+      store = store.append(Array.from({ length: 40 }, (_, j) => record([`n${step}-${j}`])));
+    } else if (roll < 0.8 && store.size > 0) {
+      const i = Math.floor(random() * store.size);
+      store = store.update({ ...store.at(i), edited: step });
+    } else if (roll < 0.9 && store.size > 0) {
+      store = store.truncate(Math.floor(random() * store.size));
+    } else {
+      store = createHistoryStore(store.toArray());
+    }
+    versions.push(store);
+
+    const previous = versions[Math.floor(random() * versions.length)];
+    const diff = store.diff(previous);
+    const expected = bruteDiff(previous, store);
+    assert.equal(diff.length, store.size);
+    assert.deepEqual(diff.changed.map(([i]) => i), expected.changed);
+    diff.changed.forEach(([i, next, before]) => {
+      assert.equal(next, store.at(i));
+      assert.equal(before, previous.at(i));
+    });
+    assert.deepEqual(diff.removed.map(r => r.id), expected.removed);
+  }
+});
+
+test('diff after one update visits only that record', () => {
+  const store = createHistoryStore(Array.from({ length: 5000 }, (_, i) => record([`n${i}`])));
+  const updated = store.update({ ...store.at(1234), edited: true });
+  assert.deepEqual(updated.diff(store).changed.map(([i]) => i), [1234]);
+  assert.deepEqual(store.diff(store).changed, []);
+});
+
+test('bulk build and appends give the same store', () => {
+  const records = Array.from({ length: 1100 }, (_, i) => record([`n${i % 50}`]));
+  let appended = createHistoryStore();
+  records.forEach(r => {
+    appended = appended.append([r]);
+  });
+  const built = createHistoryStore(records);
+  assert.deepEqual(built.toArray(), appended.toArray());
+  assert.deepEqual(built.diff(appended).changed, []);
+  assert.deepEqual(built.appearancesOf('n7').map(a => a.drawId), appended.appearancesOf('n7').map(a => a.drawId));
+});
+
+test('lookups follow updates and truncation', () => {
+  const [a, b, c] = [record(['Ann']), record(['Bob']), record(['Ann', 'Cy'])];
+  const store = createHistoryStore([a, b, c]);
+  assert.equal(store.get(b.id), b);
+  assert.equal(store.indexOf(c.id), 2);
+  assert.deepEqual(store.appearancesOf('Ann').map(x => x.drawId), [a.id, c.id]);
+
+  const truncated = store.truncate(2);
+  assert.equal(truncated.size, 2);
+  assert.equal(truncated.has(c.id), false);
+  assert.deepEqual(truncated.appearancesOf('Ann').map(x => x.drawId), [a.id]);
+  // The older version is untouched
+  assert.equal(store.size, 3);
+  assert.equal(store.last(), c);
+});
+
+test('slice reads a clamped window', () => {
+  const records = Array.from({ length: 100 }, (_, i) => record([`n${i}`]));
+  const store = createHistoryStore(records);
+  assert.deepEqual(store.slice(95), records.slice(95));
+  assert.deepEqual(store.slice(-5, 3), records.slice(0, 3));
+  assert.deepEqual(store.slice(40, 400), records.slice(40));
+  assert.deepEqual([...store], records);
+});
@@ -0,0 +1,112 @@
+import { test } from 'node:test';
+import assert from 'node:assert/strict';
+import { storeEntry, replayRange, journalLength } from '../src/utils/journal.js';
+import { createHistoryStore } from '../src/utils/historyStore.js';
+import { createDrawSession } from '../src/utils/drawCore.js';
+
+// History versions from a draw session: draws, forfeits, redraws, voids and
+// undos, so entries hold puts, patches and shrinking lengths
+const sessionVersions = async () => {
+  const session = createDrawSession();
+  await session.setCandidates(Array.from({ length: 200 }, (_, i) => `Person ${i}`));
+  const versions = [session.getState().history];
+  const step = async (action) => {
+    await action();
+    versions.push(session.getState().history);
+  };
+
+  for (let round = 0; round < 6; round++) {
+    const draw = await session.performDraw(5, `Prize ${round}`);
+    versions.push(session.getState().history);
+    await step(() => session.markWinnersAsForfeited(draw.id, [draw.winners[0].name, draw.winners[1].name]));
+    await step(() => session.redrawForfeitedSlots(draw.id));
+    if (round % 2 === 1) await step(() => session.voidDraw(draw.id, 'void'));
+    if (round % 3 === 2) await step(() => session.undo());
+  }
+  await step(() => session.undoLastDraw());
+  return versions;
+};
+
+// Entries as storage returns them (structured clone)
+const journalOf = (versions) => versions.slice(1)
+  .map((store, i) => storeEntry(versions[i], store))
+  .filter(Boolean)
+  .map(entry => structuredClone(entry));
+
+// All of history from snapshot rows and entries, as one page
+const replayAll = (snapshot, entries) => {
+  const length = journalLength(snapshot.length, entries);
+  return replayRange(snapshot, 0, length, entries);
+};
+
+test('entries hold exactly the positions that changed', async () => {
+  const versions = await sessionVersions();
+  for (let i = 1; i < versions.length; i++) {
+    const previous = versions[i - 1];
+    const next = versions[i];
+    const entry = storeEntry(previous, next);
+    const changed = [];
+    for (let j = 0; j < next.size; j++) {
+      if (previous.at(j) !== next.at(j)) changed.push(j);
+    }
+    if (!entry) {
+      assert.deepEqual(changed, []);
+      assert.equal(previous.size, next.size);
+      continue;
+    }
+    assert.equal(entry.length, next.size);
+    assert.deepEqual([...entry.put, ...entry.patch].map(([j]) => j).sort((a, b) => a - b), changed);
+  }
+
+  // A forfeit journals one patch, no record
+  const forfeit = storeEntry(versions[1], versions[2]);
+  assert.equal(forfeit.put.length, 0);
+  assert.equal(forfeit.patch.length, 1);
+  assert.equal(storeEntry(versions[1], versions[1]), null);
+});
+
+test('replaying the journal rebuilds history', async () => {
+  const versions = await sessionVersions();
+  const entries = journalOf(versions);
+  const final = versions[versions.length - 1];
+  assert.equal(journalLength(0, entries), final.size);
+  assert.deepEqual(replayAll([], entries), structuredClone(final.toArray()));
+});
+
+test('compaction at any point leaves the replayed history unchanged', async () => {
+  const versions = await sessionVersions();
+  const entries = journalOf(versions);
+  const expected = structuredClone(versions[versions.length - 1].toArray());
+  for (let k = 0; k <= entries.length; k++) {
+    // Fold the first k entries into the snapshot, journal the rest
+    const snapshot = replayAll([], entries.slice(0, k));
+    const rest = entries.slice(k);
+    assert.deepEqual(replayAll(snapshot, rest), expected);
+  }
+});
+
+test('paged replay matches the full replay', async () => {
+  const versions = await sessionVersions();
+  const entries = journalOf(versions);
+  const snapshot = replayAll([], entries.slice(0, 5));
+  const rest = entries.slice(5);
+  const expected = replayAll(snapshot, rest);
+  const length = journalLength(snapshot.length, rest);
+
+  // Newest first, pages growing, as openHistory reads them
+  const pages = [];
+  for (let end = length, size = 2; end > 0; size *= 2) {
+    const start = Math.max(0, end - size);
+    pages.unshift(replayRange(snapshot.slice(start, end), start, end, rest));
+    end = start;
+  }
+  assert.deepEqual(pages.flat(), expected);
+});
+
+test('a shorter history journals only its length', () => {
+  const records = Array.from({ length: 10 }, (_, i) => ({ id: `r${i}`, winners: [] }));
+  const entry = storeEntry(createHistoryStore(records), createHistoryStore(records.slice(0, 7)));
+  // Rebuilt stores share no nodes, but unchanged records are the same objects
+  assert.deepEqual(entry, { length: 7, put: [], patch: [] });
+  assert.deepEqual(replayAll(records, [entry]), records.slice(0, 7));
+});
@@ -0,0 +1,86 @@
+import { test } from 'node:test';
+import assert from 'node:assert/strict';
+import { classifyPatch, createSyncChannel } from '../src/utils/sync.js';
+
+test('classifyPatch orders patches by version vector', () => {
+  assert.deepEqual(classifyPatch({}, 'a', { a: 1 }), { verdict: 'apply' });
+  assert.deepEqual(classifyPatch({ a: 2 }, 'a', { a: 2 }), { verdict: 'duplicate' });
+  assert.deepEqual(classifyPatch({ a: 1 }, 'a', { a: 3 }), { verdict: 'gap' });
+  // The sender saw an action from c this replica has not
+  assert.deepEqual(classifyPatch({ a: 1 }, 'a', { a: 2, c: 1 }), { verdict: 'gap' });
+  assert.deepEqual(classifyPatch({ a: 1, b: 1 }, 'a', { a: 2, b: 1 }), { verdict: 'apply' });
+});
+
+test('concurrent actions: the lowest replica id wins', () => {
+  // b applied its own action, a had not seen it when it sent
+  assert.deepEqual(classifyPatch({ b: 1 }, 'a', { a: 1 }), { verdict: 'conflict', winner: 'a' });
+  assert.deepEqual(classifyPatch({ a: 1 }, 'b', { b: 1 }), { verdict: 'conflict', winner: 'a' });
+  assert.deepEqual(classifyPatch({ b: 1, c: 1 }, 'd', { d: 1 }), { verdict: 'conflict', winner: 'b' });
+});
+
+// A replica whose state is the list of actions it applied
+const createReplica = (name) => {
+  const replica = { actions: [], snapshots: 0, conflicts: 0 };
+  replica.sync = createSyncChannel({
+    onPatch: async (action) => {
+      replica.actions = [...replica.actions, action.label];
+    },
+    getSnapshot: async () => ({ actions: replica.actions }),
+    onSnapshot: async (snapshot) => {
+      replica.actions = snapshot.actions;
+      replica.snapshots++;
+    },
+    onConflict: () => {
+      replica.conflicts++;
+    },
+  }, name);
+  replica.commit = (label) => {
+    replica.actions = [...replica.actions, label];
+    replica.sync.publish({ type: 'test', label });
+  };
+  return replica;
+};
+
+const settle = () => new Promise(resolve => setTimeout(resolve, 50));
+
+test('patches reach the other window in order', async () => {
+  const a = createReplica('sync-test-order');
+  const b = createReplica('sync-test-order');
+  try {
+    a.commit('one');
+    a.commit('two');
+    await settle();
+    b.commit('three');
+    await settle();
+    assert.deepEqual(b.actions, ['one', 'two', 'three']);
+    assert.deepEqual(a.actions, b.actions);
+    assert.deepEqual(a.sync.vector(), b.sync.vector());
+  } finally {
+    a.sync.close();
+    b.sync.close();
+  }
+});
+
+test('a conflict converges on the winner\'s state', async () => {
+  const a = createReplica('sync-test-conflict');
+  const b = createReplica('sync-test-conflict');
+  try {
+    a.commit('shared');
+    await settle();
+    // Both act before seeing each other's action
+    a.commit('from a');
+    b.commit('from b');
+    await settle();
+
+    const [winner, loser] = a.sync.replicaId < b.sync.replicaId ? [a, b] : [b, a];
+    assert.deepEqual(loser.actions, winner.actions);
+    assert.deepEqual(winner.actions, ['shared', winner === a ? 'from a' : 'from b']);
+    assert.equal(loser.snapshots, 1);
+    assert.equal(loser.conflicts, 1);
+    assert.equal(winner.snapshots, 0);
+    assert.deepEqual(loser.sync.vector(), winner.sync.vector());
+  } finally {
+    a.sync.close();
+    b.sync.close();
+  }
+});